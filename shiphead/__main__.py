@@ -29,7 +29,6 @@ from typing import (
     List
 )
 if TYPE_CHECKING:
-    from .core import Core
     from .rank import Rank
     from .suit import Suit
     from .card import Card
@@ -40,7 +39,13 @@ if TYPE_CHECKING:
 # < External Imports
 # < ========================================================
 
+import json
+import time
 import random
+import cProfile
+import pstats
+import argparse
+import itertools
 from pprint import (
     pprint, 
     pformat
@@ -55,81 +60,24 @@ from .utils import (
     index_input,
 )
 from . import settings
-from .core import core
+from .core import Core
 from .rank import (
     RANK_NAMES, 
     RANK_DATA
 )
 from .suit import SUIT_NAMES
-from .card import Card
+from .encoding import mask_to_ranks
+from .card import (
+    Card,
+    create_deck
+)
 from .player import Player
+from .rng import create_rng
 from .snapshot import Result
-
-# < ========================================================
-# < Create Deck Function
-# < ========================================================
-
-def create_deck(
-    suits: list[str], 
-    ranks: list[str], 
-    shuffle: bool = True
-) -> list[Card]:
-    """Create a card list with all combinations of suits / ranks"""
-
-    cards: list[Card] = []
-    for suit in suits:
-        for rank in ranks:
-            card = Card(rank, suit)
-            cards.append(card)
-    if shuffle:
-        random.shuffle(cards)
-    return cards
-
-# < ========================================================
-# < Assess Pending Function
-# < ========================================================
-
-def assess_pending(
-    pending: list[Card], 
-    valid_ranks: list[str], 
-    hidden: bool
-) -> bool:
-    """Assess pending list of cards"""
-
-    size: int = len(pending)
-
-    if size < 1:
-        raise UserWarning('No cards in pending')
-
-    if size > 4:
-        raise UserWarning('More than 4 cards in pending')
-    
-    target_rank: str = pending[0].rank
-
-    if not all([card.rank  == target_rank for card in pending]):
-        raise UserWarning('Pending cards do not share the same rank')
-
-    if target_rank not in valid_ranks:
-        if not hidden:
-            raise UserWarning('Pending cards are not playable')
-        else:
-            return False
-
-    return True
-
-# < ========================================================
-# < Assess Pending Function
-# < ========================================================
-
-def assess_result(
-        result: Result
-) -> bool:
-    """Assess result"""
-
-    if result.option == 'play' and not result.cards:
-        raise UserWarning('Cards must be submitted with play option')
-        
-    return True
+from .behaviours import decide
+from .simulate import simulate
+from .tournament import run_tournament
+from .instrument import instruments
 
 # < ========================================================
 # < Process Snapshot Function
@@ -140,10 +88,7 @@ def process_snapshot(snapshot: Snapshot) -> Result:
 
     options: list[str] = snapshot.options
     combos: list[list[Card]] = snapshot.playable_combinations
-    option: str = ''
-    cards: list[Card] = []
-
-    ranks_sorted: list[str] = core.sort_ranks_by_importance(set([card.rank for card in snapshot.playable_cards]))
+    result: Result
 
     if snapshot.human:
 
@@ -168,48 +113,15 @@ def process_snapshot(snapshot: Snapshot) -> Result:
 
         chosen_index: int = index_input(entries)
         _, option, cards = entries[chosen_index]
+        result = Result(
+            option = option,
+            cards = cards
+        )
 
     else:
 
-        if 'play' in options:
-            option = 'play'
-            behaviour: str = random.choices(*zip(*settings.behaviours.items()))[0]
-            choices: list[list[Card]]
-            print(combos)
-
-            match behaviour:
-                case 'random':
-                    cards = random.choice(combos)
-                case 'good':
-                    chosen_rank: str = ranks_sorted[0]
-                    choices = [combo for combo in combos if combo[0].rank == chosen_rank]
-                    cards = random.choice(choices)
-                case 'better':
-                    chosen_rank: str = ranks_sorted[0]
-                    choices = [combo for combo in combos if combo[0].rank == chosen_rank]
-                    cards = sorted(choices, key = len)[-1]
-                case 'best':
-                    quads: list[list[Card]] = []
-                    for combo in combos:
-                        proposed = core.deck + combo
-                        if core.has_quad(proposed):
-                            quads.append(combo)
-                    if quads:
-                        choices = quads
-                        sorter: Callable[[list[Card]], int] = lambda quad: quad[0].importance
-                        cards = sorted(choices, key = sorter)[0]
-                    else:
-                        chosen_rank: str = ranks_sorted[0]
-                        choices = [combo for combo in combos if combo[0].rank == chosen_rank]
-                        cards = sorted(choices, key = len)[-1]
-                
-        else:
-            option = options[0]
-
-    result: Result = Result(
-        option = option,
-        cards = cards
-    )
+        result = decide(snapshot, snapshot.player.behaviour)
+
     snapshot.result = result
     return result
 
@@ -231,7 +143,7 @@ def printout_snapshot(snapshot: Snapshot) -> None:
         f'Standard: {snapshot.standard}',
         f'Actual rank: {snapshot.actual_rank}',
         f'Anchor rank: {snapshot.anchor_rank}',
-        f'Valid ranks: [{", ".join(RANK_DATA[rank].short_upper for rank in snapshot.valid_ranks)}]',
+        f'Valid ranks: [{", ".join(RANK_DATA[rank].short_upper for rank in mask_to_ranks(snapshot.valid_mask))}]',
         f'Accessible cards: {snapshot.pile}',
         f'Playable cards: {snapshot.playable_cards}',
         f'Waitable: {snapshot.waitable}',
@@ -251,17 +163,21 @@ def main() -> None:
     """Entry point for the game, containing main game loop"""
 
     settings.delay = False
+    rng: random.Random = create_rng()
+    core: Core = Core()
 
     core.init(
         deck = create_deck(
             SUIT_NAMES, 
             RANK_NAMES, 
-            settings.shuffled
+            settings.shuffled,
+            rng
         ),
         players = [
             Player('Ben', True, 1), 
             Player('PC', False, 2)
-        ]
+        ],
+        rng = rng
     )
 
     while True:
@@ -280,73 +196,293 @@ def main() -> None:
         print(f"Center: {core.center}")
 
         result: Result = process_snapshot(snapshot)
-        assess_result(result)
-
         player: Player = snapshot.player
-        pending: list[Card] = []
-        option: str = result.option
-        cards: list[Card] = result.cards
-
-        print(f'\nOption: {option}')
-        print(f'Cards: {cards}\n')
-
-        switching: bool = True
-        deactivating: bool = False
-
-        match option:
-
-            case 'play':
-                for card in cards:
-                    snapshot.pile.remove(card)
-                    pending.append(card)
-
-                if not assess_pending(pending, snapshot.valid_ranks, snapshot.hidden):
-                    player.hand.extend(core.center)
-                    core.center.clear()
-                else:
-                    while pending:
-                        core.center.extend(pending)
-                        pending.clear()
-
-                if core.should_burn(core.center):
-                    core.burned.extend(core.center)
-                    core.center.clear()
-                    switching = False
-
-                while core.deck and len(player.hand) < settings.hand_size:
-                    card = core.deck.pop()
-                    player.hand.append(card)
-                    print(f'Drew {card}')
-                
-                if player.winning():
-                    print(f'Player {player} has won')
-                    break
-
-                deactivating = core.get_top_rank(core.center) == '7' and core.get_anchor_rank(core.center) == '9'
-
-            case 'take':
-                player.hand.extend(core.center)
-                core.center.clear()
-
-            case 'wait':
-                deactivating = True
-
-        core.turn += 1
-        if switching:
-            core.next_player()
-        core.standard = not deactivating
+
+        print(f'\nOption: {result.option}')
+        print(f'Cards: {result.cards}\n')
+
+        core.apply_result(snapshot, result)
+
+        for card in core.drawn:
+            print(f'Drew {card}')
+
+        if core.winner:
+            print(f'Player {core.winner} has won')
+            break
 
         if settings.delay:
             input(f'End of {player} turn, press Enter to continue...')
         
         print()
 
+# < ========================================================
+# < Simulation Entry Point
+# < ========================================================
+
+def run_simulation(games: int, seed: int, path: str | None = None) -> None:
+    """Run headless computer-vs-computer games and print a summary, recording them to path if given"""
+
+    start: float = time.perf_counter()
+    outcomes = simulate(games, seed, path = path)
+    elapsed: float = time.perf_counter() - start
+
+    wins: dict[int | None, int] = {}
+    for outcome in outcomes:
+        wins[outcome.winner] = wins.get(outcome.winner, 0) + 1
+    turns: int = sum(outcome.turns for outcome in outcomes)
+
+    print(f'Games: {games}')
+    print(f'Seed: {seed}')
+    print(f'Wins: {dict(sorted(wins.items(), key = lambda item: str(item[0])))}')
+    print(f'Average turns: {turns / max(games, 1):.1f}')
+    print(f'Games per second: {games / max(elapsed, 1e-9):.1f}')
+
+# < ========================================================
+# < Tournament Entry Point
+# < ========================================================
+
+def run_tournament_summary(
+    games: int, 
+    seed: int, 
+    workers: int | None, 
+    behaviours: list[str] | None
+) -> None:
+    """Run a behaviour tournament across worker processes and print a summary"""
+
+    start: float = time.perf_counter()
+    tallies = run_tournament(games, seed, workers, behaviours = behaviours)
+    elapsed: float = time.perf_counter() - start
+
+    totals: dict[str, list[int]] = {}
+    played: int = 0
+    for pairing, tally in tallies.items():
+        played += tally.games
+        print(f'{" vs ".join(pairing):<20} wins: {tally.wins} unfinished: {tally.unfinished}')
+        for behaviour, wins in zip(pairing, tally.wins):
+            total = totals.setdefault(behaviour, [0, 0])
+            total[0] += wins
+            total[1] += tally.games
+
+    for behaviour, (wins, seats) in totals.items():
+        print(f'{behaviour:<10} win rate: {wins / max(seats, 1):.3f}')
+    print(f'Games: {played}')
+    print(f'Games per second: {played / max(elapsed, 1e-9):.1f}')
+
+# < ========================================================
+# < Batch Entry Point
+# < ========================================================
+
+def run_batch(games: int, seed: int, behaviours: list[str] | None) -> None:
+    """Run games in lockstep with the NumPy batch engine and print a summary"""
+
+    from .batch import simulate_batch
+
+    start: float = time.perf_counter()
+    outcome = simulate_batch(games, seed, behaviours)
+    elapsed: float = time.perf_counter() - start
+
+    finished = outcome.winners > 0
+    print(f'Games: {games}')
+    print(f'Seed: {seed}')
+    for uid in range(1, settings.player_count + 1):
+        print(f'Player {uid} win rate: {(outcome.winners == uid).mean():.3f}')
+    print(f'Unfinished: {int((~finished).sum())}')
+    print(f'Average turns: {outcome.turns[finished].mean() if finished.any() else 0:.1f}')
+    print(f'Games per second: {games / max(elapsed, 1e-9):.1f}')
+
+# < ========================================================
+# < Dataset Entry Point
+# < ========================================================
+
+def run_dataset(path: str, games: int, seed: int, behaviours: list[str] | None, shard_size: int | None) -> None:
+    """Simulate games into a trajectory dataset and print a summary"""
+
+    from .dataset import (
+        generate,
+        TrajectoryDataset
+    )
+
+    start: float = time.perf_counter()
+    count: int = generate(path, games, seed, behaviours, shard_size)
+    elapsed: float = time.perf_counter() - start
+
+    dataset = TrajectoryDataset(path)
+    print(f'Games: {games}')
+    print(f'Seed: {seed}')
+    print(f'Transitions written: {count}')
+    print(f'Transitions in dataset: {len(dataset)} in {len(dataset.shards)} shard(s)')
+    print(f'Transitions per second: {count / max(elapsed, 1e-9):.1f}')
+
+# < ========================================================
+# < Replay Entry Point
+# < ========================================================
+
+def run_replay(path: str, game: int, turn: int | None) -> None:
+    """Replay a recorded game to a turn and print its snapshot, or check the whole game if no turn"""
+
+    from .record import read_records
+    from .replay import Replay
+
+    record = next(itertools.islice(read_records(path), game, None), None)
+    if record is None:
+        raise SystemExit(f'No game [{game}] in [{path}]')
+
+    replay = Replay(record)
+    if turn is None:
+        core = replay.finish()
+        print(f'Replayed {replay.turns} turns of game {game}, seed {record.seed}, winner {core.winner}')
+        return
+
+    core = replay.seek(turn)
+    if core.winner:
+        print(f'Player {core.winner} has won')
+        return
+    print(f'Turn {core.turn}')
+    printout_snapshot(core.create_snapshot())
+
+# < ========================================================
+# < Server Entry Point
+# < ========================================================
+
+def run_server(host: str, port: int, humans: int, seed: int, timeout: float | None) -> None:
+    """Host tables for human players until interrupted"""
+
+    from .server import serve
+
+    print(f'Serving on {host}:{port} with {humans} human seat(s) per table')
+    try:
+        serve(host, port, humans, seed, timeout)
+    except KeyboardInterrupt:
+        pass
+
+# < ========================================================
+# < Benchmark Entry Point
+# < ========================================================
+
+def run_benchmark(games: int, repeat: int, seed: int, path: str | None) -> None:
+    """Run the benchmark suite, printing the results or writing them to a JSON file"""
+
+    from .benchmark import run_suite
+
+    results = run_suite(games, repeat, seed)
+    if path == '-':
+        print(json.dumps(results, indent = 2))
+        return
+    if path:
+        with open(path, 'w') as file:
+            json.dump(results, file, indent = 2)
+
+    for name, timing in results['micro'].items():
+        print(f'{name:<28} {timing["median_us"]:>10.2f} us')
+    for behaviour, throughput in results['games'].items():
+        print(f'{behaviour:<28} {throughput["median_games_per_second"]:>10.1f} games/s')
+    for name, size in results['memory'].items():
+        print(f'snapshot {name:<19} {size:>10.0f}')
+    print(f'{"clone speedup":<28} {results["clone"]["speedup"]:>10.1f}x')
+
+def write_report(text: str, path: str) -> None:
+    """Write a report to a file, or print it if the path is -"""
+
+    if path == '-':
+        print(text)
+        return
+    with open(path, 'w') as file:
+        file.write(text)
+
+# < ========================================================
+# < Command Line Interface
+# < ========================================================
+
+def cli(argv: list[str] | None = None) -> None:
+    """Parse command line arguments and run the chosen mode"""
+
+    parser = argparse.ArgumentParser(prog = 'shiphead')
+    parser.add_argument('--profile', default = None, help = 'file to dump cProfile stats to, the top entries are printed')
+    parser.add_argument('--instrument', default = None, metavar = 'FILE', help = 'file to write the instrumentation report to, - for stdout')
+    subparsers = parser.add_subparsers(dest = 'mode')
+
+    simulate_parser = subparsers.add_parser('simulate', help = 'run headless computer-vs-computer games')
+    simulate_parser.add_argument('--games', type = int, default = 100)
+    simulate_parser.add_argument('--seed', type = int, default = 0)
+    simulate_parser.add_argument('--record', default = None, help = 'file to append binary game records to')
+
+    tournament_parser = subparsers.add_parser('tournament', help = 'compare behaviours across all cores')
+    tournament_parser.add_argument('--games', type = int, default = 1000, help = 'games per pairing')
+    tournament_parser.add_argument('--seed', type = int, default = 0)
+    tournament_parser.add_argument('--workers', type = int, default = None)
+    tournament_parser.add_argument('--behaviours', nargs = '+', default = None, help = 'defaults to settings.behaviours')
+
+    batch_parser = subparsers.add_parser('batch', help = 'run games in lockstep with NumPy')
+    batch_parser.add_argument('--games', type = int, default = 100000)
+    batch_parser.add_argument('--seed', type = int, default = 0)
+    batch_parser.add_argument('--behaviours', nargs = '+', default = None, help = 'one of random, good or better per player')
+
+    dataset_parser = subparsers.add_parser('dataset', help = 'append trajectories of simulated games to a dataset')
+    dataset_parser.add_argument('path', help = 'dataset directory, created if missing')
+    dataset_parser.add_argument('--games', type = int, default = 1000)
+    dataset_parser.add_argument('--seed', type = int, default = 0)
+    dataset_parser.add_argument('--behaviours', nargs = '+', default = None, help = 'one per player, chosen each turn if not given')
+    dataset_parser.add_argument('--shard-size', type = int, default = None, help = 'transitions per shard, defaults to settings.dataset_shard_size')
+
+    replay_parser = subparsers.add_parser('replay', help = 'replay a recorded game to a turn')
+    replay_parser.add_argument('path', help = 'binary record file written by simulate --record')
+    replay_parser.add_argument('--game', type = int, default = 0, help = 'index of the game in the file')
+    replay_parser.add_argument('--turn', type = int, default = None, help = 'turn to print, replays and checks the whole game if not given')
+
+    serve_parser = subparsers.add_parser('serve', help = 'host tables for human players over TCP')
+    serve_parser.add_argument('--host', default = '127.0.0.1')
+    serve_parser.add_argument('--port', type = int, default = 8765)
+    serve_parser.add_argument('--humans', type = int, default = 1, help = 'human seats per table, computers fill the rest')
+    serve_parser.add_argument('--seed', type = int, default = 0)
+    serve_parser.add_argument('--timeout', type = float, default = None, help = 'seconds per decision, defaults to settings.server_timeout')
+
+    benchmark_parser = subparsers.add_parser('benchmark', help = 'run engine benchmarks')
+    benchmark_parser.add_argument('--games', type = int, default = 20, help = 'games per behaviour per repeat')
+    benchmark_parser.add_argument('--repeat', type = int, default = 7)
+    benchmark_parser.add_argument('--seed', type = int, default = 0)
+    benchmark_parser.add_argument('--json', default = None, help = 'file to write results to, - for stdout')
+
+    args = parser.parse_args(argv)
+
+    if args.instrument:
+        instruments.enable()
+    profiler: cProfile.Profile | None = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+
+    try:
+        match args.mode:
+            case 'simulate':
+                run_simulation(args.games, args.seed, args.record)
+            case 'tournament':
+                run_tournament_summary(args.games, args.seed, args.workers, args.behaviours)
+            case 'batch':
+                run_batch(args.games, args.seed, args.behaviours)
+            case 'dataset':
+                run_dataset(args.path, args.games, args.seed, args.behaviours, args.shard_size)
+            case 'replay':
+                run_replay(args.path, args.game, args.turn)
+            case 'serve':
+                run_server(args.host, args.port, args.humans, args.seed, args.timeout)
+            case 'benchmark':
+                run_benchmark(args.games, args.repeat, args.seed, args.json)
+            case _:
+                main()
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+        if args.instrument:
+            instruments.disable()
+            write_report(instruments.to_json(), args.instrument)
+
 # < ========================================================
 # < Execution
 # < ========================================================
 
 if __name__ == "__main__":    
-    main()
+    cli()
 
     # POSTIT - Move printout functions to __repr__ or as class methods
     # POSTIT - Find correct homes for functions defined in shiphead.__main__.py
@@ -0,0 +1,287 @@
+"""
+Defines the BatchGame class for simulating many games in lockstep with NumPy
+- Each game is held as rows of arrays, suits are dropped as the rules never read them
+- Player piles and the center are held as rank counts
+- Every active game advances one turn per vectorized step
+- Only the 'random', 'good' and 'better' behaviours are vectorized
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+from . import lookups
+from .rank import RANK_DATA
+from .encoding import (
+    RANK_INDEX,
+    RANK_BY_INDEX
+)
+
+# < ========================================================
+# < Batch Constants
+# < ========================================================
+
+RANKS: int = len(RANK_BY_INDEX)
+SEVEN: int = RANK_INDEX['7']
+EIGHT: int = RANK_INDEX['8']
+NINE: int = RANK_INDEX['9']
+TEN: int = RANK_INDEX['10']
+
+HAND: int = 0
+SHOWN: int = 1
+HIDDEN: int = 2
+
+BEHAVIOURS: dict[str, int] = {
+    'random': 0,
+    'good': 1,
+    'better': 2
+}
+"""Lookup of vectorized behaviours to their integer codes"""
+
+IMPORTANCE: np.ndarray = np.array([RANK_DATA[rank].importance for rank in RANK_BY_INDEX], np.int8)
+"""Importance of each rank, by rank index"""
+
+def _compile_valid() -> np.ndarray:
+    """Compile the playability lookups to a boolean array of [standard, anchor + 1, rank]"""
+
+    valid: np.ndarray = np.zeros((2, RANKS + 1, RANKS), bool)
+    for standard in (False, True):
+        for rank, mask in lookups.VALID_MASKS[standard].items():
+            anchor: int = -1 if rank is None else RANK_INDEX[rank]
+            for index in range(RANKS):
+                valid[int(standard), anchor + 1, index] = bool(mask >> index & 1)
+    return valid
+
+VALID: np.ndarray = _compile_valid()
+"""Playable ranks for each standard flag and anchor rank index, offset by one for an empty center"""
+
+# < ========================================================
+# < BatchOutcome Class
+# < ========================================================
+
+@dataclass(slots = True)
+class BatchOutcome:
+    """Results of a batch of games, winner is a player uid or 0 if unfinished"""
+    winners: np.ndarray
+    turns: np.ndarray
+
+# < ========================================================
+# < BatchGame Class
+# < ========================================================
+
+class BatchGame:
+
+    def __init__(
+        self,
+        games: int,
+        seed: int = 0,
+        behaviours: list[str] | None = None,
+        max_turns: int | None = None
+    ) -> None:
+        """Create a batch of games and deal every game from its own shuffled deck"""
+
+        players: int = settings.player_count
+        behaviours = behaviours or ['random'] * players
+        if len(behaviours) != players:
+            raise ValueError(f'Expected {players} behaviours, got {len(behaviours)}')
+        for behaviour in behaviours:
+            if behaviour not in BEHAVIOURS:
+                raise ValueError(f'Behaviour [{behaviour}] is not vectorized')
+
+        self.games: int = games
+        self.players: int = players
+        self.behaviours: np.ndarray = np.array([BEHAVIOURS[b] for b in behaviours], np.int8)
+        self.max_turns: int = max_turns or settings.max_turns
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+        self.piles: np.ndarray = np.zeros((games, players, 3, RANKS), np.int8)
+        self.deck: np.ndarray = self.rng.permuted(
+            np.tile(np.repeat(np.arange(RANKS, dtype = np.int8), 4), (games, 1)), axis = 1
+        )
+        self.deck_size: np.ndarray = np.full(games, self.deck.shape[1], np.int16)
+        self.center: np.ndarray = np.zeros((games, RANKS), np.int8)
+        self.center_size: np.ndarray = np.zeros(games, np.int16)
+        self.top: np.ndarray = np.full(games, -1, np.int8)
+        self.top_run: np.ndarray = np.zeros(games, np.int16)
+        self.anchor: np.ndarray = np.full(games, -1, np.int8)
+        self.anchor_run: np.ndarray = np.zeros(games, np.int16)
+        self.burned: np.ndarray = np.zeros(games, np.int16)
+        self.standard: np.ndarray = np.ones(games, bool)
+        self.player: np.ndarray = np.zeros(games, np.int8)
+        self.turn: np.ndarray = np.ones(games, np.int32)
+        self.winner: np.ndarray = np.full(games, -1, np.int8)
+
+        self._deal()
+
+    def _pop_deck(self, games: np.ndarray) -> np.ndarray:
+        """Pop the top card rank of the deck for each of the given games"""
+
+        self.deck_size[games] -= 1
+        return self.deck[games, self.deck_size[games]]
+
+    def _deal(self) -> None:
+        """Deal cards to players in the same order as Core"""
+
+        games: np.ndarray = np.arange(self.games)
+        for pile, size in ((HIDDEN, settings.hidden_size), (SHOWN, settings.shown_size), (HAND, settings.hand_size)):
+            for _ in range(size):
+                for player in range(self.players):
+                    ranks = self._pop_deck(games)
+                    self.piles[games, player, pile, ranks] += 1
+
+        if settings.quick:
+            self.deck_size[:] = 0
+
+    def _reset_center(self, games: np.ndarray) -> None:
+        """Clear the center for the given games"""
+
+        self.center[games] = 0
+        self.center_size[games] = 0
+        self.top[games] = -1
+        self.top_run[games] = 0
+        self.anchor[games] = -1
+        self.anchor_run[games] = 0
+
+    @property
+    def active(self) -> np.ndarray:
+        """Get the indices of games that have not finished"""
+        return np.flatnonzero((self.winner < 0) & (self.turn <= self.max_turns))
+
+    def step(self) -> int:
+        """Advance every active game by one turn, returns the number of games advanced"""
+
+        games: np.ndarray = self.active
+        size: int = games.size
+        if not size:
+            return 0
+        rows: np.ndarray = np.arange(size)
+        player: np.ndarray = self.player[games]
+
+        # > Select the current pile of each player
+        piles: np.ndarray = self.piles[games, player]
+        sizes: np.ndarray = piles.sum(axis = 2)
+        pile: np.ndarray = np.where(sizes[:, HAND] > 0, HAND, np.where(sizes[:, SHOWN] > 0, SHOWN, HIDDEN))
+        hidden: np.ndarray = pile == HIDDEN
+        counts: np.ndarray = piles[rows, pile]
+
+        # > Options, hidden piles are always played blind
+        anchor: np.ndarray = self.anchor[games]
+        standard: np.ndarray = self.standard[games]
+        valid: np.ndarray = VALID[standard.astype(np.intp), anchor + 1]
+        playable: np.ndarray = (counts > 0) & (valid | hidden[:, None])
+        play: np.ndarray = playable.any(axis = 1)
+        wait: np.ndarray = ~play & ~hidden & standard & (anchor == EIGHT)
+        take: np.ndarray = ~play & ~wait
+
+        # > Behaviours choose a rank and a count for each game
+        behaviour: np.ndarray = self.behaviours[player]
+        combos: np.ndarray = np.where(playable, counts, 0).astype(np.int32)
+        cumulative: np.ndarray = combos.cumsum(axis = 1)
+        pick: np.ndarray = (self.rng.random(size) * np.maximum(cumulative[:, -1], 1)).astype(np.int32)
+        random_rank: np.ndarray = (cumulative <= pick[:, None]).sum(axis = 1)
+        lowest_rank: np.ndarray = np.where(playable, IMPORTANCE, 127).argmin(axis = 1)
+        rank: np.ndarray = np.where(behaviour == BEHAVIOURS['random'], random_rank, lowest_rank)
+        rank = np.minimum(rank, RANKS - 1)
+        available: np.ndarray = counts[rows, rank].astype(np.int16)
+        uniform: np.ndarray = 1 + (self.rng.random(size) * available).astype(np.int16)
+        count: np.ndarray = np.where(behaviour == BEHAVIOURS['better'], available, uniform)
+        count = np.where(hidden, 1, count)
+
+        # > Remove played cards from the current pile
+        counts[rows[play], rank[play]] -= count[play].astype(np.int8)
+        self.piles[games, player, pile] = counts
+
+        # > Push played cards, a failed blind play is pushed and then taken
+        fail: np.ndarray = play & hidden & ~valid[rows, rank]
+        self.center[games[play], rank[play]] += count[play].astype(np.int8)
+        self.center_size[games] += np.where(play, count, 0).astype(np.int16)
+
+        push: np.ndarray = play & ~fail
+        top: np.ndarray = self.top[games]
+        top_run: np.ndarray = self.top_run[games]
+        self.top_run[games] = np.where(push, np.where(top == rank, top_run + count, count), top_run)
+        self.top[games] = np.where(push, rank, top)
+
+        anchoring: np.ndarray = push & (rank != SEVEN)
+        anchor_run: np.ndarray = self.anchor_run[games]
+        self.anchor_run[games] = np.where(anchoring, np.where(anchor == rank, anchor_run + count, count), anchor_run)
+        self.anchor[games] = np.where(anchoring, rank, anchor)
+
+        # > Take the center into hand
+        taking: np.ndarray = fail | take
+        taken: np.ndarray = games[taking]
+        self.piles[taken, player[taking], HAND] += self.center[taken]
+        self._reset_center(taken)
+
+        # > Burn on a ten or four of a kind
+        burn: np.ndarray = push & (
+            (self.top[games] == TEN) | (self.top_run[games] >= 4) | (self.anchor_run[games] >= 4)
+        )
+        burned: np.ndarray = games[burn]
+        self.burned[burned] += self.center_size[burned]
+        self._reset_center(burned)
+
+        # > Draw back up to hand size after playing
+        need: np.ndarray = np.where(play, settings.hand_size - self.piles[games, player, HAND].sum(axis = 1), 0)
+        for i in range(settings.hand_size):
+            drawing: np.ndarray = (need > i) & (self.deck_size[games] > 0)
+            if not drawing.any():
+                break
+            drawn: np.ndarray = games[drawing]
+            ranks = self._pop_deck(drawn)
+            self.piles[drawn, player[drawing], HAND, ranks] += 1
+
+        # > Check for winners, who end the game without ending their turn
+        won: np.ndarray = play & (self.piles[games, player].sum(axis = (1, 2)) == 0)
+        self.winner[games[won]] = player[won]
+
+        # > End the turn
+        ending: np.ndarray = ~won
+        deactivating: np.ndarray = wait | (play & (self.top[games] == SEVEN) & (self.anchor[games] == NINE))
+        switching: np.ndarray = ending & ~burn
+        self.turn[games[ending]] += 1
+        self.player[games] = np.where(switching, (player + 1) % self.players, player)
+        self.standard[games] = np.where(ending, ~deactivating, standard)
+        return size
+
+    def run(self) -> BatchOutcome:
+        """Step every game until all have a winner or reach the turn limit"""
+
+        while self.step():
+            pass
+        return BatchOutcome(
+            winners = np.where(self.winner >= 0, self.winner + 1, 0).astype(np.int8),
+            turns = np.minimum(self.turn, self.max_turns)
+        )
+
+# < ========================================================
+# < Simulate Batch Function
+# < ========================================================
+
+def simulate_batch(
+    games: int,
+    seed: int = 0,
+    behaviours: list[str] | None = None,
+    max_turns: int | None = None
+) -> BatchOutcome:
+    """Simulate a batch of games in lockstep and return their outcomes"""
+    return BatchGame(games, seed, behaviours, max_turns).run()
@@ -0,0 +1,131 @@
+"""
+Defines the decision making for computer-controlled players
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Callable
+)
+if TYPE_CHECKING:
+    from .card import Card
+    from .core import Core
+    from .snapshot import Snapshot
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import random
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+from .snapshot import Result
+
+# < ========================================================
+# < Choose Behaviour Function
+# < ========================================================
+
+def choose_behaviour(rng: random.Random) -> str:
+    """Choose a behaviour at random, weighted by settings.behaviours"""
+    return rng.choices(*zip(*settings.behaviours.items()))[0]
+
+# < ========================================================
+# < Combination Helper Functions
+# < ========================================================
+
+def choose_prefix(groups: list[list[Card]], index: int) -> list[Card]:
+    """Get the combination at an index of all group prefixes, without building them all"""
+
+    for group in groups:
+        if index < len(group):
+            return group[:index + 1]
+        index -= len(group)
+    raise IndexError('Combination index out of range')
+
+def get_lowest_combinations(groups: list[list[Card]]) -> list[list[Card]]:
+    """Get every combination of the least important playable rank"""
+
+    lowest: int = min(group[0].importance for group in groups)
+    return [
+        group[:i] for group in groups if group[0].importance == lowest 
+        for i in range(1, len(group) + 1)
+    ]
+
+def get_lowest_group(groups: list[list[Card]]) -> list[Card]:
+    """Get the longest combination of the least important playable rank, the last if there are several"""
+
+    lowest: list[Card] = groups[0]
+    for group in groups:
+        if group[0].importance <= lowest[0].importance:
+            lowest = group
+    return lowest
+
+# < ========================================================
+# < Decide Function
+# < ========================================================
+
+def decide(snapshot: Snapshot, behaviour: str | None = None) -> Result:
+    """Decide a result for a snapshot, behaviour is chosen at random if None"""
+
+    if behaviour == 'search':
+        from .search import search
+        return search(snapshot)
+    if behaviour == 'endgame':
+        from .endgame import search
+        return search(snapshot)
+
+    rng: random.Random = snapshot.core.rng
+    options: list[str] = snapshot.options
+    option: str = ''
+    cards: list[Card] = []
+
+    if 'play' in options:
+        option = 'play'
+        behaviour = behaviour or choose_behaviour(rng)
+        groups: list[list[Card]]
+        choices: list[list[Card]]
+
+        match behaviour:
+            case 'random':
+                groups = snapshot.playable_groups
+                cards = choose_prefix(groups, rng.randrange(sum(len(group) for group in groups)))
+            case 'good':
+                choices = get_lowest_combinations(snapshot.lowest_groups)
+                cards = rng.choice(choices)
+            case 'better':
+                cards = get_lowest_group(snapshot.lowest_groups)
+            case 'best':
+                game: Core = snapshot.core
+                quads: list[list[Card]] = []
+                for combo in snapshot.playable_combinations:
+                    proposed = game.deck + combo
+                    if game.has_quad(proposed):
+                        quads.append(combo)
+                if quads:
+                    choices = quads
+                    sorter: Callable[[list[Card]], int] = lambda quad: quad[0].importance
+                    cards = sorted(choices, key = sorter)[0]
+                else:
+                    cards = get_lowest_group(snapshot.lowest_groups)
+            case _:
+                raise ValueError(f'Unknown behaviour [{behaviour}]')
+
+    else:
+        option = options[0]
+
+    return Result(
+        option = option,
+        cards = cards
+    )
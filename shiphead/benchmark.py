@@ -0,0 +1,275 @@
+"""
+Defines the benchmark suite for the game engine
+- Micro benchmarks time single engine calls on fixed states
+- Macro benchmarks time whole games for each behaviour and memory per snapshot
+- Every timing is warmed up and repeated, the median is reported
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    Any,
+    Callable
+)
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import copy
+import pickle
+import time
+import random
+import timeit
+import platform
+import statistics
+import tracemalloc
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+from .core import Core
+from .rank import RANK_NAMES
+from .suit import SUIT_NAMES
+from .card import (
+    Card,
+    create_deck
+)
+from .center import CenterPile
+from .rng import create_rng
+from .player import Player
+from .snapshot import Snapshot
+from .behaviours import decide
+from .simulate import (
+    simulate_game,
+    create_game,
+    play_turn
+)
+from . import delta
+from . import codec
+
+# < ========================================================
+# < Game State Functions
+# < ========================================================
+
+def create_midgame(seed: int = 0, turns: int = 40) -> Core:
+    """Create a separate Core and play random turns to reach a representative midgame state"""
+
+    rng: random.Random = create_rng(seed)
+    core: Core = Core()
+    core.init(
+        deck = create_deck(SUIT_NAMES, RANK_NAMES, settings.shuffled, rng),
+        players = [
+            Player(f'PC{uid}', False, uid, 'random')
+            for uid in range(1, settings.player_count + 1)
+        ],
+        rng = rng,
+        seed = seed
+    )
+    for _ in range(turns):
+        if core.winner is not None:
+            break
+        snapshot = core.create_snapshot()
+        core.apply_result(snapshot, decide(snapshot, 'random'))
+    return core
+
+def create_large_hand(seed: int = 0) -> Core:
+    """Create a separate Core where the current player has taken the whole deck, as in long games with many takes"""
+
+    quick: bool = settings.quick
+    settings.quick = False
+    try:
+        core: Core = create_midgame(seed, 0)
+    finally:
+        settings.quick = quick
+    core.center.extend(core.deck)
+    core.deck.clear()
+    core.take(core.player)
+    return core
+
+# < ========================================================
+# < Timing Functions
+# < ========================================================
+
+def measure(func: Callable[[], object], number: int, repeat: int = 7, warmup: int = 1) -> dict[str, float]:
+    """Time a call after warmup rounds, returns the median and spread per call in microseconds"""
+
+    timeit.repeat(func, number = number, repeat = warmup)
+    times: list[float] = [t / number * 1e6 for t in timeit.repeat(func, number = number, repeat = repeat)]
+    return {
+        'median_us': statistics.median(times),
+        'min_us': min(times),
+        'max_us': max(times),
+        'number': number,
+        'repeat': repeat
+    }
+
+# < ========================================================
+# < Clone Benchmark
+# < ========================================================
+
+def benchmark_clone(number: int = 10000, repeat: int = 7, seed: int = 0, turns: int = 40) -> dict[str, float]:
+    """Compare Core.clone against copy.deepcopy on a midgame state"""
+
+    core: Core = create_midgame(seed, turns)
+    clone: float = measure(core.clone, number, repeat)['median_us']
+    deepcopy: float = measure(lambda: copy.deepcopy(core), max(number // 100, 1), repeat)['median_us']
+    return {
+        'clone_us': clone,
+        'deepcopy_us': deepcopy,
+        'speedup': deepcopy / clone
+    }
+
+# < ========================================================
+# < Micro Benchmarks
+# < ========================================================
+
+def create_center() -> list[Card]:
+    """Create a large center of cards sorted by rank, with no tens and a run of three on top"""
+
+    cards: list[Card] = [
+        card for card in create_deck(SUIT_NAMES, RANK_NAMES, False) if card.rank != '10'
+    ]
+    return sorted(cards, key = lambda card: card.order)[:-1]
+
+def benchmark_micro(repeat: int = 7, seed: int = 0, turns: int = 40) -> dict[str, dict[str, float]]:
+    """Time single engine calls on a midgame state, a large hand and large centers"""
+
+    core: Core = create_midgame(seed, turns)
+    large: Core = create_large_hand(seed)
+    cards: list[Card] = create_center()
+    center: CenterPile = CenterPile(cards)
+
+    return {
+        'create_snapshot': measure(lambda: core.create_snapshot(lazy = True), 10000, repeat),
+        'create_snapshot_eager': measure(lambda: core.create_snapshot(lazy = False), 2000, repeat),
+        'create_snapshot_large_hand': measure(lambda: large.create_snapshot(lazy = False), 2000, repeat),
+        'playable_groups': measure(lambda: core.create_snapshot().playable_groups, 5000, repeat),
+        'playable_groups_large_hand': measure(lambda: large.create_snapshot().playable_groups, 2000, repeat),
+        'playable_combinations_large_hand': measure(lambda: large.create_snapshot().playable_combinations, 2000, repeat),
+        'has_quad_center': measure(lambda: core.has_quad(center), 20000, repeat),
+        'has_quad_list': measure(lambda: core.has_quad(cards), 2000, repeat),
+        'should_burn_center': measure(lambda: core.should_burn(center), 20000, repeat),
+        'should_burn_list': measure(lambda: core.should_burn(cards), 2000, repeat),
+        'create_deck': measure(lambda: create_deck(SUIT_NAMES, RANK_NAMES, True, core.rng), 1000, repeat),
+        'clone': measure(core.clone, 5000, repeat)
+    }
+
+# < ========================================================
+# < Macro Benchmarks
+# < ========================================================
+
+def benchmark_games(games: int = 50, repeat: int = 3, seed: int = 0) -> dict[str, dict[str, float]]:
+    """Time whole games with every player using each behaviour in settings.behaviours"""
+
+    results: dict[str, dict[str, float]] = {}
+    for behaviour in settings.behaviours:
+        behaviours: list[str | None] = [behaviour] * settings.player_count
+        simulate_game(seed, behaviours = behaviours)
+        rates: list[float] = []
+        turns: int = 0
+        for _ in range(repeat):
+            turns = 0
+            start: float = time.perf_counter()
+            for game in range(games):
+                turns += simulate_game(seed + game, behaviours = behaviours).turns
+            rates.append(games / (time.perf_counter() - start))
+        results[behaviour] = {
+            'median_games_per_second': statistics.median(rates),
+            'turns_per_game': turns / games,
+            'games': games,
+            'repeat': repeat
+        }
+    return results
+
+def benchmark_memory(count: int = 1000, seed: int = 0, turns: int = 40) -> dict[str, float]:
+    """Measure the memory allocated per snapshot, lazy and after every attribute is evaluated"""
+
+    core: Core = create_midgame(seed, turns)
+    results: dict[str, float] = {}
+    for name, lazy in (('lazy_bytes', True), ('eager_bytes', False)):
+        tracemalloc.start()
+        before: int = tracemalloc.get_traced_memory()[0]
+        snapshots: list[Snapshot] = [core.create_snapshot(lazy = lazy) for _ in range(count)]
+        after: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        results[name] = (after - before) / len(snapshots)
+    return results
+
+def benchmark_codec(repeat: int = 7, seed: int = 0, turns: int = 40) -> dict[str, dict[str, float]]:
+    """Compare the size and speed of the codec against pickle for a midgame Core and Snapshot"""
+
+    core: Core = create_midgame(seed, turns)
+    snapshot: Snapshot = core.create_snapshot()
+    results: dict[str, dict[str, float]] = {}
+    for name, value in (('core', core), ('snapshot', snapshot)):
+        encoded: bytes = codec.dumps(value)
+        compact: bytes = codec.dumps(value, rng = False)
+        pickled: bytes = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        results[name] = {
+            'codec_bytes': len(encoded),
+            'codec_no_rng_bytes': len(compact),
+            'pickle_bytes': len(pickled),
+            'codec_encode_us': measure(lambda: codec.dumps(value), 1000, repeat)['median_us'],
+            'codec_no_rng_encode_us': measure(lambda: codec.dumps(value, rng = False), 1000, repeat)['median_us'],
+            'pickle_encode_us': measure(lambda: pickle.dumps(value, pickle.HIGHEST_PROTOCOL), 200, repeat)['median_us'],
+            'codec_decode_us': measure(lambda: codec.loads(encoded), 1000, repeat)['median_us'],
+            'codec_no_rng_decode_us': measure(lambda: codec.loads(compact), 1000, repeat)['median_us'],
+            'pickle_decode_us': measure(lambda: pickle.loads(pickled), 200, repeat)['median_us']
+        }
+    return results
+
+def benchmark_updates(games: int = 20, seed: int = 0) -> dict[str, float]:
+    """Measure the size of delta updates against keyframes and pickled snapshots over whole games"""
+
+    sizes: dict[str, list[int]] = {'keyframe': [], 'delta': [], 'snapshot': []}
+    seconds: float = 0.0
+    for game in range(games):
+        core: Core = create_game(seed + game)
+        stream: delta.DeltaStream = delta.DeltaStream()
+        while core.winner is None and core.turn <= settings.max_turns:
+            start: float = time.perf_counter()
+            update: delta.Frame | delta.Delta = stream.update(core)
+            data: bytes = delta.encode(update)
+            seconds += time.perf_counter() - start
+            sizes['keyframe' if isinstance(update, delta.Frame) else 'delta'].append(len(data))
+            sizes['snapshot'].append(len(pickle.dumps(core.create_snapshot(lazy = False))))
+            play_turn(core)
+    updates: int = len(sizes['keyframe']) + len(sizes['delta'])
+    return {
+        'keyframe_bytes': statistics.mean(sizes['keyframe']),
+        'delta_bytes': statistics.mean(sizes['delta']),
+        'snapshot_pickle_bytes': statistics.mean(sizes['snapshot']),
+        'update_us': seconds / updates * 1e6
+    }
+
+# < ========================================================
+# < Benchmark Suite
+# < ========================================================
+
+def run_suite(games: int = 20, repeat: int = 7, seed: int = 0) -> dict[str, Any]:
+    """Run every benchmark, returns a JSON serializable dictionary"""
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'seed': seed
+        },
+        'micro': benchmark_micro(repeat, seed),
+        'games': benchmark_games(games, repeat, seed),
+        'memory': benchmark_memory(seed = seed),
+        'clone': benchmark_clone(repeat = repeat, seed = seed),
+        'codec': benchmark_codec(repeat, seed),
+        'updates': benchmark_updates(games, seed)
+    }
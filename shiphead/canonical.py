@@ -0,0 +1,100 @@
+"""
+Defines suit-agnostic canonical keys for game states
+- The rules never read suits, so states that only differ by suit share a key
+- Piles are reduced to rank counts, packed three bits per rank
+- The deck is packed as its ranks in order, as the order decides what is drawn, so keys are exact up to suits
+- The burned pile is left out, its rank counts are whatever the other piles do not hold
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Iterable
+)
+if TYPE_CHECKING:
+    from .card import Card
+    from .core import Core
+    from .center import CenterPile
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from .encoding import RANK_BY_INDEX
+
+# < ========================================================
+# < Packing Constants
+# < ========================================================
+
+COUNT_BITS: int = 3
+PILE_BITS: int = COUNT_BITS * len(RANK_BY_INDEX)
+RUN_BITS: int = 7
+DECK_BITS: int = 6
+RANK_BITS: int = 4
+
+# < ========================================================
+# < Rank Count Functions
+# < ========================================================
+
+def pack_cards(cards: Iterable[Card]) -> int:
+    """Pack the rank counts of any cards, three bits per rank index"""
+
+    packed: int = 0
+    for card in cards:
+        packed += 1 << (card.code >> 2) * COUNT_BITS
+    return packed
+
+def pack_center(center: CenterPile) -> int:
+    """Pack the rank counts of the center from its runs"""
+
+    packed: int = 0
+    for run in center.runs:
+        packed += len(run.cards) << (run.bit.bit_length() - 1) * COUNT_BITS
+    return packed
+
+def unpack_counts(packed: int) -> dict[str, int]:
+    """Unpack rank counts to a dictionary of rank name to count, omitting zeroes"""
+
+    mask: int = (1 << COUNT_BITS) - 1
+    counts: dict[str, int] = {}
+    for index, rank in enumerate(RANK_BY_INDEX):
+        count: int = packed >> index * COUNT_BITS & mask
+        if count:
+            counts[rank] = count
+    return counts
+
+def pack_run(card: Card | None, run: int) -> int:
+    """Pack a rank index, offset by one for no card, and a run length capped at 7"""
+
+    index: int = card.bit.bit_length() if card else 0
+    return index << 3 | min(run, 7)
+
+# < ========================================================
+# < Canonical Key Function
+# < ========================================================
+
+def canonical_key(core: Core) -> int:
+    """Get an exact suit-agnostic key for the game state, for use in caches and tables, games that differ only by suits share a key"""
+
+    center: CenterPile = core.center
+    key: int = core.player_index
+    key = key << 1 | core.standard
+    key = key << DECK_BITS | len(core.deck)
+    for card in core.deck:
+        key = key << RANK_BITS | card.code >> 2
+    key = key << RUN_BITS | pack_run(center.top_card, center.top_run)
+    key = key << RUN_BITS | pack_run(center.anchor_card, center.anchor_run)
+    key = key << PILE_BITS | pack_center(center)
+    for player in core.players:
+        key = key << PILE_BITS | pack_cards(player.hand)
+        key = key << PILE_BITS | pack_cards(player.shown)
+        key = key << PILE_BITS | pack_cards(player.hidden)
+    return key
@@ -1,5 +1,5 @@
 """
-Defines the Card class
+Defines the Card class and create_deck function
 
 Author: Ben Scarletti
 Source: https://github.com/scarletti-ben/shiphead-py
@@ -14,13 +14,24 @@ from typing import (
     ClassVar
 )
 
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import random
+
 # < ========================================================
 # < Package Imports
 # < ========================================================
 
 from . import settings
 from .rank import RANK_DATA
+from .rng import create_rng
 from .suit import SUIT_DATA
+from .encoding import (
+    RANK_BITS,
+    encode
+)
 
 # < ========================================================
 # < Card Class
@@ -28,6 +39,7 @@ from .suit import SUIT_DATA
 
 class Card:
 
+    __slots__ = ('rank', 'suit', 'uid', 'order', 'importance', 'code', 'bit')
     counter: ClassVar[int] = 0
 
     def __init__(self, rank: str, suit: str = 'hearts') -> None:
@@ -38,6 +50,8 @@ class Card:
         self.uid: int = Card.counter
         self.order: int = RANK_DATA[rank].order
         self.importance: int = RANK_DATA[rank].importance
+        self.code: int = encode(rank, suit)
+        self.bit: int = RANK_BITS[rank]
         Card.counter += 1
 
     def __repr__(self) -> str:
@@ -45,4 +59,25 @@ class Card:
         
         rank: str = getattr(RANK_DATA[self.rank], settings.rank_style)
         suit: str = getattr(SUIT_DATA[self.suit], settings.suit_style)
-        return f"{rank}{settings.separator}{suit}"
\ No newline at end of file
+        return f"{rank}{settings.separator}{suit}"
+
+# < ========================================================
+# < Create Deck Function
+# < ========================================================
+
+def create_deck(
+    suits: list[str], 
+    ranks: list[str], 
+    shuffle: bool = True,
+    rng: random.Random | None = None
+) -> list[Card]:
+    """Create a card list with all combinations of suits / ranks, shuffled by rng or a fresh stream"""
+
+    cards: list[Card] = []
+    for suit in suits:
+        for rank in ranks:
+            card = Card(rank, suit)
+            cards.append(card)
+    if shuffle:
+        (rng or create_rng()).shuffle(cards)
+    return cards
@@ -0,0 +1,244 @@
+"""
+Defines the Run, CenterPile and BurnedPile classes
+- Center cards are stored as runs of a single rank
+- Tracks top card, anchor card and run lengths as cards are pushed
+- Whole piles are moved by handing over their runs, not copying cards
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator
+)
+if TYPE_CHECKING:
+    from .card import Card
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+from dataclasses import dataclass
+from itertools import chain
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from .encoding import SEVEN
+from .zobrist import (
+    CENTER_KEYS,
+    TOP_KEYS,
+    ANCHOR_KEYS,
+    run_key
+)
+
+# < ========================================================
+# < Run Class
+# < ========================================================
+
+@dataclass(slots = True)
+class Run:
+    """Consecutive cards of a single rank, stored bottom to top"""
+    bit: int
+    cards: list[Card]
+
+    @property
+    def count(self) -> int:
+        """Get the number of cards in the run"""
+        return len(self.cards)
+
+# < ========================================================
+# < CenterPile Class
+# < ========================================================
+
+class CenterPile:
+
+    __slots__ = ('runs', 'size', 'top_card', 'anchor_card', 'anchor_run', 'contents_key')
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        """Create a center pile instance, pushing any given cards in order"""
+
+        self.runs: list[Run] = []
+        self.size: int = 0
+        self.top_card: Card | None = None
+        self.anchor_card: Card | None = None
+        self.anchor_run: int = 0
+        self.contents_key: int = 0
+        self.extend(cards)
+
+    @property
+    def top_rank(self) -> str | None:
+        """Get the rank of the top card"""
+        return self.top_card.rank if self.top_card else None
+
+    @property
+    def anchor_rank(self) -> str | None:
+        """Get the rank of the top card that is not a 7"""
+        return self.anchor_card.rank if self.anchor_card else None
+
+    @property
+    def top_run(self) -> int:
+        """Get the length of the run of a single rank on top"""
+        return len(self.runs[-1].cards) if self.runs else 0
+
+    @property
+    def key(self) -> int:
+        """Get the Zobrist key of the pile contents, top run and anchor run"""
+
+        top: int = self.top_card.bit if self.top_card else 0
+        anchor: int = self.anchor_card.bit if self.anchor_card else 0
+        return (
+            self.contents_key 
+            ^ run_key(TOP_KEYS, top, self.top_run) 
+            ^ run_key(ANCHOR_KEYS, anchor, self.anchor_run)
+        )
+
+    def append(self, card: Card) -> None:
+        """Push a card onto the pile, updating the tracked state"""
+
+        if self.runs and self.runs[-1].bit == card.bit:
+            self.runs[-1].cards.append(card)
+        else:
+            self.runs.append(Run(card.bit, [card]))
+        self.size += 1
+        self.top_card = card
+        self.contents_key ^= CENTER_KEYS[card.code]
+
+        if card.bit != SEVEN:
+            if self.anchor_card is not None and card.bit == self.anchor_card.bit:
+                self.anchor_run += 1
+            else:
+                self.anchor_run = 1
+            self.anchor_card = card
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        """Push cards onto the pile in order"""
+        for card in cards:
+            self.append(card)
+
+    def clear(self) -> None:
+        """Remove all cards from the pile"""
+        self.detach()
+
+    def detach(self) -> list[Run]:
+        """Remove all cards from the pile, handing over ownership of its runs"""
+
+        runs: list[Run] = self.runs
+        self.runs = []
+        self.size = 0
+        self.top_card = None
+        self.anchor_card = None
+        self.anchor_run = 0
+        self.contents_key = 0
+        return runs
+
+    def clone(self) -> CenterPile:
+        """Create a copy of the pile, only the top run is copied as lower runs never change"""
+
+        pile: CenterPile = CenterPile.__new__(CenterPile)
+        pile.runs = self.runs[:]
+        if pile.runs:
+            top: Run = pile.runs[-1]
+            pile.runs[-1] = Run(top.bit, top.cards[:])
+        pile.size = self.size
+        pile.top_card = self.top_card
+        pile.anchor_card = self.anchor_card
+        pile.anchor_run = self.anchor_run
+        pile.contents_key = self.contents_key
+        return pile
+
+    def has_consecutive(self, n: int) -> bool:
+        """Check if the pile has a run of n of a single rank on top, with or without 7s"""
+        return self.top_run >= n or self.anchor_run >= n
+
+    def __len__(self) -> int:
+        """Get the number of cards in the pile"""
+        return self.size
+
+    def __bool__(self) -> bool:
+        """Check if the pile has any cards"""
+        return self.size > 0
+
+    def __iter__(self) -> Iterator[Card]:
+        """Iterate cards from bottom to top"""
+        return chain.from_iterable(run.cards for run in self.runs)
+
+    def __reversed__(self) -> Iterator[Card]:
+        """Iterate cards from top to bottom"""
+        return chain.from_iterable(reversed(run.cards) for run in reversed(self.runs))
+
+    def __getitem__(self, index: int) -> Card:
+        """Get a card by index, from the bottom of the pile"""
+
+        if index == -1 and self.top_card is not None:
+            return self.top_card
+        return list(self)[index]
+
+    def __repr__(self) -> str:
+        """String representation of the pile"""
+        return repr(list(self))
+
+# < ========================================================
+# < BurnedPile Class
+# < ========================================================
+
+class BurnedPile:
+
+    __slots__ = ('runs', 'size')
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        """Create a burned pile instance, storing runs as they are burned, any given cards are split into runs in order"""
+
+        self.runs: list[Run] = []
+        self.size: int = 0
+        for card in cards:
+            if self.runs and self.runs[-1].bit == card.bit:
+                self.runs[-1].cards.append(card)
+            else:
+                self.runs.append(Run(card.bit, [card]))
+            self.size += 1
+
+    def receive(self, runs: list[Run]) -> None:
+        """Take ownership of runs detached from another pile"""
+
+        self.runs.extend(runs)
+        self.size += sum(len(run.cards) for run in runs)
+
+    def clear(self) -> None:
+        """Remove all cards from the pile"""
+
+        self.runs = []
+        self.size = 0
+
+    def clone(self) -> BurnedPile:
+        """Create a copy of the pile, burned runs never change so they are shared"""
+
+        pile: BurnedPile = BurnedPile.__new__(BurnedPile)
+        pile.runs = self.runs[:]
+        pile.size = self.size
+        return pile
+
+    def __len__(self) -> int:
+        """Get the number of cards in the pile"""
+        return self.size
+
+    def __bool__(self) -> bool:
+        """Check if the pile has any cards"""
+        return self.size > 0
+
+    def __iter__(self) -> Iterator[Card]:
+        """Iterate cards in the order they were burned"""
+        return chain.from_iterable(run.cards for run in self.runs)
+
+    def __repr__(self) -> str:
+        """String representation of the pile"""
+        return repr(list(self))
@@ -0,0 +1,245 @@
+"""
+Defines a compact binary codec for Core and Snapshot, for checkpoints and passing games between processes
+- Cards are written as single byte card codes, each pile prefixed by its length
+- The burned pile is written as its number of runs followed by each run, so runs split across burns stay split
+- Players are written as their uid, human flag, name and behaviour, followed by their piles
+- The random stream of the game is included by default, so a decoded game continues identically
+- The seed of the game is included when it has one, so searches in a decoded game draw the same streams
+- Decoded cards are shared Card instances from a table indexed by card code, unless a table is given
+- Snapshots are written with the game as it was on their turn, which needs a frozen Snapshot once that turn is applied
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    Sequence
+)
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import random
+import struct
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from .core import Core
+from .card import Card
+from .rng import create_rng
+from .player import Player
+from .center import (
+    Run,
+    CenterPile,
+    BurnedPile
+)
+from .snapshot import (
+    Snapshot,
+    Result
+)
+from .record import (
+    TURN,
+    OPTIONS,
+    NONE,
+    PLAYER,
+    encode_text,
+    decode_text,
+    encode_result
+)
+from .encoding import (
+    RANK_BY_INDEX,
+    code_rank,
+    code_suit
+)
+
+# < ========================================================
+# < Codec Format
+# < ========================================================
+
+CORE_MARKER: bytes = b'C'
+SNAPSHOT_MARKER: bytes = b'S'
+
+CORE: struct.Struct = struct.Struct('<cIBBBBB')
+"""Marker, turn, player index, standard flag, winner index plus one or 0, player count and flags"""
+
+RNG: struct.Struct = struct.Struct('<625Id')
+"""Mersenne Twister state words and the pending gauss value"""
+
+SEED: struct.Struct = struct.Struct('<Q')
+"""Seed of the game, that search streams are derived from"""
+
+RNG_FLAG: int = 1
+GAUSS_FLAG: int = 2
+SEED_FLAG: int = 4
+
+# < ========================================================
+# < Card Table
+# < ========================================================
+
+_CARDS: list[Card] = []
+
+def get_cards() -> list[Card]:
+    """Get the shared Card instances used by decoded games, indexed by card code"""
+
+    if not _CARDS:
+        _CARDS.extend(
+            Card(code_rank(code), code_suit(code)) for code in range(len(RANK_BY_INDEX) * 4)
+        )
+    return _CARDS
+
+# < ========================================================
+# < Core Functions
+# < ========================================================
+
+def encode_core(core: Core, rng: bool = True) -> bytes:
+    """Encode a game as bytes, including its random stream unless rng is False"""
+
+    flags: int = 0
+    tail: bytes = b''
+    if core.seed is not None:
+        flags |= SEED_FLAG
+        tail = SEED.pack(core.seed)
+    if rng:
+        version, words, gauss = core.rng.getstate()
+        flags |= RNG_FLAG | (GAUSS_FLAG if gauss is not None else 0)
+        tail += RNG.pack(*words, gauss or 0.0)
+
+    winner: int = core.players.index(core.winner) + 1 if core.winner is not None else 0
+    parts: list[bytes] = [CORE.pack(
+        CORE_MARKER, core.turn, core.player_index, core.standard, winner, len(core.players), flags
+    )]
+    codes: list[int] = []
+    for pile in (core.deck, core.center):
+        codes.append(len(pile))
+        codes.extend(card.code for card in pile)
+    codes.append(len(core.burned.runs))
+    for run in core.burned.runs:
+        codes.append(len(run.cards))
+        codes.extend(card.code for card in run.cards)
+    for player in core.players:
+        parts.append(PLAYER.pack(player.uid, player.human))
+        parts.append(encode_text(player.name))
+        parts.append(encode_text(player.behaviour))
+        for pile in (player.hand, player.shown, player.hidden):
+            codes.append(len(pile))
+            codes.extend(card.code for card in pile)
+    parts.append(bytes(codes))
+    parts.append(tail)
+    return b''.join(parts)
+
+def decode_core(data: bytes, cards: Sequence[Card] | None = None, offset: int = 0) -> Core:
+    """Decode a game from bytes, cards is a table of Card instances indexed by card code"""
+
+    marker, turn, player_index, standard, winner, count, flags = CORE.unpack_from(data, offset)
+    if marker != CORE_MARKER:
+        raise ValueError(f'Expected a core at byte {offset}')
+    offset += CORE.size
+    table: Sequence[Card] = cards if cards is not None else get_cards()
+
+    players: list[Player] = []
+    for _ in range(count):
+        uid, human = PLAYER.unpack_from(data, offset)
+        name, offset = decode_text(data, offset + PLAYER.size)
+        behaviour, offset = decode_text(data, offset)
+        players.append(Player(name, bool(human), uid, behaviour or None))
+
+    lookup = table.__getitem__
+    piles: list[list[Card]] = []
+    for _ in range(2):
+        size: int = data[offset]
+        piles.append(list(map(lookup, data[offset + 1:offset + 1 + size])))
+        offset += 1 + size
+    runs: list[Run] = []
+    offset += 1
+    for _ in range(data[offset - 1]):
+        size = data[offset]
+        burned: list[Card] = list(map(lookup, data[offset + 1:offset + 1 + size]))
+        runs.append(Run(burned[0].bit, burned))
+        offset += 1 + size
+    for player in players:
+        for pile in (player.hand, player.shown, player.hidden):
+            size = data[offset]
+            pile.extend(map(lookup, data[offset + 1:offset + 1 + size]))
+            offset += 1 + size
+        player.reindex()
+
+    core: Core = Core.__new__(Core)
+    core.players = players
+    core.deck = piles[0]
+    core.center = CenterPile(piles[1])
+    core.burned = BurnedPile()
+    core.burned.receive(runs)
+    core.standard = bool(standard)
+    core.turn = turn
+    core.player_index = player_index
+    core.winner = players[winner - 1] if winner else None
+    core.drawn = []
+    core.seed = None
+
+    if flags & SEED_FLAG:
+        core.seed = SEED.unpack_from(data, offset)[0]
+        offset += SEED.size
+    if flags & RNG_FLAG:
+        state: tuple = RNG.unpack_from(data, offset)
+        core.rng = random.Random.__new__(random.Random)
+        core.rng.setstate((3, state[:-1], state[-1] if flags & GAUSS_FLAG else None))
+    else:
+        core.rng = create_rng()
+    return core
+
+# < ========================================================
+# < Snapshot Functions
+# < ========================================================
+
+def encode_snapshot(snapshot: Snapshot, rng: bool = True) -> bytes:
+    """Encode a Snapshot and its result as bytes, with the game as it was on the turn of the snapshot"""
+
+    core: Core | None = snapshot.state
+    if core is None:
+        core = snapshot.core
+        if core.turn != snapshot.turn or snapshot.index.version != snapshot.version:
+            raise ValueError('Snapshot is from an earlier turn, create it with frozen = True to encode it after its turn')
+    result: bytes = TURN.pack(NONE, NONE, 0, NONE, NONE, NONE, NONE)
+    if snapshot.result is not None:
+        result = encode_result(snapshot.result)
+    return SNAPSHOT_MARKER + result + encode_core(core, rng)
+
+def decode_snapshot(data: bytes, cards: Sequence[Card] | None = None) -> Snapshot:
+    """Decode a Snapshot from bytes, as a fresh Snapshot of a decoded game at the turn of the snapshot"""
+
+    if data[:1] != SNAPSHOT_MARKER:
+        raise ValueError('Expected a snapshot at byte 0')
+    option, rank, length, *codes = TURN.unpack_from(data, 1)
+    core: Core = decode_core(data, cards, 1 + TURN.size)
+    snapshot: Snapshot = core.create_snapshot()
+    if option != NONE:
+        table: Sequence[Card] = cards if cards is not None else get_cards()
+        snapshot.result = Result(OPTIONS[option], [table[code] for code in codes[:length]])
+    return snapshot
+
+# < ========================================================
+# < Generic Functions
+# < ========================================================
+
+def dumps(value: Core | Snapshot, rng: bool = True) -> bytes:
+    """Encode a Core or a Snapshot as bytes"""
+
+    if isinstance(value, Snapshot):
+        return encode_snapshot(value, rng)
+    return encode_core(value, rng)
+
+def loads(data: bytes, cards: Sequence[Card] | None = None) -> Core | Snapshot:
+    """Decode a Core or a Snapshot from bytes"""
+
+    if data[:1] == SNAPSHOT_MARKER:
+        return decode_snapshot(data, cards)
+    return decode_core(data, cards)
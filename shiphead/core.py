@@ -1,5 +1,5 @@
 """
-Defines the Core class and instantiates core object
+Defines the Core class, each instance is an independent game
 
 Author: Ben Scarletti
 Source: https://github.com/scarletti-ben/shiphead-py
@@ -13,37 +13,47 @@ Licence: MIT
 from __future__ import annotations
 from typing import (
     TYPE_CHECKING,
-    Any,
     Callable,
     Iterable
 )
 if TYPE_CHECKING:
     from .card import Card
-    from .player import Player
 
 # < ========================================================
 # < External Imports
 # < ========================================================
 
-from pprint import (
-    pprint,
-    pformat
-)
+import random
 
 # < ========================================================
 # < Package Imports
 # < ========================================================
 
 from . import settings
-from .utils import (
-    group
-)
 from .rank import (
     RANK_DATA,
     RANK_NAMES
 )
 from . import lookups
-from .snapshot import Snapshot
+from . import zobrist
+from .rng import create_rng
+from .player import (
+    Player,
+    PileIndex
+)
+from .center import (
+    CenterPile,
+    BurnedPile
+)
+from .encoding import (
+    SEVEN,
+    NINE,
+    TEN
+)
+from .snapshot import (
+    Snapshot,
+    Result
+)
 
 # < ========================================================
 # < Core Class
@@ -55,14 +65,24 @@ class Core:
         """Create core instance as a manager for game state"""
         self.players: list[Player] = []
         self.deck: list[Card] = []
-        self.center: list[Card] = []
-        self.burned: list[Card] = []
+        self.center: CenterPile = CenterPile()
+        self.burned: BurnedPile = BurnedPile()
         self.standard: bool = True
         self.turn: int = 1
         self.player_index: int = 0
-
-    def init(self, deck: list[Card], players: list[Player]) -> None:
-        """Initialise the core, will deal cards to players"""
+        self.winner: Player | None = None
+        self.drawn: list[Card] = []
+        self.rng: random.Random = create_rng()
+        self.seed: int | None = None
+
+    def init(
+        self, 
+        deck: list[Card], 
+        players: list[Player], 
+        rng: random.Random | None = None, 
+        seed: int | None = None
+    ) -> None:
+        """Initialise the core, will deal cards to players, behaviours draw from rng or a fresh stream, seed derives other streams"""
 
         self.players.clear()
         self.deck.clear()
@@ -71,6 +91,10 @@ class Core:
         self.standard = True
         self.turn = 1
         self.player_index = 0
+        self.winner = None
+        self.drawn = []
+        self.rng = rng or create_rng()
+        self.seed = seed
 
         self.players[:] = players
         self.deck[:] = deck
@@ -86,16 +110,38 @@ class Core:
             for player in self.players:
                 card = self.deck.pop()
                 player.hidden.append(card)
+                player.indices['hidden'].append(card)
 
         for _ in range(settings.shown_size):
             for player in self.players:
                 card = self.deck.pop()
                 player.shown.append(card)
+                player.indices['shown'].append(card)
 
         for _ in range(settings.hand_size):
             for player in self.players:
                 card = self.deck.pop()
                 player.hand.append(card)
+                player.indices['hand'].append(card)
+
+    def clone(self) -> Core:
+        """Create a copy of the game state for search, sharing Card instances and the random stream"""
+
+        other: Core = Core.__new__(Core)
+        other.players = [player.clone() for player in self.players]
+        other.deck = self.deck[:]
+        other.center = self.center.clone()
+        other.burned = self.burned.clone()
+        other.standard = self.standard
+        other.turn = self.turn
+        other.player_index = self.player_index
+        other.winner = None
+        if self.winner is not None:
+            other.winner = other.players[self.players.index(self.winner)]
+        other.drawn = []
+        other.rng = self.rng
+        other.seed = self.seed
+        return other
 
     @property  
     def round(self) -> int:
@@ -107,6 +153,21 @@ class Core:
         """Get current player using current player index"""
         return self.players[self.player_index]
 
+    @property
+    def key(self) -> int:
+        """Get the Zobrist key of the game state, the center and the index of each player pile keep their own keys"""
+
+        key: int = (
+            self.center.key
+            ^ zobrist.DECK_KEYS[len(self.deck)]
+            ^ zobrist.PLAYER_KEYS[self.player_index]
+        )
+        if not self.standard:
+            key ^= zobrist.ALTERNATE_KEY
+        for player in self.players:
+            key ^= player.key
+        return key
+
     def next_player(self) -> None:
         """Cycle through player index"""
         self.player_index = (self.player_index + 1) % len(self.players)
@@ -115,73 +176,78 @@ class Core:
         """Convert card to rank, or return None if card is None"""
         return card.rank if card else None
 
-    def get_top_card(self, cards: list[Card]) -> Card | None:
+    def get_top_card(self, cards: list[Card] | CenterPile) -> Card | None:
         """Get the top card of a given card list"""
+
+        if isinstance(cards, CenterPile):
+            return cards.top_card
         return cards[-1] if cards else None
 
-    def get_top_rank(self, cards: list[Card]) -> str | None:
+    def get_top_rank(self, cards: list[Card] | CenterPile) -> str | None:
         """Get the top rank of a given card list"""
         card: Card | None = self.get_top_card(cards)
         return self.card_to_rank(card)
     
-    def get_anchor_card(self, cards: list[Card]) -> Card | None:
+    def get_anchor_card(self, cards: list[Card] | CenterPile) -> Card | None:
         """Get the top card in a given card list that is not a 7"""
 
+        if isinstance(cards, CenterPile):
+            return cards.anchor_card
         for card in reversed(cards):
-            if card.rank != '7':
+            if card.bit != SEVEN:
                 return card
         return None
     
-    def get_anchor_rank(self, cards: list[Card]) -> str | None:
+    def get_anchor_rank(self, cards: list[Card] | CenterPile) -> str | None:
         """Get the top rank in a given card list that is not a 7"""
         card: Card | None = self.get_anchor_card(cards)
         return self.card_to_rank(card)
     
-    def get_valid_ranks(self, rank: str | None, standard: bool) -> list[str]:
+    def get_valid_ranks(self, rank: str | None, standard: bool) -> frozenset[str]:
         """Get the valid card ranks that play on the given rank"""
 
-        lookup = lookups.standard if standard else lookups.alternate
-        ranks = lookup[rank]
+        ranks: frozenset[str] | None = lookups.VALID_RANKS[standard].get(rank)
         if ranks is None:
             raise UserWarning(f'Invalid game state detected for [{rank} | {standard}]')
         return ranks
     
-    def get_card_combinations(self, cards: list[Card]) -> list[list[Card]]:
-        """Get all the different combinations of ways to play a list of cards"""
-
-        groups: dict[str, list[Card]] = group(cards, lambda card: card.rank)
-        combinations: list[list[Card]] = []
-        for rank, cards in groups.items():
-            for i in range(1, len(cards) + 1):
-                combinations.append(cards[:i])
-        return combinations
+    def get_valid_mask(self, rank: str | None, standard: bool) -> int:
+        """Get the rank mask of valid card ranks that play on the given rank"""
+
+        mask: int | None = lookups.VALID_MASKS[standard].get(rank)
+        if mask is None:
+            raise UserWarning(f'Invalid game state detected for [{rank} | {standard}]')
+        return mask
     
     def same_rank(self, cards: list[Card]) -> bool:
         """Check if all cards in a card list are the same rank"""
-        return all(card.rank == cards[0].rank for card in cards)
+        return all(card.bit == cards[0].bit for card in cards)
     
     def get_consecutive(self, cards: list[Card], ignore_sevens: bool) -> list[Card]:
         """Get consecutive cards of the same rank from the top of a card list"""
 
-        cards = [c for c in cards if c.rank != '7'] if ignore_sevens else cards
+        cards = [c for c in cards if c.bit != SEVEN] if ignore_sevens else cards
         if not cards:
             return []
         
         output: list[Card] = []
-        target: str = cards[-1].rank
+        target: int = cards[-1].bit
         for card in reversed(cards):
-            if card.rank == target:
+            if card.bit == target:
                 output.append(card)
             else:
                 break
         return output
     
-    def has_consecutive(self, cards: list[Card], n: int) -> bool:
+    def has_consecutive(self, cards: list[Card] | CenterPile, n: int) -> bool:
         """Check if a list of cards has consecutive run of a single rank on top"""
 
         if len(cards) < n:
             return False
         
+        if isinstance(cards, CenterPile):
+            return cards.has_consecutive(n)
+        
         consecutive: list[Card] = self.get_consecutive(cards, False)
         if len(consecutive) >= n:
             return True
@@ -189,16 +255,16 @@ class Core:
         consecutive = self.get_consecutive(cards, True)
         return len(consecutive) >= n
     
-    def has_quad(self, cards: list[Card]) -> bool:
+    def has_quad(self, cards: list[Card] | CenterPile) -> bool:
         """Check if a list of cards has a quad on top"""
         return self.has_consecutive(cards, 4)
     
-    def has_ten(self, cards: list[Card]) -> bool:
+    def has_ten(self, cards: list[Card] | CenterPile) -> bool:
         """Check if a list of cards has a ten on top"""
-        rank: str | None = self.get_top_rank(cards)
-        return rank == '10'
+        card: Card | None = self.get_top_card(cards)
+        return card is not None and card.bit == TEN
     
-    def should_burn(self, cards: list[Card]) -> bool:
+    def should_burn(self, cards: list[Card] | CenterPile) -> bool:
         """Check if a list of cards has a ten on top or a four of a kind"""
         return self.has_quad(cards) or self.has_ten(cards)
     
@@ -212,65 +278,168 @@ class Core:
         sorter: Callable = lambda card: RANK_DATA[card.rank].importance
         return sorted(cards, key = sorter)
     
-    def create_snapshot(self) -> Snapshot:
-        """Create a Snapshot instance of the current game state"""
+    def create_snapshot(self, lazy: bool | None = None, frozen: bool | None = None) -> Snapshot:
+        """Create a Snapshot instance of the current game state, lazy and not frozen unless set otherwise"""
         
-        turn: int = self.turn
         player: Player = self.player
-        human: bool = player.human
-        pile: list[Card] = player.current_pile
+        pile_name: str = player.current_name
+        pile: list[Card] = player.piles[pile_name]
         if not pile:
             raise UserWarning('Win condition failed to trigger')
-        pile_name: str = player.pile_name(pile)
-        hidden: bool = pile_name == 'hidden'
-        center: list[Card] = self.center
-        deck: list[Card] = self.deck
-        burned: list[Card] = self.burned
-        standard: bool = self.standard
-        actual_rank: str | None = self.get_top_rank(center)
-        anchor_rank: str | None = self.get_anchor_rank(center)
-        valid_ranks: list[str] = self.get_valid_ranks(anchor_rank, standard)
-
-        playable_cards: list[Card] = []
-        playable_combinations: list[list[Card]] = []
-        options: list[str] = []
-
-        if not hidden:
-            playable_cards = [card for card in pile if card.rank in valid_ranks]
-            if playable_cards:
-                playable_combinations = self.get_card_combinations(playable_cards)
-                options.append('play')
-            if anchor_rank == '8' and standard:
-                options.append('wait')
-            elif len(self.center) > 0:
-                options.append('take')
-
-        else:
-            playable_cards = pile[:]
-            playable_combinations = [[card] for card in playable_cards]
-            options.append('play')
-        
-        return Snapshot(
-            turn = turn,
+        index: PileIndex = player.indices[pile_name]
+        if index.buckets is None:
+            index.build()
+
+        snapshot: Snapshot = Snapshot(
+            turn = self.turn,
             player = player,
-            human = human,
+            human = player.human,
             pile = pile,
             pile_name = pile_name,
-            hidden = hidden,
-            center = center,
-            deck = deck,
-            burned = burned,
-            standard = standard,
-            actual_rank = actual_rank,
-            anchor_rank = anchor_rank,
-            valid_ranks = valid_ranks,
-            playable_cards = playable_cards,
-            playable_combinations = playable_combinations,
-            options = options
+            hidden = pile_name == 'hidden',
+            center = self.center,
+            deck = self.deck,
+            burned = self.burned,
+            standard = self.standard,
+            cards = tuple(pile),
+            top_card = self.center.top_card,
+            anchor_card = self.center.anchor_card,
+            index = index,
+            version = index.version,
+            pile_mask = index.mask,
+            core = self
         )
 
-# < ========================================================
-# < Core Instance (Singleton)
-# < ========================================================
+        if lazy is None:
+            lazy = settings.lazy_snapshots
+        if not lazy:
+            snapshot.evaluate()
+        if frozen is None:
+            frozen = settings.frozen_snapshots
+        if frozen:
+            snapshot.state = self.freeze()
+        return snapshot
+
+    def freeze(self) -> Core:
+        """Create a copy of the game state with a copy of the random stream, so it keeps this turn as the game plays on"""
+
+        state: Core = self.clone()
+        state.rng = random.Random()
+        state.rng.setstate(self.rng.getstate())
+        return state
+    
+    def assess_pending(
+        self,
+        pending: list[Card], 
+        valid_mask: int, 
+        hidden: bool
+    ) -> bool:
+        """Assess pending list of cards, returns False for a failed hidden play"""
+
+        size: int = len(pending)
+
+        if size < 1:
+            raise UserWarning('No cards in pending')
 
-core: Core = Core()
\ No newline at end of file
+        if size > 4:
+            raise UserWarning('More than 4 cards in pending')
+        
+        target: int = pending[0].bit
+
+        if not all([card.bit == target for card in pending]):
+            raise UserWarning('Pending cards do not share the same rank')
+
+        if not target & valid_mask:
+            if not hidden:
+                raise UserWarning('Pending cards are not playable')
+            else:
+                return False
+
+        return True
+    
+    def assess_result(self, result: Result) -> bool:
+        """Assess result"""
+
+        if result.option == 'play' and not result.cards:
+            raise UserWarning('Cards must be submitted with play option')
+            
+        return True
+    
+    def draw(self, player: Player) -> list[Card]:
+        """Draw cards from the deck until the player's hand is full"""
+
+        drawn: list[Card] = []
+        index: PileIndex = player.indices['hand']
+        while self.deck and len(player.hand) < settings.hand_size:
+            card = self.deck.pop()
+            player.hand.append(card)
+            index.append(card)
+            drawn.append(card)
+        return drawn
+    
+    def take(self, player: Player) -> None:
+        """Move all cards in the center to the hand of a given player"""
+
+        index: PileIndex = player.indices['hand']
+        for run in self.center.detach():
+            player.hand.extend(run.cards)
+            index.extend_run(run.bit, run.cards)
+
+    def burn(self) -> None:
+        """Move all cards in the center to the burned pile"""
+        self.burned.receive(self.center.detach())
+    
+    def apply_result(self, snapshot: Snapshot, result: Result) -> None:
+        """Apply the result for a snapshot to the game state, ending the turn"""
+
+        self.assess_result(result)
+
+        player: Player = snapshot.player
+        valid_mask: int = snapshot.valid_mask
+        pending: list[Card] = []
+        switching: bool = True
+        deactivating: bool = False
+        self.drawn = []
+
+        match result.option:
+
+            case 'play':
+                index: PileIndex = player.indices[snapshot.pile_name]
+                for card in result.cards:
+                    snapshot.pile.remove(card)
+                    index.remove(card)
+                    pending.append(card)
+
+                if not self.assess_pending(pending, valid_mask, snapshot.hidden):
+                    self.center.extend(pending)
+                    self.take(player)
+                else:
+                    self.center.extend(pending)
+
+                if self.should_burn(self.center):
+                    self.burn()
+                    switching = False
+
+                self.drawn = self.draw(player)
+
+                if player.winning():
+                    self.winner = player
+                    return
+
+                top_card: Card | None = self.get_top_card(self.center)
+                anchor_card: Card | None = self.get_anchor_card(self.center)
+                deactivating = (
+                    top_card is not None and top_card.bit == SEVEN
+                    and anchor_card is not None and anchor_card.bit == NINE
+                )
+
+            case 'take':
+                self.take(player)
+
+            case 'wait':
+                deactivating = True
+
+        self.turn += 1
+        if switching:
+            self.next_player()
+        self.standard = not deactivating
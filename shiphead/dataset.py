@@ -0,0 +1,397 @@
+"""
+Defines the trajectory dataset of simulated games for reinforcement learning
+- Each transition is an observation, action mask, action, reward, done and truncated flags and the seat of the acting player
+- Observations are rank counts and sizes seen from the acting player, hidden cards are only counted
+- Actions are a fixed space of a rank and count to play, take, wait, or a blind play from the hidden pile
+- Rewards are given on the last transition of each player in a game, 1 to the winner and -1 to the others
+- A game cut off by settings.max_turns is truncated rather than done, and gives no reward
+- Transitions are written to append-only shards of raw NumPy memmap files, listed in a JSON manifest
+- The reader maps shards read-only, so batches are slices of the files on disk rather than copies
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Iterator
+)
+if TYPE_CHECKING:
+    from .card import Card
+    from .core import Core
+    from .center import (
+        Run,
+        CenterPile
+    )
+    from .player import Player
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import os
+import json
+
+import numpy as np
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+from .rng import derive_seed
+from .behaviours import decide
+from .simulate import create_game
+from .snapshot import (
+    Snapshot,
+    Result
+)
+from .encoding import RANK_BY_INDEX
+
+# < ========================================================
+# < Action Space
+# < ========================================================
+
+RANKS: int = len(RANK_BY_INDEX)
+TAKE: int = RANKS * 4
+WAIT: int = TAKE + 1
+HIDDEN: int = WAIT + 1
+ACTION_COUNT: int = HIDDEN + 1
+"""Plays are rank index * 4 + count - 1, followed by take, wait and a blind play from the hidden pile"""
+
+PILE_INDEX: dict[str, int] = {'hand': 0, 'shown': 1, 'hidden': 2}
+
+def encode_action(snapshot: Snapshot, result: Result) -> int:
+    """Get the action index of a Result"""
+
+    match result.option:
+        case 'take':
+            return TAKE
+        case 'wait':
+            return WAIT
+    if snapshot.hidden:
+        return HIDDEN
+    return (result.cards[0].code >> 2) * 4 + len(result.cards) - 1
+
+def decode_action(snapshot: Snapshot, action: int) -> Result:
+    """Get the Result for an action index, a blind play takes the top hidden card"""
+
+    if action == TAKE:
+        return Result('take')
+    if action == WAIT:
+        return Result('wait')
+    if action == HIDDEN:
+        return Result('play', [snapshot.blind_card])
+    cards: list[Card] = [card for card in snapshot.pile if card.code >> 2 == action >> 2]
+    count: int = (action & 3) + 1
+    if len(cards) < count:
+        raise ValueError(f'Action [{action}] is not playable from the {snapshot.pile_name} pile')
+    return Result('play', list(cards[:count]))
+
+def encode_mask(snapshot: Snapshot) -> list[bool]:
+    """Get the mask of legal action indices for a Snapshot"""
+
+    mask: list[bool] = [False] * ACTION_COUNT
+    if snapshot.hidden:
+        mask[HIDDEN] = True
+        return mask
+    for cards in snapshot.playable_groups:
+        start: int = (cards[0].code >> 2) * 4
+        mask[start:start + len(cards)] = [True] * len(cards)
+    mask[TAKE] = snapshot.takeable
+    mask[WAIT] = snapshot.waitable
+    return mask
+
+# < ========================================================
+# < Observations
+# < ========================================================
+
+def observation_size(players: int | None = None) -> int:
+    """Get the length of an observation for a number of players"""
+
+    others: int = (players or settings.player_count) - 1
+    return (
+        2 * RANKS + 1
+        + others * (RANKS + 2)
+        + 2 * RANKS
+        + 2 * (RANKS + 1)
+        + 5
+        + len(PILE_INDEX)
+    )
+
+def pile_counts(pile: list[Card]) -> list[int]:
+    """Get the rank counts of a player pile"""
+
+    counts: list[int] = [0] * RANKS
+    for card in pile:
+        counts[card.code >> 2] += 1
+    return counts
+
+def run_counts(runs: list[Run]) -> list[int]:
+    """Get the rank counts of the runs of the center or burned pile"""
+
+    counts: list[int] = [0] * RANKS
+    for run in runs:
+        counts[run.bit.bit_length() - 1] += len(run.cards)
+    return counts
+
+def one_hot(index: int, size: int) -> list[int]:
+    """Get a one-hot list"""
+
+    values: list[int] = [0] * size
+    values[index] = 1
+    return values
+
+def encode_observation(snapshot: Snapshot) -> list[int]:
+    """Get the observation of a Snapshot from the acting player, opponents follow in seat order"""
+
+    core: Core = snapshot.core
+    player: Player = snapshot.player
+    center: CenterPile = snapshot.center
+    index: int = core.players.index(player)
+
+    values: list[int] = pile_counts(player.hand) + pile_counts(player.shown) + [len(player.hidden)]
+    for offset in range(1, len(core.players)):
+        other: Player = core.players[(index + offset) % len(core.players)]
+        values += [len(other.hand), *pile_counts(other.shown), len(other.hidden)]
+
+    top: int = center.top_card.code >> 2 if center.top_card else -1
+    anchor: int = center.anchor_card.code >> 2 if center.anchor_card else -1
+    values += run_counts(center.runs)
+    values += run_counts(snapshot.burned.runs)
+    values += one_hot(top + 1, RANKS + 1)
+    values += one_hot(anchor + 1, RANKS + 1)
+    values += [center.top_run, center.anchor_run, len(center), len(snapshot.deck), snapshot.standard]
+    values += one_hot(PILE_INDEX[snapshot.pile_name], len(PILE_INDEX))
+    return values
+
+# < ========================================================
+# < Dataset Fields
+# < ========================================================
+
+def create_fields(players: int | None = None) -> dict[str, tuple[str, tuple[int, ...]]]:
+    """Get the dtype and row shape of every field of a transition"""
+
+    return {
+        'observation': ('int8', (observation_size(players),)),
+        'mask': ('bool', (ACTION_COUNT,)),
+        'action': ('int16', ()),
+        'reward': ('float32', ()),
+        'done': ('bool', ()),
+        'truncated': ('bool', ()),
+        'player': ('int8', ())
+    }
+
+MANIFEST: str = 'manifest.json'
+
+# < ========================================================
+# < Trajectory Functions
+# < ========================================================
+
+def play_trajectory(core: Core) -> dict[str, np.ndarray]:
+    """Play a game to the end or the turn limit, returns its transitions as arrays"""
+
+    observations: list[list[int]] = []
+    masks: list[list[bool]] = []
+    actions: list[int] = []
+    players: list[int] = []
+
+    while core.winner is None and core.turn <= settings.max_turns:
+        snapshot: Snapshot = core.create_snapshot()
+        result: Result = decide(snapshot, snapshot.player.behaviour)
+        observations.append(encode_observation(snapshot))
+        masks.append(encode_mask(snapshot))
+        actions.append(encode_action(snapshot, result))
+        players.append(core.player_index)
+        snapshot.result = result
+        core.apply_result(snapshot, result)
+
+    rewards: np.ndarray = np.zeros(len(actions), np.float32)
+    dones: np.ndarray = np.zeros(len(actions), bool)
+    truncations: np.ndarray = np.zeros(len(actions), bool)
+    for seat, player in enumerate(core.players):
+        last: int = max((i for i, acting in enumerate(players) if acting == seat), default = -1)
+        if last < 0:
+            continue
+        if core.winner is None:
+            truncations[last] = True
+        else:
+            dones[last] = True
+            rewards[last] = 1.0 if core.winner is player else -1.0
+
+    return {
+        'observation': np.array(observations, np.int8).reshape(len(actions), -1),
+        'mask': np.array(masks, bool).reshape(len(actions), ACTION_COUNT),
+        'action': np.array(actions, np.int16),
+        'reward': rewards,
+        'done': dones,
+        'truncated': truncations,
+        'player': np.array(players, np.int8)
+    }
+
+# < ========================================================
+# < TrajectoryWriter Class
+# < ========================================================
+
+class TrajectoryWriter:
+
+    def __init__(self, path: str, shard_size: int | None = None) -> None:
+        """Create a writer appending shards to a dataset directory, shards hold shard_size transitions"""
+
+        self.path: str = path
+        self.shard_size: int = shard_size or settings.dataset_shard_size
+        self.fields: dict[str, tuple[str, tuple[int, ...]]] = create_fields()
+        self.shards: list[dict[str, object]] = []
+        self.arrays: dict[str, np.memmap] = {}
+        self.size: int = 0
+
+        os.makedirs(path, exist_ok = True)
+        manifest: str = os.path.join(path, MANIFEST)
+        if os.path.exists(manifest):
+            with open(manifest, 'r', encoding = 'utf-8') as file:
+                data: dict = json.load(file)
+            fields = {name: (dtype, tuple(shape)) for name, (dtype, shape) in data['fields'].items()}
+            if fields != self.fields:
+                raise ValueError(f'Dataset [{path}] has different fields, such as another player count')
+            self.shards = data['shards']
+
+    def _open(self) -> None:
+        """Create the memmap files of a new shard"""
+
+        name: str = f'shard-{len(self.shards):05d}'
+        for field, (dtype, shape) in self.fields.items():
+            self.arrays[field] = np.memmap(
+                os.path.join(self.path, f'{name}.{field}.bin'), dtype, 'w+', shape = (self.shard_size, *shape)
+            )
+        self.shards.append({'name': name, 'size': 0})
+        self.size = 0
+
+    def _close(self) -> None:
+        """Flush the current shard, truncate its files to the transitions written and update the manifest"""
+
+        if not self.arrays:
+            return
+        name: str = str(self.shards[-1]['name'])
+        sizes: dict[str, int] = {}
+        for field, array in self.arrays.items():
+            array.flush()
+            sizes[field] = array.strides[0] * self.size
+        self.arrays = {}
+        for field, size in sizes.items():
+            os.truncate(os.path.join(self.path, f'{name}.{field}.bin'), size)
+        self.shards[-1]['size'] = self.size
+        self.write_manifest()
+
+    def write_manifest(self) -> None:
+        """Replace the manifest with the fields and the shards written so far"""
+
+        data: dict = {
+            'fields': {name: [dtype, list(shape)] for name, (dtype, shape) in self.fields.items()},
+            'shards': self.shards
+        }
+        path: str = os.path.join(self.path, MANIFEST)
+        with open(f'{path}.tmp', 'w', encoding = 'utf-8') as file:
+            json.dump(data, file, indent = 2)
+        os.replace(f'{path}.tmp', path)
+
+    def write(self, transitions: dict[str, np.ndarray]) -> None:
+        """Append transitions, split across shards as they fill"""
+
+        count: int = len(transitions['action'])
+        start: int = 0
+        while start < count:
+            if not self.arrays:
+                self._open()
+            rows: int = min(count - start, self.shard_size - self.size)
+            for field, array in self.arrays.items():
+                array[self.size:self.size + rows] = transitions[field][start:start + rows]
+            self.size += rows
+            start += rows
+            if self.size == self.shard_size:
+                self._close()
+
+    def close(self) -> None:
+        """Finish the current shard"""
+        self._close()
+
+    def __enter__(self) -> TrajectoryWriter:
+        """Use the writer as a context manager"""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Finish the current shard at the end of a block of code"""
+        self.close()
+
+# < ========================================================
+# < TrajectoryDataset Class
+# < ========================================================
+
+class TrajectoryDataset:
+
+    def __init__(self, path: str) -> None:
+        """Open a dataset directory for reading"""
+
+        self.path: str = path
+        with open(os.path.join(path, MANIFEST), 'r', encoding = 'utf-8') as file:
+            data: dict = json.load(file)
+        self.fields: dict[str, tuple[str, tuple[int, ...]]] = {
+            name: (dtype, tuple(shape)) for name, (dtype, shape) in data['fields'].items()
+        }
+        self.shards: list[dict[str, object]] = [shard for shard in data['shards'] if shard['size']]
+
+    def __len__(self) -> int:
+        """Get the number of transitions"""
+        return sum(int(shard['size']) for shard in self.shards)
+
+    def shard(self, index: int) -> dict[str, np.memmap]:
+        """Map every field of a shard read-only"""
+
+        shard: dict[str, object] = self.shards[index]
+        return {
+            field: np.memmap(
+                os.path.join(self.path, f'{shard["name"]}.{field}.bin'), dtype, 'r',
+                shape = (int(shard['size']), *shape)
+            )
+            for field, (dtype, shape) in self.fields.items()
+        }
+
+    def iter_shards(self) -> Iterator[dict[str, np.memmap]]:
+        """Iterate the mapped fields of every shard"""
+
+        for index in range(len(self.shards)):
+            yield self.shard(index)
+
+    def iter_batches(self, batch_size: int) -> Iterator[dict[str, np.memmap]]:
+        """Iterate batches as slices of the mapped shards, the last batch of each shard may be short"""
+
+        for arrays in self.iter_shards():
+            size: int = len(arrays['action'])
+            for start in range(0, size, batch_size):
+                yield {field: array[start:start + batch_size] for field, array in arrays.items()}
+
+# < ========================================================
+# < Generate Function
+# < ========================================================
+
+def generate(
+    path: str,
+    games: int,
+    seed: int = 0,
+    behaviours: list[str | None] | None = None,
+    shard_size: int | None = None
+) -> int:
+    """Simulate games and append their transitions to a dataset, returns the number of transitions"""
+
+    count: int = 0
+    with TrajectoryWriter(path, shard_size) as writer:
+        for i in range(games):
+            transitions: dict[str, np.ndarray] = play_trajectory(create_game(derive_seed(seed, i), behaviours))
+            writer.write(transitions)
+            count += len(transitions['action'])
+    return count
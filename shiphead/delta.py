@@ -0,0 +1,236 @@
+"""
+Defines delta-encoded state updates for trusted viewers, such as spectators and recorders
+- A Frame is the whole visible game state, each pile reduced to a tuple of card codes
+- A Delta holds only the cards that moved between two frames, and the turn, player and flags
+- A DeltaStream sends a keyframe every settings.keyframe_interval updates and deltas in between
+- A DeltaMirror rebuilds frames from the updates it receives, as a client would
+- Hands, shown and hidden piles are unordered and kept sorted, the deck, center and burned piles are ordered
+- Frames hold every card, including hidden ones, so updates must never be sent to a player in the game
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING
+)
+if TYPE_CHECKING:
+    from .core import Core
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import struct
+from dataclasses import dataclass
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+
+# < ========================================================
+# < Pile Locations
+# < ========================================================
+
+DECK: int = 0
+CENTER: int = 1
+BURNED: int = 2
+PLAYER_PILES: tuple[str, ...] = ('hand', 'shown', 'hidden')
+NONE: int = 0xFF
+"""Location of a card that is in neither frame, such as the deck cleared in quick games"""
+
+def player_location(index: int, pile: int) -> int:
+    """Get the location of a pile of a player, pile is an index into PLAYER_PILES"""
+    return BURNED + 1 + index * len(PLAYER_PILES) + pile
+
+def is_ordered(location: int) -> bool:
+    """Check if the order of cards in a location matters"""
+    return location <= BURNED
+
+# < ========================================================
+# < Update Classes
+# < ========================================================
+
+@dataclass(frozen = True, slots = True)
+class Frame:
+    """Whole game state as card codes, winner is a uid or 0, piles are indexed by location"""
+    turn: int
+    player_index: int
+    standard: bool
+    winner: int
+    piles: tuple[tuple[int, ...], ...]
+
+@dataclass(frozen = True, slots = True)
+class Delta:
+    """Changes from the previous frame, moves are tuples of card code, source and target locations"""
+    turn: int
+    player_index: int
+    standard: bool
+    winner: int
+    moves: tuple[tuple[int, int, int], ...]
+
+# < ========================================================
+# < Frame Functions
+# < ========================================================
+
+def capture(core: Core) -> Frame:
+    """Capture the state of a game as a Frame"""
+
+    piles: list[tuple[int, ...]] = [
+        tuple(card.code for card in core.deck),
+        tuple(card.code for card in core.center),
+        tuple(card.code for card in core.burned)
+    ]
+    for player in core.players:
+        for pile in (player.hand, player.shown, player.hidden):
+            piles.append(tuple(sorted(card.code for card in pile)))
+    return Frame(
+        core.turn, core.player_index, core.standard,
+        core.winner.uid if core.winner else 0, tuple(piles)
+    )
+
+def locate(frame: Frame) -> dict[int, int]:
+    """Get the location of every card code in a frame"""
+    return {code: location for location, pile in enumerate(frame.piles) for code in pile}
+
+def diff(before: Frame, after: Frame) -> Delta:
+    """Get the Delta that turns one frame into another"""
+
+    if len(before.piles) != len(after.piles):
+        raise ValueError('Frames must be of games with the same number of players')
+
+    sources: dict[int, int] = locate(before)
+    targets: dict[int, int] = locate(after)
+    moves: list[tuple[int, int, int]] = []
+    for location, pile in enumerate(after.piles):
+        if pile != before.piles[location]:
+            for code in pile:
+                source: int = sources.get(code, NONE)
+                if source != location:
+                    moves.append((code, source, location))
+    for code, source in sources.items():
+        if code not in targets:
+            moves.append((code, source, NONE))
+    return Delta(after.turn, after.player_index, after.standard, after.winner, tuple(moves))
+
+def apply(frame: Frame, delta: Delta) -> Frame:
+    """Apply a Delta to a frame, returns the next frame"""
+
+    piles: list[list[int]] = [list(pile) for pile in frame.piles]
+    changed: set[int] = set()
+    for code, source, target in delta.moves:
+        if source != NONE:
+            piles[source].remove(code)
+        if target != NONE:
+            piles[target].append(code)
+            changed.add(target)
+    for location in changed:
+        if not is_ordered(location):
+            piles[location].sort()
+    return Frame(delta.turn, delta.player_index, delta.standard, delta.winner, tuple(map(tuple, piles)))
+
+# < ========================================================
+# < Wire Format
+# < ========================================================
+
+KEYFRAME_MARKER: bytes = b'K'
+DELTA_MARKER: bytes = b'D'
+
+HEADER: struct.Struct = struct.Struct('<cIBBBB')
+"""Marker, turn, player index, standard flag, winner uid and a count of piles or moves"""
+
+MOVE: struct.Struct = struct.Struct('<BBB')
+"""Card code, source location and target location"""
+
+def encode(update: Frame | Delta) -> bytes:
+    """Encode a keyframe or a delta as bytes"""
+
+    if isinstance(update, Frame):
+        parts: list[bytes] = [HEADER.pack(
+            KEYFRAME_MARKER, update.turn, update.player_index, update.standard, update.winner, len(update.piles)
+        )]
+        for pile in update.piles:
+            parts.append(bytes((len(pile), *pile)))
+        return b''.join(parts)
+    header: bytes = HEADER.pack(
+        DELTA_MARKER, update.turn, update.player_index, update.standard, update.winner, len(update.moves)
+    )
+    return header + b''.join(MOVE.pack(*move) for move in update.moves)
+
+def decode(data: bytes) -> Frame | Delta:
+    """Decode a keyframe or a delta from bytes"""
+
+    marker, turn, player_index, standard, winner, count = HEADER.unpack_from(data)
+    offset: int = HEADER.size
+    if marker == KEYFRAME_MARKER:
+        piles: list[tuple[int, ...]] = []
+        for _ in range(count):
+            size: int = data[offset]
+            piles.append(tuple(data[offset + 1:offset + 1 + size]))
+            offset += 1 + size
+        return Frame(turn, player_index, bool(standard), winner, tuple(piles))
+    if marker == DELTA_MARKER:
+        moves: tuple[tuple[int, int, int], ...] = tuple(
+            MOVE.unpack_from(data, offset + index * MOVE.size) for index in range(count)
+        )
+        return Delta(turn, player_index, bool(standard), winner, moves)
+    raise ValueError(f'Unknown update marker [{marker!r}]')
+
+# < ========================================================
+# < DeltaStream Class
+# < ========================================================
+
+class DeltaStream:
+
+    def __init__(self, interval: int | None = None) -> None:
+        """Create a stream of updates for a game, sending a keyframe every interval updates"""
+
+        self.interval: int = interval or settings.keyframe_interval
+        self.frame: Frame | None = None
+        self.count: int = 0
+
+    def update(self, core: Core) -> Frame | Delta:
+        """Get the next update for the game, a keyframe or a delta from the previous update"""
+
+        frame: Frame = capture(core)
+        update: Frame | Delta = frame
+        if self.frame is not None and self.count % self.interval:
+            update = diff(self.frame, frame)
+        self.frame = frame
+        self.count += 1
+        return update
+
+    def keyframe(self) -> None:
+        """Send a keyframe on the next update, such as when a spectator joins"""
+        self.count = 0
+
+# < ========================================================
+# < DeltaMirror Class
+# < ========================================================
+
+class DeltaMirror:
+
+    def __init__(self) -> None:
+        """Create a mirror of a game, waiting for its first keyframe"""
+        self.frame: Frame | None = None
+
+    def receive(self, update: Frame | Delta | bytes) -> Frame:
+        """Apply an update, encoded or not, returns the current frame"""
+
+        if isinstance(update, (bytes, bytearray, memoryview)):
+            update = decode(bytes(update))
+        if isinstance(update, Frame):
+            self.frame = update
+        elif self.frame is None:
+            raise ValueError('A keyframe must be received before any delta')
+        else:
+            self.frame = apply(self.frame, update)
+        return self.frame
@@ -0,0 +1,108 @@
+"""
+Defines the compact integer encoding for cards and ranks
+- Cards are encoded as small integers, rank order * 4 + suit index
+- Sets of ranks are encoded as 13-bit masks, one bit per rank order
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Iterable
+)
+if TYPE_CHECKING:
+    from .card import Card
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from .rank import (
+    RANK_DATA,
+    RANK_NAMES
+)
+from .suit import SUIT_NAMES
+
+# < ========================================================
+# < Encoding Lookups
+# < ========================================================
+
+RANK_INDEX: dict[str, int] = {name: rank.order for name, rank in RANK_DATA.items()}
+"""Lookup for the integer index of a given rank name"""
+
+SUIT_INDEX: dict[str, int] = {name: index for index, name in enumerate(SUIT_NAMES)}
+"""Lookup for the integer index of a given suit name"""
+
+RANK_BITS: dict[str, int] = {name: 1 << index for name, index in RANK_INDEX.items()}
+"""Lookup for the single-bit mask of a given rank name"""
+
+RANK_BY_INDEX: list[str] = sorted(RANK_NAMES, key = lambda name: RANK_INDEX[name])
+"""Rank names ordered by their integer index"""
+
+ALL_RANKS: int = (1 << len(RANK_NAMES)) - 1
+"""Mask with a bit set for every rank"""
+
+BITS_BY_IMPORTANCE: tuple[int, ...] = tuple(
+    RANK_BITS[name] for name in sorted(RANK_NAMES, key = lambda name: RANK_DATA[name].importance)
+)
+"""Rank bits ordered from the least to the most important rank"""
+
+SEVEN: int = RANK_BITS['7']
+EIGHT: int = RANK_BITS['8']
+NINE: int = RANK_BITS['9']
+TEN: int = RANK_BITS['10']
+
+# < ========================================================
+# < Card Encoding Functions
+# < ========================================================
+
+def encode(rank: str, suit: str) -> int:
+    """Encode a rank and suit as a card integer"""
+    return RANK_INDEX[rank] * 4 + SUIT_INDEX[suit]
+
+def encode_cards(cards: Iterable[Card]) -> list[int]:
+    """Encode a list of cards as a list of card integers"""
+    return [card.code for card in cards]
+
+def code_rank(code: int) -> str:
+    """Get the rank name of a card integer"""
+    return RANK_BY_INDEX[code >> 2]
+
+def code_suit(code: int) -> str:
+    """Get the suit name of a card integer"""
+    return SUIT_NAMES[code & 3]
+
+def code_bit(code: int) -> int:
+    """Get the single-bit rank mask of a card integer"""
+    return 1 << (code >> 2)
+
+# < ========================================================
+# < Rank Mask Functions
+# < ========================================================
+
+def ranks_to_mask(ranks: Iterable[str]) -> int:
+    """Encode rank names as a rank mask"""
+
+    mask: int = 0
+    for rank in ranks:
+        mask |= RANK_BITS[rank]
+    return mask
+
+def mask_to_ranks(mask: int) -> list[str]:
+    """Decode a rank mask to rank names, in rank order"""
+    return [rank for index, rank in enumerate(RANK_BY_INDEX) if mask >> index & 1]
+
+def cards_to_mask(cards: Iterable[Card]) -> int:
+    """Get the mask of every rank present in a list of cards"""
+
+    mask: int = 0
+    for card in cards:
+        mask |= card.bit
+    return mask
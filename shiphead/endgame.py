@@ -0,0 +1,413 @@
+"""
+Defines the depth-limited endgame search behaviour for when the deck is empty
+- Piles are held as packed rank counts, suits are dropped as the rules never read them
+- Hidden cards are a shared pool of unseen rank counts, a blind play is a chance node
+- Searched by memoized expectimax with alpha-beta pruning, deepened until proven or out of nodes
+- States at the depth limit are scored by the share of cards held by the opponent, so values are heuristic
+- A state repeated on the search path, or seen at an earlier decision of the game, is scored as a loss for the searching player
+- Repetitions are counted as cutoffs, so values that depend on the path are never stored as proven
+- Only two player games are searched, other games fall back to settings.endgame_fallback
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Iterable
+)
+if TYPE_CHECKING:
+    from .card import Card
+    from .core import Core
+    from .snapshot import Snapshot
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+from dataclasses import dataclass
+from weakref import WeakKeyDictionary
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+from . import lookups
+from .rank import RANK_DATA
+from .snapshot import Result
+from .behaviours import decide
+from .zobrist import TranspositionTable
+from .encoding import (
+    RANK_INDEX,
+    RANK_BY_INDEX
+)
+from .canonical import (
+    COUNT_BITS,
+    PILE_BITS,
+    pack_cards,
+    pack_center
+)
+
+# < ========================================================
+# < Custom Types
+# < ========================================================
+
+State = tuple[int, bool, int, int, int, int, int, tuple[int, ...], tuple[int, ...], tuple[int, ...], int]
+"""Player, standard, top, top run, anchor, anchor run, center, hands, shown, hidden sizes and unseen pool"""
+
+Move = tuple[int, int, int]
+"""Option, rank index and count"""
+
+# < ========================================================
+# < Endgame Constants
+# < ========================================================
+
+RANKS: int = len(RANK_BY_INDEX)
+SEVEN: int = RANK_INDEX['7']
+EIGHT: int = RANK_INDEX['8']
+NINE: int = RANK_INDEX['9']
+TEN: int = RANK_INDEX['10']
+
+PLAY: int = 0
+HIDDEN: int = 1
+WAIT: int = 2
+TAKE: int = 3
+OPTIONS: tuple[str, ...] = ('play', 'play', 'wait', 'take')
+
+EXACT: int = 0
+LOWER: int = 1
+UPPER: int = 2
+PROVEN: int = 1 << 30
+"""Depth stored for subtrees that were searched to the end without any cutoff"""
+
+ORDER: tuple[int, ...] = tuple(sorted(range(RANKS), key = lambda i: RANK_DATA[RANK_BY_INDEX[i]].importance))
+"""Rank indices in the order plays are tried, least important first"""
+
+def _compile_valid() -> tuple[tuple[int | None, ...], ...]:
+    """Compile the playability lookups to masks by standard flag and anchor rank index, offset by one"""
+    return tuple(
+        tuple(lookups.VALID_MASKS[standard].get(rank) for rank in (None, *RANK_BY_INDEX))
+        for standard in (False, True)
+    )
+
+VALID: tuple[tuple[int | None, ...], ...] = _compile_valid()
+"""Playable rank mask for each standard flag and anchor rank index, offset by one for an empty center"""
+
+# < ========================================================
+# < State Functions
+# < ========================================================
+
+def create_state(core: Core) -> State:
+    """Create a search state from the game state, hidden cards are merged into one unseen pool"""
+
+    center = core.center
+    top: int = center.top_card.bit.bit_length() - 1 if center.top_card else -1
+    anchor: int = center.anchor_card.bit.bit_length() - 1 if center.anchor_card else -1
+    return (
+        core.player_index,
+        core.standard,
+        top,
+        center.top_run,
+        anchor,
+        center.anchor_run,
+        pack_center(center),
+        tuple(pack_cards(player.hand) for player in core.players),
+        tuple(pack_cards(player.shown) for player in core.players),
+        tuple(len(player.hidden) for player in core.players),
+        sum(pack_cards(player.hidden) for player in core.players)
+    )
+
+def pack_state(state: State) -> int:
+    """Pack a search state to an exact integer key"""
+
+    player, standard, top, top_run, anchor, anchor_run, center, hands, shown, hidden, pool = state
+    key: int = player << 1 | standard
+    key = key << 7 | (top + 1) << 3 | top_run
+    key = key << 7 | (anchor + 1) << 3 | anchor_run
+    key = key << PILE_BITS | center
+    key = key << PILE_BITS | pool
+    for index in range(len(hands)):
+        key = key << PILE_BITS | hands[index]
+        key = key << PILE_BITS | shown[index]
+        key = key << 3 | hidden[index]
+    return key
+
+def count_cards(packed: int) -> int:
+    """Count the cards held in packed rank counts"""
+
+    total: int = 0
+    while packed:
+        total += packed & 7
+        packed >>= COUNT_BITS
+    return total
+
+def replace(values: tuple[int, ...], index: int, value: int) -> tuple[int, ...]:
+    """Get a copy of a tuple with the value at an index replaced"""
+    return values[:index] + (value,) + values[index + 1:]
+
+def get_moves(state: State) -> list[Move]:
+    """Get every legal move for a state, likely best moves first"""
+
+    player, standard, top, _, anchor, _, _, hands, shown, _, _ = state
+    pile: int = hands[player] or shown[player]
+    if not pile:
+        return [(HIDDEN, 0, 1)]
+
+    valid: int | None = VALID[standard][anchor + 1]
+    if valid is None:
+        raise UserWarning(f'Invalid game state detected for [{anchor} | {standard}]')
+
+    moves: list[Move] = []
+    for rank in ORDER:
+        if valid >> rank & 1:
+            for count in range(pile >> rank * COUNT_BITS & 7, 0, -1):
+                moves.append((PLAY, rank, count))
+    if standard and anchor == EIGHT:
+        moves.append((WAIT, 0, 0))
+    elif top >= 0:
+        moves.append((TAKE, 0, 0))
+    return moves
+
+def advance(state: State, move: Move) -> State | None:
+    """Apply a move to a state as Core.apply_result would, returns None if the player wins"""
+
+    player, standard, top, top_run, anchor, anchor_run, center, hands, shown, hidden, pool = state
+    option, rank, count = move
+    following: int = (player + 1) % len(hands)
+
+    if option == TAKE:
+        hands = replace(hands, player, hands[player] + center)
+        return (following, True, -1, 0, -1, 0, 0, hands, shown, hidden, pool)
+    if option == WAIT:
+        return (following, False, top, top_run, anchor, anchor_run, center, hands, shown, hidden, pool)
+
+    cards: int = count << rank * COUNT_BITS
+    if option == HIDDEN:
+        hidden = replace(hidden, player, hidden[player] - 1)
+        pool -= cards
+        if not VALID[standard][anchor + 1] >> rank & 1:
+            hands = replace(hands, player, hands[player] + center + cards)
+            return (following, True, -1, 0, -1, 0, 0, hands, shown, hidden, pool)
+    elif hands[player]:
+        hands = replace(hands, player, hands[player] - cards)
+    else:
+        shown = replace(shown, player, shown[player] - cards)
+
+    center += cards
+    top_run = top_run + count if top == rank else count
+    top = rank
+    if rank != SEVEN:
+        anchor_run = anchor_run + count if anchor == rank else count
+        anchor = rank
+
+    if not hands[player] and not shown[player] and not hidden[player]:
+        return None
+    if top == TEN or top_run >= 4 or anchor_run >= 4:
+        return (player, True, -1, 0, -1, 0, 0, hands, shown, hidden, pool)
+    deactivating: bool = top == SEVEN and anchor == NINE
+    return (following, not deactivating, top, top_run, anchor, anchor_run, center, hands, shown, hidden, pool)
+
+def estimate(state: State) -> float:
+    """Estimate the win probability of the current player from the share of cards held by the opponent"""
+
+    player, _, _, _, _, _, _, hands, shown, hidden, _ = state
+    sizes: list[int] = [
+        count_cards(hands[index]) + count_cards(shown[index]) + hidden[index]
+        for index in range(len(hands))
+    ]
+    total: int = sum(sizes)
+    return (total - sizes[player]) / total if total else 0.5
+
+# < ========================================================
+# < Evaluation Class
+# < ========================================================
+
+@dataclass(frozen = True, slots = True)
+class Evaluation:
+    """Best move found for a state, value is the estimated win probability of the current player, exact if proven"""
+    move: Move
+    value: float
+    proven: bool
+    depth: int
+    nodes: int
+
+# < ========================================================
+# < Endgame Class
+# < ========================================================
+
+class BudgetExceeded(Exception):
+    """Raised when a search runs out of nodes"""
+
+class Endgame:
+
+    def __init__(self, budget: int | None = None, table: TranspositionTable | None = None) -> None:
+        """Create an endgame search with a node budget and a table shared across searches"""
+
+        self.budget: int = budget or settings.endgame_budget
+        self.table: TranspositionTable[tuple[int, int, float]] = (
+            table if table is not None else TranspositionTable(settings.endgame_table_size)
+        )
+        self.nodes: int = 0
+        self.cuts: int = 0
+        self.path: set[int] = set()
+        self.root: int = 0
+
+    def search(self, state: State, history: Iterable[int] = ()) -> Evaluation:
+        """Deepen the search until the value of the state is proven or the node budget runs out, history holds earlier state keys"""
+
+        moves: list[Move] = get_moves(state)
+        self.nodes = 0
+        if len(moves) == 1:
+            return Evaluation(moves[0], estimate(state), False, 0, 0)
+
+        key: int = pack_state(state)
+        seen: set[int] = {key, *history}
+        self.root = state[0]
+        best: Move = moves[0]
+        value: float = estimate(state)
+        proven: bool = False
+        completed: int = 0
+
+        for depth in range(1, settings.endgame_depth + 1):
+            self.cuts = 0
+            self.path = set(seen)
+            try:
+                best, value = self._search_root(state, moves, depth)
+            except BudgetExceeded:
+                break
+            completed = depth
+            moves.remove(best)
+            moves.insert(0, best)
+            if not self.cuts:
+                proven = True
+                break
+
+        return Evaluation(best, value, proven, completed, self.nodes)
+
+    def _search_root(self, state: State, moves: list[Move], depth: int) -> tuple[Move, float]:
+        """Search every root move to a depth, returns the best move and its value"""
+
+        best: Move = moves[0]
+        alpha: float = -1.0
+        for move in moves:
+            value: float = self._move_value(state, move, depth, alpha, 1.0)
+            if value > alpha:
+                best, alpha = move, value
+        return best, alpha
+
+    def _value(self, state: State, depth: int, alpha: float, beta: float) -> float:
+        """Get the value of a state for its current player, within an alpha-beta window"""
+
+        self.nodes += 1
+        if self.nodes > self.budget:
+            raise BudgetExceeded()
+
+        key: int = pack_state(state)
+        entry: tuple[int, int, float] | None = self.table.get(key)
+        if entry is not None:
+            stored, flag, value = entry
+            if stored >= depth and (
+                flag == EXACT
+                or (flag == LOWER and value >= beta)
+                or (flag == UPPER and value <= alpha)
+            ):
+                if stored != PROVEN:
+                    self.cuts += 1
+                return value
+
+        if depth <= 0:
+            self.cuts += 1
+            return estimate(state)
+        if key in self.path:
+            self.cuts += 1
+            return 0.0 if state[0] == self.root else 1.0
+
+        cuts: int = self.cuts
+        start: float = alpha
+        best: float = 0.0
+        self.path.add(key)
+        for move in get_moves(state):
+            value = self._move_value(state, move, depth, alpha, beta)
+            if value > best:
+                best = value
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        break
+        self.path.discard(key)
+
+        flag = UPPER if best <= start else LOWER if best >= beta else EXACT
+        self.table.put(key, (PROVEN if self.cuts == cuts else depth, flag, best), depth)
+        return best
+
+    def _move_value(self, state: State, move: Move, depth: int, alpha: float, beta: float) -> float:
+        """Get the value of a move for the current player, a blind play averages over the unseen pool"""
+
+        player: int = state[0]
+        if move[0] != HIDDEN:
+            child: State | None = advance(state, move)
+            if child is None:
+                return 1.0
+            return self._child_value(player, child, depth, alpha, beta)
+
+        pool: int = state[10]
+        total: int = count_cards(pool)
+        expected: float = 0.0
+        remaining: float = 1.0
+        for rank in range(RANKS):
+            count: int = pool >> rank * COUNT_BITS & 7
+            if not count:
+                continue
+            chance: float = count / total
+            outcome: State | None = advance(state, (HIDDEN, rank, 1))
+            value: float = 1.0 if outcome is None else self._child_value(player, outcome, depth, 0.0, 1.0)
+            expected += chance * value
+            remaining -= chance
+            if expected + remaining <= alpha:
+                return expected + remaining
+            if expected >= beta:
+                return expected
+        return expected
+
+    def _child_value(self, player: int, child: State, depth: int, alpha: float, beta: float) -> float:
+        """Get the value of a child state for a player, flipping the window if the turn passes"""
+
+        if child[0] == player:
+            return self._value(child, depth - 1, alpha, beta)
+        return 1.0 - self._value(child, depth - 1, 1.0 - beta, 1.0 - alpha)
+
+# < ========================================================
+# < Search Function
+# < ========================================================
+
+_HISTORY: WeakKeyDictionary[Core, set[int]] = WeakKeyDictionary()
+"""Keys of the states searched at earlier decisions, by game"""
+
+def to_result(snapshot: Snapshot, move: Move) -> Result:
+    """Convert a search move to a result for a snapshot"""
+
+    option, rank, count = move
+    if option == PLAY:
+        cards: list[Card] = [card for card in snapshot.pile if card.code >> 2 == rank][:count]
+        return Result('play', cards)
+    return Result(OPTIONS[option])
+
+def search(snapshot: Snapshot, budget: int | None = None) -> Result:
+    """Search for the move with the best estimated win probability once the deck is empty"""
+
+    core: Core = snapshot.core
+    if snapshot.hidden or core.deck or len(core.players) != 2:
+        return decide(snapshot, settings.endgame_fallback)
+
+    state: State = create_state(core)
+    history: set[int] = _HISTORY.setdefault(core, set())
+    evaluation: Evaluation = Endgame(budget).search(state, history)
+    history.add(pack_state(state))
+    return to_result(snapshot, evaluation.move)
@@ -0,0 +1,178 @@
+"""
+Defines opt-in instrumentation of the engine hot paths
+- Enabling swaps hot path methods for timed wrappers, disabling restores the originals
+- There is no overhead at all while disabled, as the original methods are in place
+- Times are inclusive, so a call that makes other instrumented calls includes their time
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    Any,
+    Callable
+)
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import sys
+import json
+import time
+import functools
+from dataclasses import dataclass
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import behaviours
+from .core import Core
+from .snapshot import Snapshot
+
+# < ========================================================
+# < Instrumented Targets
+# < ========================================================
+
+CORE_METHODS: dict[str, str] = {
+    'create_snapshot': 'snapshot',
+    'apply_result': 'turn',
+    'assess_pending': 'legality',
+    'assess_result': 'legality',
+    'burn': 'burn',
+    'take': 'take',
+    'draw': 'draw'
+}
+"""Core methods to instrument, by the category they are reported under"""
+
+SNAPSHOT_PROPERTIES: dict[str, str] = {
+    'valid_mask': 'legality',
+    'options': 'legality',
+    'playable_groups': 'combinations',
+    'lowest_groups': 'combinations',
+    'playable_combinations': 'combinations'
+}
+"""Snapshot properties to instrument, by the category they are reported under"""
+
+# < ========================================================
+# < Counter Class
+# < ========================================================
+
+@dataclass(slots = True)
+class Counter:
+    """Number of calls and total seconds spent for an instrumented target"""
+    calls: int = 0
+    seconds: float = 0.0
+
+# < ========================================================
+# < Instruments Class
+# < ========================================================
+
+class Instruments:
+
+    def __init__(self) -> None:
+        """Create an instruments instance, disabled until enabled"""
+
+        self.counters: dict[str, Counter] = {}
+        self.originals: list[tuple[object, str, Any]] = []
+
+    @property
+    def enabled(self) -> bool:
+        """Check if the instrumented wrappers are in place"""
+        return bool(self.originals)
+
+    def _timed(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a function to count its calls and time them under a name"""
+
+        counter: Counter = self.counters.setdefault(name, Counter())
+        clock: Callable[[], float] = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start: float = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                counter.seconds += clock() - start
+                counter.calls += 1
+
+        return wrapper
+
+    def _swap(self, owner: object, attribute: str, value: Any) -> None:
+        """Replace an attribute, remembering the original to restore"""
+
+        self.originals.append((owner, attribute, vars(owner)[attribute]))
+        setattr(owner, attribute, value)
+
+    def enable(self) -> None:
+        """Swap every target for a timed wrapper, decide is swapped in every module that imported it"""
+
+        if self.enabled:
+            return
+
+        for method, category in CORE_METHODS.items():
+            self._swap(Core, method, self._timed(f'{category}.{method}', vars(Core)[method]))
+
+        for name, category in SNAPSHOT_PROPERTIES.items():
+            prop: property = vars(Snapshot)[name]
+            self._swap(Snapshot, name, property(self._timed(f'{category}.{name}', prop.fget)))
+
+        decide: Callable[..., Any] = behaviours.decide
+        wrapped: Callable[..., Any] = self._timed('decision.decide', decide)
+        for module in list(sys.modules.values()):
+            if getattr(module, '__package__', None) == __package__ and getattr(module, 'decide', None) is decide:
+                self._swap(module, 'decide', wrapped)
+
+    def disable(self) -> None:
+        """Restore every original target, keeping the counters"""
+
+        for owner, attribute, original in reversed(self.originals):
+            setattr(owner, attribute, original)
+        self.originals.clear()
+
+    def reset(self) -> None:
+        """Reset every counter to zero"""
+
+        for counter in self.counters.values():
+            counter.calls = 0
+            counter.seconds = 0.0
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """Get the counters as a dictionary, sorted by total time"""
+
+        ordered = sorted(self.counters.items(), key = lambda item: item[1].seconds, reverse = True)
+        return {
+            name: {
+                'calls': counter.calls,
+                'total_ms': counter.seconds * 1e3,
+                'mean_us': counter.seconds / counter.calls * 1e6 if counter.calls else 0.0
+            }
+            for name, counter in ordered if counter.calls
+        }
+
+    def to_json(self) -> str:
+        """Get the report as a JSON string"""
+        return json.dumps(self.report(), indent = 2)
+
+    def __enter__(self) -> Instruments:
+        """Enable and reset the instruments for a block of code"""
+        self.reset()
+        self.enable()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Disable the instruments at the end of a block of code"""
+        self.disable()
+
+# < ========================================================
+# < Instruments Instance (Singleton)
+# < ========================================================
+
+instruments: Instruments = Instruments()
@@ -6,6 +6,24 @@ Source: https://github.com/scarletti-ben/shiphead-py
 Licence: MIT
 """
 
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from typing import Mapping
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+from types import MappingProxyType
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from .encoding import ranks_to_mask
+
 # < ========================================================
 # < Lookup Dictionaries
 # < ========================================================
@@ -44,4 +62,32 @@ alternate: dict[str | None, list[str] | None] = {
     'king': None,
     'ace': None
 }
-"""Lookup for playable ranks for a given rank during alternate table state"""
\ No newline at end of file
+"""Lookup for playable ranks for a given rank during alternate table state"""
+
+# < ========================================================
+# < Compiled Lookups
+# < ========================================================
+
+def _compile_masks(lookup: dict[str | None, list[str] | None]) -> Mapping[str | None, int]:
+    """Compile a lookup dictionary to an immutable rank mask lookup, omitting invalid states"""
+    return MappingProxyType({
+        rank: ranks_to_mask(ranks) for rank, ranks in lookup.items() if ranks is not None
+    })
+
+def _compile_sets(lookup: dict[str | None, list[str] | None]) -> Mapping[str | None, frozenset[str]]:
+    """Compile a lookup dictionary to an immutable rank set lookup, omitting invalid states"""
+    return MappingProxyType({
+        rank: frozenset(ranks) for rank, ranks in lookup.items() if ranks is not None
+    })
+
+VALID_MASKS: Mapping[bool, Mapping[str | None, int]] = MappingProxyType({
+    True: _compile_masks(standard),
+    False: _compile_masks(alternate)
+})
+"""Compiled lookup of playable rank masks, keyed by standard flag and then rank"""
+
+VALID_RANKS: Mapping[bool, Mapping[str | None, frozenset[str]]] = MappingProxyType({
+    True: _compile_sets(standard),
+    False: _compile_sets(alternate)
+})
+"""Compiled lookup of playable rank sets, keyed by standard flag and then rank"""
@@ -1,5 +1,9 @@
 """
-Defines the Player class
+Defines the PileIndex and Player classes
+- Player piles are plain lists, each with a PileIndex of its cards by rank
+- Core updates the index wherever it moves cards, so playable cards are found per rank rather than per card
+- Indices of cloned players are built from their piles when first read, so clones stay cheap
+- Each index also keeps the Zobrist key of its pile, updated with every card added or removed
 
 Author: Ben Scarletti
 Source: https://github.com/scarletti-ben/shiphead-py
@@ -17,17 +21,135 @@ from typing import (
 if TYPE_CHECKING:
     from .card import Card
 
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import zobrist
+
+# < ========================================================
+# < PileIndex Class
+# < ========================================================
+
+class PileIndex:
+
+    __slots__ = ('cards', 'buckets', 'mask', 'version', 'keys', 'key')
+
+    def __init__(self, cards: list[Card], keys: tuple[int, ...], key: int = 0) -> None:
+        """Create an index of a pile by rank bit, built from the pile when first read, key must match the cards given"""
+
+        self.cards: list[Card] = cards
+        self.buckets: dict[int, list[Card]] | None = None
+        self.mask: int = 0
+        self.version: int = 0
+        self.keys: tuple[int, ...] = keys
+        self.key: int = key
+
+    def build(self) -> None:
+        """Build the buckets and rank mask from the cards of the pile, buckets keep the order of the pile"""
+
+        buckets: dict[int, list[Card]] = {}
+        for card in self.cards:
+            bucket: list[Card] | None = buckets.get(card.bit)
+            if bucket is None:
+                buckets[card.bit] = [card]
+            else:
+                bucket.append(card)
+        mask: int = 0
+        for bit in buckets:
+            mask |= bit
+        self.buckets = buckets
+        self.mask = mask
+
+    def reset(self) -> None:
+        """Drop the buckets so they are built again when next read, and rekey the pile, after it was changed other than through Core"""
+
+        keys: tuple[int, ...] = self.keys
+        key: int = 0
+        for card in self.cards:
+            key ^= keys[card.code]
+        self.key = key
+        self.buckets = None
+        self.version += 1
+
+    def append(self, card: Card) -> None:
+        """Add a card that was appended to the pile"""
+
+        self.key ^= self.keys[card.code]
+        buckets: dict[int, list[Card]] | None = self.buckets
+        if buckets is not None:
+            bucket: list[Card] | None = buckets.get(card.bit)
+            if bucket is None:
+                buckets[card.bit] = [card]
+                self.mask |= card.bit
+            else:
+                bucket.append(card)
+        self.version += 1
+
+    def extend_run(self, bit: int, cards: list[Card]) -> None:
+        """Add cards of a single rank that were appended to the pile"""
+
+        keys: tuple[int, ...] = self.keys
+        for card in cards:
+            self.key ^= keys[card.code]
+        buckets: dict[int, list[Card]] | None = self.buckets
+        if buckets is not None:
+            bucket: list[Card] | None = buckets.get(bit)
+            if bucket is None:
+                buckets[bit] = cards[:]
+                self.mask |= bit
+            else:
+                bucket.extend(cards)
+        self.version += 1
+
+    def remove(self, card: Card) -> None:
+        """Remove a card that was removed from the pile"""
+
+        self.key ^= self.keys[card.code]
+        buckets: dict[int, list[Card]] | None = self.buckets
+        if buckets is not None:
+            bucket: list[Card] = buckets[card.bit]
+            bucket.remove(card)
+            if not bucket:
+                del buckets[card.bit]
+                self.mask ^= card.bit
+        self.version += 1
+
+    def group(self, bit: int) -> list[Card]:
+        """Get a copy of the bucket for a rank bit"""
+
+        if self.buckets is None:
+            self.build()
+        return self.buckets[bit][:]
+
+    def groups(self, mask: int) -> list[list[Card]]:
+        """Get copies of the buckets for ranks in a mask, lowest rank first"""
+
+        if self.buckets is None:
+            self.build()
+        groups: list[list[Card]] = []
+        buckets: dict[int, list[Card]] = self.buckets
+        while mask:
+            bit: int = mask & -mask
+            groups.append(buckets[bit][:])
+            mask ^= bit
+        return groups
+
 # < ========================================================
 # < Player Class
 # < ========================================================
 
 class Player:
-    def __init__(self, name: str, human: bool, uid: int, ) -> None:
-        """Create a Player instance"""
+
+    __slots__ = ('name', 'human', 'uid', 'behaviour', 'hand', 'shown', 'hidden', 'piles', 'indices')
+
+    def __init__(self, name: str, human: bool, uid: int, behaviour: str | None = None) -> None:
+        """Create a Player instance, computer behaviour is chosen each turn if None"""
 
         self.name: str = name
         self.human: bool = human
         self.uid: int = uid
+        self.behaviour: str | None = behaviour
         self.hand: list[Card] = []
         self.shown: list[Card] = []
         self.hidden: list[Card] = []
@@ -36,6 +158,22 @@ class Player:
             'shown': self.shown,
             'hidden': self.hidden
         }
+        self.indices: dict[str, PileIndex] = {
+            name: PileIndex(pile, zobrist.get_pile_keys(f'{uid}:{name}')) for name, pile in self.piles.items()
+        }
+
+    def reindex(self) -> None:
+        """Rebuild the index of every pile when next read, after its cards were changed other than through Core"""
+
+        for index in self.indices.values():
+            index.reset()
+
+    @property
+    def key(self) -> int:
+        """Get the Zobrist key of the cards in every pile of the player"""
+
+        indices: dict[str, PileIndex] = self.indices
+        return indices['hand'].key ^ indices['shown'].key ^ indices['hidden'].key
 
     def pile_name(self, pile: list[Card]) -> str:
         """Get pile name reference for a given pile"""
@@ -84,15 +222,48 @@ class Player:
             return self.hand
         elif self.shown:
             return self.shown
-        elif self.hidden:
-            return self.hidden
         else:
-            return []
+            return self.hidden
         
+    @property
+    def current_name(self) -> str:
+        """Get the name of the current pile of cards the player can access"""
+
+        if self.hand:
+            return 'hand'
+        elif self.shown:
+            return 'shown'
+        else:
+            return 'hidden'
+
     def winning(self) -> bool:
         """Check to see if this player is winning or has won"""
         return not self.current_pile
         
+    def clone(self) -> Player:
+        """Create a copy of the player and their piles, sharing Card instances"""
+
+        player: Player = Player.__new__(Player)
+        player.name = self.name
+        player.human = self.human
+        player.uid = self.uid
+        player.behaviour = self.behaviour
+        player.hand = self.hand[:]
+        player.shown = self.shown[:]
+        player.hidden = self.hidden[:]
+        player.piles = {
+            'hand': player.hand,
+            'shown': player.shown,
+            'hidden': player.hidden
+        }
+        indices: dict[str, PileIndex] = self.indices
+        player.indices = {
+            'hand': PileIndex(player.hand, indices['hand'].keys, indices['hand'].key),
+            'shown': PileIndex(player.shown, indices['shown'].keys, indices['shown'].key),
+            'hidden': PileIndex(player.hidden, indices['hidden'].keys, indices['hidden'].key)
+        }
+        return player
+
     def __repr__(self) -> str:
         """String representation of a player"""
         return f"P{self.uid} [{self.name}]"
\ No newline at end of file
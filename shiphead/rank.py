@@ -18,7 +18,7 @@ from dataclasses import dataclass
 # < Rank Class
 # < ========================================================
 
-@dataclass
+@dataclass(frozen = True, slots = True)
 class Rank:
     name: str
     long_title: str
@@ -0,0 +1,247 @@
+"""
+Defines the compact binary game record format and its buffered writer and reader
+- A file starts with a magic string and holds any number of games, appended one after another
+- A game starts with a header of its seed, the deal settings and the players
+- Each Result is one fixed-size record of option, rank, count and up to four card codes
+- A game ends with a fixed-size record of the winner and the number of turns
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Iterator
+)
+if TYPE_CHECKING:
+    from .card import Card
+    from .player import Player
+    from .snapshot import Result
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import struct
+from dataclasses import dataclass
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+
+# < ========================================================
+# < Record Format
+# < ========================================================
+
+MAGIC: bytes = b'SHPH\x02'
+"""Written once at the start of a file, the last byte is the format version"""
+
+GAME_MARKER: bytes = b'G'
+
+GAME: struct.Struct = struct.Struct('<cQBBBBB')
+"""Marker, seed, player count, hand size, shown size, hidden size and flags"""
+
+PLAYER: struct.Struct = struct.Struct('<BB')
+"""Uid and human flag, followed by a length-prefixed name and behaviour"""
+
+TURN: struct.Struct = struct.Struct('<BBB4B')
+"""Option, rank index, count and four card codes, padded with NONE"""
+
+END: struct.Struct = struct.Struct('<BBBI')
+"""End option, winner uid or 0, unused and the number of turns, the same size as TURN"""
+
+OPTIONS: tuple[str, ...] = ('play', 'take', 'wait')
+OPTION_CODES: dict[str, int] = {option: code for code, option in enumerate(OPTIONS)}
+END_CODE: int = 0xFF
+NONE: int = 0xFF
+
+QUICK_FLAG: int = 1
+SHUFFLED_FLAG: int = 2
+
+# < ========================================================
+# < Record Classes
+# < ========================================================
+
+@dataclass(frozen = True, slots = True)
+class PlayerInfo:
+    """Player details needed to recreate a recorded game"""
+    uid: int
+    name: str
+    human: bool
+    behaviour: str | None
+
+@dataclass(frozen = True, slots = True)
+class Action:
+    """A recorded Result, rank is a rank index and codes are card codes"""
+    option: str
+    rank: int | None
+    codes: tuple[int, ...]
+
+@dataclass(slots = True)
+class GameRecord:
+    """A recorded game, winner is None if it did not finish"""
+    seed: int
+    hand_size: int
+    shown_size: int
+    hidden_size: int
+    quick: bool
+    shuffled: bool
+    players: list[PlayerInfo]
+    actions: list[Action]
+    winner: int | None = None
+    turns: int = 0
+
+# < ========================================================
+# < Encoding Functions
+# < ========================================================
+
+def encode_text(text: str | None) -> bytes:
+    """Encode a short string with a single length byte"""
+
+    data: bytes = (text or '').encode('utf-8')[:255]
+    return bytes((len(data),)) + data
+
+def encode_header(seed: int, players: list[Player]) -> bytes:
+    """Encode a game header from the current settings and a player list"""
+
+    flags: int = (QUICK_FLAG if settings.quick else 0) | (SHUFFLED_FLAG if settings.shuffled else 0)
+    parts: list[bytes] = [GAME.pack(
+        GAME_MARKER, seed, len(players),
+        settings.hand_size, settings.shown_size, settings.hidden_size, flags
+    )]
+    for player in players:
+        parts.append(PLAYER.pack(player.uid, player.human))
+        parts.append(encode_text(player.name))
+        parts.append(encode_text(player.behaviour))
+    return b''.join(parts)
+
+def encode_result(result: Result) -> bytes:
+    """Encode a Result as a fixed-size turn record"""
+
+    cards: list[Card] = result.cards
+    codes: list[int] = [card.code for card in cards[:4]]
+    codes += [NONE] * (4 - len(codes))
+    rank: int = cards[0].code >> 2 if cards else NONE
+    return TURN.pack(OPTION_CODES[result.option], rank, len(cards), *codes)
+
+# < ========================================================
+# < RecordWriter Class
+# < ========================================================
+
+class RecordWriter:
+
+    def __init__(self, path: str | None = None, block_size: int = 1 << 20) -> None:
+        """Create a writer appending to a record file, flushing in blocks of block_size bytes"""
+
+        self.path: str = path or settings.log_file
+        self.block_size: int = block_size
+        self.buffer: bytearray = bytearray()
+        self.file: BinaryIO = open(self.path, 'ab', buffering = 0)
+        if self.file.tell() == 0:
+            self.buffer += MAGIC
+
+    def begin(self, seed: int, players: list[Player]) -> None:
+        """Start recording a game"""
+        self.buffer += encode_header(seed, players)
+
+    def record(self, result: Result) -> None:
+        """Record a Result for the current game"""
+
+        self.buffer += encode_result(result)
+        if len(self.buffer) >= self.block_size:
+            self.flush()
+
+    def end(self, winner: Player | None, turns: int) -> None:
+        """Finish recording the current game"""
+
+        self.buffer += END.pack(END_CODE, winner.uid if winner else 0, 0, turns)
+        if len(self.buffer) >= self.block_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records to the file"""
+
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+
+    def close(self) -> None:
+        """Flush and close the file"""
+
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self) -> RecordWriter:
+        """Use the writer as a context manager"""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the writer at the end of a block of code"""
+        self.close()
+
+# < ========================================================
+# < Reader Functions
+# < ========================================================
+
+def decode_text(data: bytes | memoryview, offset: int) -> tuple[str, int]:
+    """Decode a length-prefixed string, returns the string and the next offset"""
+
+    size: int = data[offset]
+    start: int = offset + 1
+    return bytes(data[start:start + size]).decode('utf-8'), start + size
+
+def decode_records(data: bytes) -> Iterator[GameRecord]:
+    """Decode every game in the contents of a record file"""
+
+    if not data.startswith(MAGIC):
+        raise ValueError('Not a shiphead record file')
+
+    view: memoryview = memoryview(data)
+    offset: int = len(MAGIC)
+    size: int = len(data)
+
+    while offset < size:
+        marker, seed, count, hand_size, shown_size, hidden_size, flags = GAME.unpack_from(view, offset)
+        if marker != GAME_MARKER:
+            raise ValueError(f'Expected a game header at byte {offset}')
+        offset += GAME.size
+
+        players: list[PlayerInfo] = []
+        for _ in range(count):
+            uid, human = PLAYER.unpack_from(view, offset)
+            name, offset = decode_text(view, offset + PLAYER.size)
+            behaviour, offset = decode_text(view, offset)
+            players.append(PlayerInfo(uid, name, bool(human), behaviour or None))
+
+        game: GameRecord = GameRecord(
+            seed, hand_size, shown_size, hidden_size,
+            bool(flags & QUICK_FLAG), bool(flags & SHUFFLED_FLAG), players, []
+        )
+        while offset < size:
+            option, rank, length, *codes = TURN.unpack_from(view, offset)
+            if option == END_CODE:
+                _, winner, _, turns = END.unpack_from(view, offset)
+                game.winner = winner or None
+                game.turns = turns
+                offset += END.size
+                break
+            game.actions.append(Action(OPTIONS[option], None if rank == NONE else rank, tuple(codes[:length])))
+            offset += TURN.size
+        yield game
+
+def read_records(path: str | None = None) -> Iterator[GameRecord]:
+    """Read every game in a record file"""
+
+    with open(path or settings.log_file, 'rb') as file:
+        data: bytes = file.read()
+    return decode_records(data)
@@ -0,0 +1,149 @@
+"""
+Defines the Replay class for rebuilding recorded games from their seed and actions
+- Games are dealt through Core.init and stepped through Core.apply_result, without rendering
+- A clone of the game is kept as a checkpoint every settings.replay_interval turns
+- Seeking starts from the nearest checkpoint at or before the turn, so only a few turns are replayed
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Iterator
+)
+if TYPE_CHECKING:
+    from .card import Card
+    from .record import (
+        Action,
+        GameRecord
+    )
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import bisect
+import random
+from contextlib import contextmanager
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+from .core import Core
+from .rank import RANK_NAMES
+from .suit import SUIT_NAMES
+from .card import create_deck
+from .rng import create_rng
+from .player import Player
+from .snapshot import (
+    Snapshot,
+    Result
+)
+
+# < ========================================================
+# < Settings Function
+# < ========================================================
+
+@contextmanager
+def recorded_settings(record: GameRecord) -> Iterator[None]:
+    """Apply the deal settings of a recorded game for a block of code, restoring them afterwards"""
+
+    names: tuple[str, ...] = ('hand_size', 'shown_size', 'hidden_size', 'quick', 'shuffled', 'player_count')
+    saved: dict[str, object] = {name: getattr(settings, name) for name in names}
+    settings.hand_size = record.hand_size
+    settings.shown_size = record.shown_size
+    settings.hidden_size = record.hidden_size
+    settings.quick = record.quick
+    settings.shuffled = record.shuffled
+    settings.player_count = len(record.players)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+
+# < ========================================================
+# < Replay Class
+# < ========================================================
+
+class Replay:
+
+    def __init__(self, record: GameRecord, interval: int | None = None) -> None:
+        """Create a replay of a recorded game, checkpointing every interval turns"""
+
+        self.record: GameRecord = record
+        self.interval: int = interval or settings.replay_interval
+        self.indices: list[int] = [0]
+        self.checkpoints: list[Core] = [self._deal()]
+
+    @property
+    def turns(self) -> int:
+        """Get the number of recorded turns"""
+        return len(self.record.actions)
+
+    def _deal(self) -> Core:
+        """Deal the recorded game as simulate_game would from its seed"""
+
+        rng: random.Random = create_rng(self.record.seed)
+        with recorded_settings(self.record):
+            core: Core = Core()
+            core.init(
+                deck = create_deck(SUIT_NAMES, RANK_NAMES, settings.shuffled, rng),
+                players = [
+                    Player(info.name, info.human, info.uid, info.behaviour)
+                    for info in self.record.players
+                ],
+                rng = rng,
+                seed = self.record.seed
+            )
+        return core
+
+    def _step(self, core: Core, action: Action) -> None:
+        """Apply a recorded action to a game"""
+
+        snapshot: Snapshot = core.create_snapshot()
+        cards: list[Card] = []
+        for code in action.codes:
+            card: Card | None = next((card for card in snapshot.pile if card.code == code), None)
+            if card is None or card in cards:
+                raise ValueError(f'Card code [{code}] is not in the {snapshot.pile_name} pile on turn {core.turn}')
+            cards.append(card)
+        core.apply_result(snapshot, Result(action.option, cards))
+
+    def seek(self, turn: int) -> Core:
+        """Get the game as it was at the start of a turn, counted from 1, as a separate copy"""
+
+        index: int = max(0, min(turn - 1, self.turns))
+        position: int = bisect.bisect_right(self.indices, index) - 1
+        start: int = self.indices[position]
+        core: Core = self.checkpoints[position].clone()
+
+        with recorded_settings(self.record):
+            for step in range(start, index):
+                self._step(core, self.record.actions[step])
+                if (step + 1) % self.interval == 0 and step + 1 > self.indices[-1]:
+                    self.indices.append(step + 1)
+                    self.checkpoints.append(core.clone())
+        return core
+
+    def snapshot(self, turn: int) -> Snapshot:
+        """Get the Snapshot at the start of a turn"""
+        return self.seek(turn).create_snapshot()
+
+    def finish(self) -> Core:
+        """Replay every recorded turn, raising if the result differs from the record"""
+
+        core: Core = self.seek(self.turns + 1)
+        winner: int | None = core.winner.uid if core.winner else None
+        if winner != self.record.winner:
+            raise ValueError(f'Replay winner [{winner}] differs from recorded winner [{self.record.winner}]')
+        return core
@@ -0,0 +1,33 @@
+"""
+Defines seeded random streams for games
+- Every game owns a random.Random instance, the global random module is never drawn from
+- Stream seeds are derived from a master seed by hashing, so streams are independent of each other
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import random
+import hashlib
+
+# < ========================================================
+# < Stream Functions
+# < ========================================================
+
+def derive_seed(seed: int, *keys: int | str) -> int:
+    """Derive a 64-bit seed for a stream, such as a game index, from a master seed"""
+
+    data: bytes = ':'.join(str(key) for key in (seed, *keys)).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size = 8, person = b'shiphead').digest(), 'little')
+
+def create_rng(seed: int | None = None, *keys: int | str) -> random.Random:
+    """Create a random stream from a seed, derived by keys if given, or seeded from the OS if seed is None"""
+
+    if seed is None:
+        return random.Random()
+    return random.Random(derive_seed(seed, *keys) if keys else seed)
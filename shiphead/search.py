@@ -0,0 +1,165 @@
+"""
+Defines the information set Monte Carlo search behaviour
+- Cards the player cannot see are reshuffled between their piles for each playout
+- Root moves are chosen by UCB1 and scored by playouts with a fast behaviour
+- Searches for a fixed number of playouts, drawing from a stream derived from the game seed and turn
+- An optional budget in milliseconds stops the search early, which makes results depend on the speed of the machine
+- The move of the rollout behaviour is tried first, wins ties and is kept unless every move is visited enough
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING
+)
+if TYPE_CHECKING:
+    from .card import Card
+    from .core import Core
+    from .player import Player
+    from .snapshot import Snapshot
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import math
+import random
+import time
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+from .rng import create_rng
+from .snapshot import Result
+from .behaviours import decide
+
+# < ========================================================
+# < Move Functions
+# < ========================================================
+
+def get_moves(snapshot: Snapshot) -> list[Result]:
+    """Get every legal move for a snapshot as a result"""
+
+    moves: list[Result] = []
+    if snapshot.waitable:
+        moves.append(Result('wait'))
+    if snapshot.takeable:
+        moves.append(Result('take'))
+    if snapshot.playable:
+        moves.extend(Result('play', combo) for combo in snapshot.playable_combinations)
+    return moves
+
+# < ========================================================
+# < Determinize Function
+# < ========================================================
+
+def determinize(core: Core, viewer: Player, rng: random.Random) -> Core:
+    """Clone the game and reshuffle every card the viewer cannot see between its piles, the clone draws from rng"""
+
+    state: Core = core.clone()
+    state.rng = rng
+    piles: list[list[Card]] = [state.deck]
+    for player in state.players:
+        piles.append(player.hidden)
+        if player.uid != viewer.uid:
+            piles.append(player.hand)
+
+    pool: list[Card] = [card for pile in piles for card in pile]
+    state.rng.shuffle(pool)
+
+    start: int = 0
+    for pile in piles:
+        size: int = len(pile)
+        pile.clear()
+        pile.extend(pool[start:start + size])
+        start += size
+    for player in state.players:
+        player.reindex()
+    return state
+
+# < ========================================================
+# < Playout Function
+# < ========================================================
+
+def playout(state: Core, move: Result, viewer: Player, rollout: str, horizon: int) -> float:
+    """Apply a move then play the game out, returns 1 if the viewer wins and 0 otherwise"""
+
+    snapshot: Snapshot = state.create_snapshot()
+    state.apply_result(snapshot, move)
+
+    limit: int = state.turn + horizon
+    while state.winner is None and state.turn <= limit:
+        snapshot = state.create_snapshot()
+        state.apply_result(snapshot, decide(snapshot, rollout))
+
+    if state.winner is None:
+        return 0.0
+    return 1.0 if state.winner.uid == viewer.uid else 0.0
+
+# < ========================================================
+# < Search Function
+# < ========================================================
+
+def search(
+    snapshot: Snapshot,
+    playouts: int | None = None,
+    rollout: str | None = None,
+    exploration: float = math.sqrt(2),
+    budget_ms: float | None = None
+) -> Result:
+    """Search for the best move with a number of playouts, stopping early if a budget in milliseconds runs out"""
+
+    start: float = time.perf_counter()
+    playouts = playouts or settings.search_playouts
+    budget_ms = budget_ms if budget_ms is not None else settings.search_budget_ms
+    deadline: float = math.inf if budget_ms is None else start + budget_ms / 1000
+    rollout = rollout or settings.search_rollout
+    if rollout not in ('random', 'good', 'better'):
+        raise ValueError(f'Rollout behaviour [{rollout}] must only read the snapshot')
+
+    core: Core = snapshot.core
+    rng: random.Random = create_rng(core.seed, 'search', core.turn)
+    state: Core = core.clone()
+    state.rng = rng
+    prior: Result = decide(state.create_snapshot(), rollout)
+    if snapshot.hidden:
+        return prior
+
+    moves: list[Result] = get_moves(snapshot)
+    if len(moves) == 1:
+        return moves[0]
+    moves.insert(0, moves.pop(moves.index(prior)))
+
+    viewer: Player = snapshot.player
+    visits: list[int] = [0] * len(moves)
+    wins: list[float] = [0.0] * len(moves)
+
+    for total in range(playouts):
+        if time.perf_counter() >= deadline:
+            break
+        index: int
+        if total < len(moves):
+            index = total
+        else:
+            log_total: float = math.log(total)
+            index = max(
+                range(len(moves)),
+                key = lambda i: wins[i] / visits[i] + exploration * math.sqrt(log_total / visits[i])
+            )
+        state = determinize(core, viewer, rng)
+        wins[index] += playout(state, moves[index], viewer, rollout, settings.search_horizon)
+        visits[index] += 1
+
+    if min(visits) < settings.search_visits:
+        return moves[0]
+    best: int = max(range(len(moves)), key = lambda i: (visits[i], wins[i]))
+    return moves[best]
@@ -0,0 +1,330 @@
+"""
+Defines the asyncio game server for hosting many tables in one process
+- Each table is an independent Core played by its own task
+- Human seats are TCP connections speaking a line protocol, computer seats are decided inline
+- A human decision is awaited with a timeout, and is played by settings.server_fallback if it expires
+- Protocol lines sent to a client start with a keyword, such as TURN, CHOICE, PROMPT or WINNER
+- Cards are sent as plain two letter names of rank and suit, such as TH or QS
+- A hidden pile is sent as its size with a single blind play, its cards are never sent before they are played
+- A client answers a PROMPT with the index of a CHOICE
+- A connection waiting for a table is watched, lines it sends are ignored and it leaves the queue if it closes
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Iterable
+)
+if TYPE_CHECKING:
+    from .card import Card
+    from .snapshot import Snapshot
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import random
+import asyncio
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+from .core import Core
+from .snapshot import Result
+from .rank import (
+    RANK_DATA,
+    RANK_NAMES
+)
+from .suit import (
+    SUIT_DATA,
+    SUIT_NAMES
+)
+from .card import create_deck
+from .player import Player
+from .behaviours import decide
+from .search import get_moves
+from .rng import (
+    create_rng,
+    derive_seed
+)
+
+# < ========================================================
+# < Protocol Functions
+# < ========================================================
+
+def format_cards(cards: Iterable[Card]) -> str:
+    """Format cards for the protocol as space separated two letter names, such as TH QS"""
+    return ' '.join(
+        f'{RANK_DATA[card.rank].short_upper}{SUIT_DATA[card.suit].short_upper}' for card in cards
+    )
+
+def format_line(keyword: str, *parts: object) -> str:
+    """Format a protocol line from a keyword and parts, skipping empty parts"""
+    return ' '.join([keyword, *(str(part) for part in parts if part != '')])
+
+# < ========================================================
+# < Seat Class
+# < ========================================================
+
+class Seat:
+
+    def __init__(
+        self,
+        name: str,
+        reader: asyncio.StreamReader | None = None,
+        writer: asyncio.StreamWriter | None = None,
+        behaviour: str | None = None
+    ) -> None:
+        """Create a seat, a human seat has a connection and a computer seat has a behaviour"""
+
+        self.name: str = name
+        self.reader: asyncio.StreamReader | None = reader
+        self.writer: asyncio.StreamWriter | None = writer
+        self.behaviour: str | None = behaviour
+        self.finished: asyncio.Event = asyncio.Event()
+        self.timeouts: int = 0
+        self.watcher: asyncio.Task | None = None
+
+    @property
+    def human(self) -> bool:
+        """Check if the seat is connected to a human"""
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def send(self, *lines: str) -> None:
+        """Send lines to a human seat, disconnecting it if the connection fails"""
+
+        if not self.human:
+            return
+        try:
+            self.writer.write(''.join(f'{line}\n' for line in lines).encode('utf-8'))
+            await self.writer.drain()
+        except ConnectionError:
+            self.disconnect()
+
+    async def watch(self) -> None:
+        """Read and ignore lines while waiting for a table, the seat is disconnected and finished if the connection closes"""
+
+        try:
+            while self.human:
+                if not await self.reader.readline():
+                    break
+        except ConnectionError:
+            pass
+        self.disconnect()
+        self.finished.set()
+
+    def stop_watching(self) -> None:
+        """Stop watching the connection, as the seat has joined a table"""
+
+        if self.watcher is not None:
+            self.watcher.cancel()
+
+    async def choose(self, count: int, timeout: float) -> int | None:
+        """Await the index of a choice, returns None on timeout or disconnection"""
+
+        if self.watcher is not None:
+            await asyncio.wait((self.watcher,))
+            self.watcher = None
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        deadline: float = loop.time() + timeout
+        while self.human:
+            remaining: float = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                line: bytes = await asyncio.wait_for(self.reader.readline(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            except ConnectionError:
+                break
+            if not line:
+                break
+            text: str = line.decode('utf-8', 'replace').strip()
+            if text.isdigit() and int(text) < count:
+                return int(text)
+            await self.send(f'ERROR expected an index from 0 to {count - 1}')
+        self.disconnect()
+        return None
+
+    def disconnect(self) -> None:
+        """Close the connection of the seat, it is played by the fallback behaviour from then on"""
+
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+# < ========================================================
+# < Table Class
+# < ========================================================
+
+class Table:
+
+    def __init__(self, number: int, seats: list[Seat], seed: int, timeout: float | None = None) -> None:
+        """Create a table and deal a game for its seats from a seeded stream"""
+
+        self.number: int = number
+        self.seats: list[Seat] = seats
+        self.seed: int = seed
+        self.timeout: float = timeout or settings.server_timeout
+        rng: random.Random = create_rng(seed)
+        self.core: Core = Core()
+        self.core.init(
+            deck = create_deck(SUIT_NAMES, RANK_NAMES, settings.shuffled, rng),
+            players = [
+                Player(seat.name, seat.human, uid, seat.behaviour)
+                for uid, seat in enumerate(seats, 1)
+            ],
+            rng = rng,
+            seed = seed
+        )
+
+    async def broadcast(self, *lines: str) -> None:
+        """Send lines to every human seat at the table"""
+        await asyncio.gather(*(seat.send(*lines) for seat in self.seats if seat.human))
+
+    async def decide(self, seat: Seat, snapshot: Snapshot) -> Result:
+        """Await a decision for a seat, humans fall back to settings.server_fallback on timeout"""
+
+        if not seat.human:
+            return decide(snapshot, seat.behaviour or settings.server_fallback)
+
+        moves: list[Result]
+        pile: str
+        choices: list[str]
+        if snapshot.hidden:
+            moves = [Result('play', [snapshot.blind_card])]
+            pile = format_line('PILE', 'hidden', len(snapshot.pile))
+            choices = [format_line('CHOICE', 0, 'play', 'hidden')]
+        else:
+            moves = get_moves(snapshot)
+            pile = format_line('PILE', snapshot.pile_name, format_cards(snapshot.pile))
+            choices = [
+                format_line('CHOICE', index, move.option, format_cards(move.cards))
+                for index, move in enumerate(moves)
+            ]
+        await seat.send(
+            format_line('TURN', snapshot.turn),
+            format_line('CENTER', format_cards(snapshot.center)),
+            pile,
+            *choices,
+            format_line('PROMPT', len(moves), f'{self.timeout:g}')
+        )
+        index: int | None = await seat.choose(len(moves), self.timeout)
+        if index is None:
+            seat.timeouts += 1
+            await seat.send('TIMEOUT')
+            return decide(snapshot, settings.server_fallback)
+        return moves[index]
+
+    async def play(self) -> Player | None:
+        """Play the game to the end or the turn limit, returns the winner"""
+
+        core: Core = self.core
+        try:
+            await self.broadcast(f'TABLE {self.number} {" ".join(seat.name for seat in self.seats)}')
+            while core.winner is None and core.turn <= settings.max_turns:
+                snapshot: Snapshot = core.create_snapshot()
+                seat: Seat = self.seats[core.player_index]
+                result: Result = await self.decide(seat, snapshot)
+                snapshot.result = result
+                core.apply_result(snapshot, result)
+                await self.broadcast(format_line('RESULT', seat.name, result.option, format_cards(result.cards)))
+                await asyncio.sleep(0)
+            await self.broadcast(f'WINNER {core.winner.name if core.winner else None}')
+        finally:
+            for seat in self.seats:
+                seat.disconnect()
+                seat.finished.set()
+        return core.winner
+
+# < ========================================================
+# < GameServer Class
+# < ========================================================
+
+class GameServer:
+
+    def __init__(self, humans: int = 1, seed: int = 0, timeout: float | None = None) -> None:
+        """Create a server seating humans at tables as they connect, computer seats fill the rest"""
+
+        if not 1 <= humans <= settings.player_count:
+            raise ValueError(f'Humans per table must be from 1 to {settings.player_count}')
+        self.humans: int = humans
+        self.seed: int = seed
+        self.timeout: float | None = timeout
+        self.waiting: list[Seat] = []
+        self.tables: dict[int, Table] = {}
+        self.tasks: set[asyncio.Task] = set()
+        self.count: int = 0
+        self.connections: int = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Seat a new connection and wait for its table to finish, or for it to close while waiting"""
+
+        self.connections += 1
+        seat: Seat = Seat(f'Guest{self.connections}', reader, writer)
+        try:
+            await seat.send(f'WELCOME {seat.name}')
+            if not seat.human:
+                return
+            self.waiting = [waiting for waiting in self.waiting if waiting.human]
+            self.waiting.append(seat)
+            if len(self.waiting) >= self.humans:
+                self.open_table(self.waiting[:self.humans])
+                del self.waiting[:self.humans]
+            else:
+                seat.watcher = asyncio.create_task(seat.watch())
+                await seat.send(f'WAITING {self.humans - len(self.waiting)}')
+            await seat.finished.wait()
+        finally:
+            if seat in self.waiting:
+                self.waiting.remove(seat)
+                seat.stop_watching()
+                seat.disconnect()
+
+    def open_table(self, humans: list[Seat]) -> Table:
+        """Open a table for human seats, filling it with computer seats, and start playing it"""
+
+        for seat in humans:
+            seat.stop_watching()
+        self.count += 1
+        computers: list[Seat] = [
+            Seat(f'PC{index}', behaviour = settings.server_behaviour)
+            for index in range(1, settings.player_count - len(humans) + 1)
+        ]
+        table: Table = Table(self.count, humans + computers, derive_seed(self.seed, self.count), self.timeout)
+        self.tables[self.count] = table
+        task: asyncio.Task = asyncio.create_task(table.play())
+        self.tasks.add(task)
+        task.add_done_callback(lambda done: self.close_table(table, done))
+        return table
+
+    def close_table(self, table: Table, task: asyncio.Task) -> None:
+        """Forget a finished table"""
+
+        self.tasks.discard(task)
+        self.tables.pop(table.number, None)
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765) -> None:
+        """Accept connections until cancelled, the backlog allows many players to connect at once"""
+
+        server: asyncio.Server = await asyncio.start_server(self.handle, host, port, backlog = settings.server_backlog)
+        async with server:
+            await server.serve_forever()
+
+# < ========================================================
+# < Serve Function
+# < ========================================================
+
+def serve(host: str, port: int, humans: int = 1, seed: int = 0, timeout: float | None = None) -> None:
+    """Run a game server until interrupted"""
+    asyncio.run(GameServer(humans, seed, timeout).serve(host, port))
@@ -23,6 +23,25 @@ shuffled: bool = True
 log_mode: str = 'print'
 log_file: str = 'game.log'
 delay: bool = True
+max_turns: int = 1000
+lazy_snapshots: bool = True
+frozen_snapshots: bool = False
+search_playouts: int = 1000
+search_visits: int = 10
+search_budget_ms: float | None = None
+search_rollout: str = 'better'
+search_horizon: int = 200
+endgame_budget: int = 5000
+endgame_depth: int = 64
+endgame_table_size: int = 1 << 18
+endgame_fallback: str = 'better'
+replay_interval: int = 50
+keyframe_interval: int = 50
+dataset_shard_size: int = 1 << 20
+server_timeout: float = 30.0
+server_fallback: str = 'better'
+server_behaviour: str = 'better'
+server_backlog: int = 1024
 behaviours: dict[str, int] = {
     'random': 10,
     'good': 20, 
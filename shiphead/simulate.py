@@ -0,0 +1,171 @@
+"""
+Defines the headless game loop for computer-vs-computer simulation
+- No printing or input, intended for bulk simulation of games
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING
+)
+if TYPE_CHECKING:
+    from .snapshot import (
+        Snapshot,
+        Result
+    )
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import random
+from dataclasses import dataclass
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+from .core import Core
+from .rank import RANK_NAMES
+from .suit import SUIT_NAMES
+from .card import create_deck
+from .player import Player
+from .behaviours import decide
+from .record import RecordWriter
+from .rng import (
+    create_rng,
+    derive_seed
+)
+
+# < ========================================================
+# < Outcome Class
+# < ========================================================
+
+@dataclass(frozen = True, slots = True)
+class Outcome:
+    """Compact result of a single simulated game"""
+    seed: int
+    winner: int | None
+    turns: int
+
+# < ========================================================
+# < Game Functions
+# < ========================================================
+
+def create_game(seed: int, behaviours: list[str | None] | None = None) -> Core:
+    """Create and deal a computer-vs-computer game from its own seeded stream"""
+
+    behaviours = behaviours or [None] * settings.player_count
+    rng: random.Random = create_rng(seed)
+    core: Core = Core()
+    core.init(
+        deck = create_deck(
+            SUIT_NAMES,
+            RANK_NAMES,
+            settings.shuffled,
+            rng
+        ),
+        players = [
+            Player(f'PC{uid}', False, uid, behaviour)
+            for uid, behaviour in enumerate(behaviours, 1)
+        ],
+        rng = rng,
+        seed = seed
+    )
+    return core
+
+def play_turn(core: Core) -> Result:
+    """Play one turn of a game with the behaviour of the current player"""
+
+    snapshot: Snapshot = core.create_snapshot()
+    result: Result = decide(snapshot, snapshot.player.behaviour)
+    snapshot.result = result
+    core.apply_result(snapshot, result)
+    return result
+
+def get_outcome(seed: int, core: Core) -> Outcome:
+    """Get the compact outcome of a game"""
+    return Outcome(
+        seed = seed,
+        winner = core.winner.uid if core.winner else None,
+        turns = core.turn
+    )
+
+# < ========================================================
+# < Simulate Game Function
+# < ========================================================
+
+def simulate_game(
+    seed: int, 
+    max_turns: int | None = None, 
+    behaviours: list[str | None] | None = None,
+    writer: RecordWriter | None = None
+) -> Outcome:
+    """Simulate a single computer-vs-computer game from its own seeded stream, recording results if given a writer"""
+
+    max_turns = max_turns or settings.max_turns
+    core: Core = create_game(seed, behaviours)
+    if writer:
+        writer.begin(seed, core.players)
+
+    while core.winner is None and core.turn <= max_turns:
+        result: Result = play_turn(core)
+        if writer:
+            writer.record(result)
+
+    if writer:
+        writer.end(core.winner, core.turn)
+    return get_outcome(seed, core)
+
+# < ========================================================
+# < Simulate Function
+# < ========================================================
+
+def simulate(
+    games: int, 
+    seed: int = 0, 
+    max_turns: int | None = None, 
+    behaviours: list[str | None] | None = None,
+    path: str | None = None
+) -> list[Outcome]:
+    """Simulate a number of games, each with a seed derived from the master seed, recorded to path if given"""
+
+    seeds: list[int] = [derive_seed(seed, i) for i in range(games)]
+    if path is None and settings.log_mode == 'binary':
+        path = settings.log_file
+    if path is None:
+        return [simulate_game(game_seed, max_turns, behaviours) for game_seed in seeds]
+
+    with RecordWriter(path) as writer:
+        return [simulate_game(game_seed, max_turns, behaviours, writer) for game_seed in seeds]
+
+# < ========================================================
+# < Simulate Interleaved Function
+# < ========================================================
+
+def simulate_interleaved(
+    games: int, 
+    seed: int = 0, 
+    max_turns: int | None = None, 
+    behaviours: list[str | None] | None = None
+) -> list[Outcome]:
+    """Simulate a number of games as tables in one process, playing a turn at each unfinished table in turn"""
+
+    max_turns = max_turns or settings.max_turns
+    seeds: list[int] = [derive_seed(seed, i) for i in range(games)]
+    tables: list[Core] = [create_game(game_seed, behaviours) for game_seed in seeds]
+
+    active: list[Core] = tables
+    while active:
+        for core in active:
+            play_turn(core)
+        active = [core for core in active if core.winner is None and core.turn <= max_turns]
+    return [get_outcome(game_seed, core) for game_seed, core in zip(seeds, tables)]
@@ -13,13 +13,19 @@ Licence: MIT
 from __future__ import annotations
 from typing import (
     TYPE_CHECKING,
-    Any,
-    TypedDict
+    Any
 )
 if TYPE_CHECKING:
     from .card import Card
-    from .player import Player
+    from .player import (
+        Player,
+        PileIndex
+    )
     from .core import Core
+    from .center import (
+        CenterPile,
+        BurnedPile
+    )
 
 # < ========================================================
 # < External Imports
@@ -29,44 +35,171 @@ from dataclasses import (
     dataclass, 
     field
 )
-from pprint import (
-    pprint,
-    pformat
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from .encoding import (
+    EIGHT,
+    BITS_BY_IMPORTANCE
 )
 
 # < ========================================================
 # < Result Class
 # < ========================================================
 
-@dataclass
+@dataclass(frozen = True, slots = True)
 class Result:
     option: str = ''
     cards: list[Card] = field(default_factory = list)
 
+# < ========================================================
+# < Unset Sentinel
+# < ========================================================
+
+UNSET: Any = object()
+"""Sentinel for lazy snapshot attributes that have not been computed yet"""
+
 # ~ ========================================================
 # ~ Snapshot Class
 # ~ ========================================================
 
-@dataclass
+@dataclass(slots = True)
 class Snapshot:
-    """Snapshot of game state for the current turn"""
+    """Snapshot of game state for the current turn, derived attributes are computed on first access from inputs frozen at creation"""
     turn: int
     player: Player
     human: bool
     pile: list[Card]
     pile_name: str
     hidden: bool
-    center: list[Card]
+    center: CenterPile
     deck: list[Card]
-    burned: list[Card]
+    burned: BurnedPile
     standard: bool
-    actual_rank: str | None
-    anchor_rank: str | None
-    valid_ranks: list[str]
-    playable_cards: list[Card]
-    playable_combinations: list[list[Card]]
-    options: list[str]
+    cards: tuple[Card, ...] = field(repr = False)
+    top_card: Card | None = field(repr = False)
+    anchor_card: Card | None = field(repr = False)
+    index: PileIndex = field(repr = False)
+    version: int = field(repr = False)
+    pile_mask: int = field(repr = False)
+    core: Core = field(repr = False)
     result: Result | None = None
+    state: Core | None = field(default = None, repr = False)
+    _valid_ranks: frozenset[str] = field(default = UNSET, init = False, repr = False)
+    _valid_mask: int = field(default = UNSET, init = False, repr = False)
+    _playable_mask: int = field(default = UNSET, init = False, repr = False)
+    _options: list[str] = field(default = UNSET, init = False, repr = False)
+
+    def evaluate(self) -> Snapshot:
+        """Compute every lazy attribute now, playable cards and combinations are built from the cached masks on access"""
+
+        self.valid_ranks
+        self.playable_mask
+        self.options
+        return self
+
+    @property
+    def actual_rank(self) -> str | None:
+        """Get the rank of the top card in the center"""
+        return self.top_card.rank if self.top_card else None
+
+    @property
+    def anchor_rank(self) -> str | None:
+        """Get the rank of the top card in the center that is not a 7"""
+        return self.anchor_card.rank if self.anchor_card else None
+
+    @property
+    def valid_ranks(self) -> frozenset[str]:
+        """Get the ranks that can be played this turn"""
+        if self._valid_ranks is UNSET:
+            self._valid_ranks = self.core.get_valid_ranks(self.anchor_rank, self.standard)
+        return self._valid_ranks
+
+    @property
+    def valid_mask(self) -> int:
+        """Get the rank mask of ranks that can be played this turn"""
+        if self._valid_mask is UNSET:
+            self._valid_mask = self.core.get_valid_mask(self.anchor_rank, self.standard)
+        return self._valid_mask
+
+    @property
+    def playable_mask(self) -> int:
+        """Get the rank mask of ranks in the pile that can be played this turn"""
+
+        if self._playable_mask is UNSET:
+            self._playable_mask = self.pile_mask if self.hidden else self.pile_mask & self.valid_mask
+        return self._playable_mask
+
+    @property
+    def playable_groups(self) -> list[list[Card]]:
+        """Get playable cards grouped by rank, lowest rank first, so that each prefix of a group is a combination"""
+
+        if self.hidden:
+            return [[card] for card in self.cards]
+        mask: int = self.playable_mask
+        if self.index.version == self.version:
+            return self.index.groups(mask)
+        groups: dict[int, list[Card]] = {}
+        for card in self.cards:
+            if card.bit & mask:
+                cards: list[Card] | None = groups.get(card.bit)
+                if cards is None:
+                    groups[card.bit] = [card]
+                else:
+                    cards.append(card)
+        return [groups[bit] for bit in sorted(groups)]
+
+    @property
+    def lowest_groups(self) -> list[list[Card]]:
+        """Get the playable groups of the least important playable rank only, without grouping other ranks"""
+
+        mask: int = self.playable_mask
+        for bit in BITS_BY_IMPORTANCE:
+            if bit & mask:
+                break
+        else:
+            return []
+        if self.hidden:
+            return [[card] for card in self.cards if card.bit == bit]
+        if self.index.version == self.version:
+            return [self.index.group(bit)]
+        return [[card for card in self.cards if card.bit == bit]]
+
+    @property
+    def blind_card(self) -> Card:
+        """Get the card taken by a blind play from the hidden pile, the top card of the pile"""
+        return self.cards[-1]
+
+    @property
+    def playable_cards(self) -> list[Card]:
+        """Get the cards that can be played this turn"""
+        return [card for cards in self.playable_groups for card in cards]
+
+    @property
+    def playable_combinations(self) -> list[list[Card]]:
+        """Get every combination of cards that can be played this turn"""
+        return [cards[:i] for cards in self.playable_groups for i in range(1, len(cards) + 1)]
+
+    @property
+    def options(self) -> list[str]:
+        """Get the options available this turn, from play, wait and take"""
+
+        if self._options is UNSET:
+            options: list[str] = []
+            if not self.hidden:
+                if self.playable_mask:
+                    options.append('play')
+                anchor: Card | None = self.anchor_card
+                if self.standard and anchor is not None and anchor.bit == EIGHT:
+                    options.append('wait')
+                elif self.top_card is not None:
+                    options.append('take')
+            else:
+                options.append('play')
+            self._options = options
+        return self._options
 
     @property
     def waitable(self) -> bool:
@@ -81,4 +214,4 @@ class Snapshot:
     @property
     def playable(self) -> bool:
         """Check if 'play' is in options"""
-        return 'play' in self.options
\ No newline at end of file
+        return 'play' in self.options
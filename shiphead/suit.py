@@ -24,7 +24,7 @@ from .utils import cstring
 # < Suit Class
 # < ========================================================
 
-@dataclass
+@dataclass(frozen = True, slots = True)
 class Suit:
     name: str
     name_title: str
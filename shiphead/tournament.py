@@ -0,0 +1,124 @@
+"""
+Defines the tournament runner for comparing computer behaviours
+- Shards seeded games across a process pool and merges the results
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import os
+import itertools
+from dataclasses import (
+    dataclass,
+    field
+)
+from concurrent.futures import ProcessPoolExecutor
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from . import settings
+from .simulate import simulate_game
+from .rng import derive_seed
+
+# < ========================================================
+# < Tally Class
+# < ========================================================
+
+@dataclass(slots = True)
+class Tally:
+    """Aggregated outcomes for a single pairing of behaviours"""
+    pairing: tuple[str, ...]
+    games: int = 0
+    wins: list[int] = field(default_factory = list)
+    unfinished: int = 0
+    turns: int = 0
+
+    def __post_init__(self) -> None:
+        """Ensure there is a win count for every seat in the pairing"""
+        if not self.wins:
+            self.wins = [0] * len(self.pairing)
+
+    def merge(self, other: Tally) -> None:
+        """Merge the counts of another tally for the same pairing"""
+
+        if other.pairing != self.pairing:
+            raise ValueError(f'Cannot merge tallies for {self.pairing} and {other.pairing}')
+        self.games += other.games
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.unfinished += other.unfinished
+        self.turns += other.turns
+
+# < ========================================================
+# < Shard Function
+# < ========================================================
+
+def play_shard(pairing: tuple[str, ...], seed: int, start: int, games: int) -> Tally:
+    """Play a contiguous range of games for a pairing, each seeded from its own derived stream, run in a worker"""
+
+    tally: Tally = Tally(pairing)
+    behaviours: list[str | None] = list(pairing)
+    for i in range(start, start + games):
+        outcome = simulate_game(derive_seed(seed, *pairing, i), behaviours = behaviours)
+        tally.games += 1
+        tally.turns += outcome.turns
+        if outcome.winner is None:
+            tally.unfinished += 1
+        else:
+            tally.wins[outcome.winner - 1] += 1
+    return tally
+
+# < ========================================================
+# < Pairings Function
+# < ========================================================
+
+def get_pairings(behaviours: list[str] | None = None) -> list[tuple[str, ...]]:
+    """Get every seating of behaviours, including mirror matches"""
+
+    behaviours = behaviours or list(settings.behaviours)
+    return list(itertools.product(behaviours, repeat = settings.player_count))
+
+# < ========================================================
+# < Run Tournament Function
+# < ========================================================
+
+def run_tournament(
+    games: int,
+    seed: int = 0,
+    workers: int | None = None,
+    shard_size: int = 500,
+    behaviours: list[str] | None = None
+) -> dict[tuple[str, ...], Tally]:
+    """Play a number of games for each pairing across a pool of worker processes"""
+
+    workers = workers or os.cpu_count() or 1
+    pairings: list[tuple[str, ...]] = get_pairings(behaviours)
+    tallies: dict[tuple[str, ...], Tally] = {pairing: Tally(pairing) for pairing in pairings}
+
+    shards: list[tuple[tuple[str, ...], int, int, int]] = []
+    for pairing in pairings:
+        for offset in range(0, games, shard_size):
+            shards.append((pairing, seed, offset, min(shard_size, games - offset)))
+
+    if workers == 1:
+        for shard in shards:
+            tally = play_shard(*shard)
+            tallies[tally.pairing].merge(tally)
+        return tallies
+
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        for tally in executor.map(play_shard, *zip(*shards)):
+            tallies[tally.pairing].merge(tally)
+    return tallies
@@ -0,0 +1,223 @@
+"""
+Defines Zobrist keys for game state hashing and the TranspositionTable classes
+- Keys are generated from fixed seeds so hashes are stable across processes
+- The center pile and the index of each player pile keep their keys up to date as cards move, other keys are computed on demand
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from __future__ import annotations
+from typing import (
+    Any,
+    Generic,
+    TypeVar
+)
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import random
+from collections import OrderedDict
+
+# < ========================================================
+# < Custom Types
+# < ========================================================
+
+V = TypeVar('V')
+
+# < ========================================================
+# < Zobrist Keys
+# < ========================================================
+
+CARDS: int = 52
+RUNS: int = 5
+
+def create_keys(name: str, size: int) -> tuple[int, ...]:
+    """Create a stable table of 64-bit keys for a given name"""
+
+    rng: random.Random = random.Random(f'shiphead:{name}')
+    return tuple(rng.getrandbits(64) for _ in range(size))
+
+_PILE_KEYS: dict[str, tuple[int, ...]] = {}
+
+def get_pile_keys(location: str) -> tuple[int, ...]:
+    """Get the card key table for a pile location, such as '1:hand' or 'center'"""
+
+    keys: tuple[int, ...] | None = _PILE_KEYS.get(location)
+    if keys is None:
+        keys = _PILE_KEYS[location] = create_keys(f'pile:{location}', CARDS)
+    return keys
+
+CENTER_KEYS: tuple[int, ...] = get_pile_keys('center')
+"""Key for each card code in the center"""
+
+TOP_KEYS: tuple[int, ...] = create_keys('top', 14 * RUNS)
+"""Key for each top rank index, offset by one for an empty center, and run length"""
+
+ANCHOR_KEYS: tuple[int, ...] = create_keys('anchor', 14 * RUNS)
+"""Key for each anchor rank index, offset by one for no anchor, and run length"""
+
+DECK_KEYS: tuple[int, ...] = create_keys('deck', CARDS + 1)
+"""Key for each deck size"""
+
+PLAYER_KEYS: tuple[int, ...] = create_keys('player', 16)
+"""Key for each current player index"""
+
+ALTERNATE_KEY: int = create_keys('alternate', 1)[0]
+"""Key included when the table is in the alternate state"""
+
+def run_key(keys: tuple[int, ...], bit: int, run: int) -> int:
+    """Get the key for a rank bit and run length, a bit of 0 means no card"""
+    return keys[bit.bit_length() * RUNS + min(run, RUNS - 1)]
+
+# < ========================================================
+# < Table Constants
+# < ========================================================
+
+MISSING: Any = object()
+"""Sentinel for keys that are not in a table, so stored None values are hits"""
+
+MIX: int = 0x9E3779B97F4A7C15
+"""Odd 64-bit multiplier, the golden ratio, used to spread structured keys over slots"""
+
+MASK: int = (1 << 64) - 1
+
+# < ========================================================
+# < TranspositionTable Class
+# < ========================================================
+
+class TranspositionTable(Generic[V]):
+    """Bounded table of values by state key, evicting the least recently used entry"""
+
+    def __init__(self, capacity: int = 1 << 20) -> None:
+        """Create a transposition table instance"""
+
+        self.capacity: int = capacity
+        self.entries: OrderedDict[int, V] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: int, default: Any = None) -> V | Any:
+        """Get the value for a key, marking it as recently used"""
+
+        value: V | Any = self.entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: int, value: V, depth: int = 0) -> None:
+        """Store a value for a key, evicting the least recently used entry if full"""
+
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last = False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters"""
+
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the fraction of lookups that were hits"""
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        """Get the counters of the table as a dictionary"""
+        return {
+            'size': len(self.entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate
+        }
+
+    def __len__(self) -> int:
+        """Get the number of entries in the table"""
+        return len(self.entries)
+
+# < ========================================================
+# < DepthTable Class
+# < ========================================================
+
+class DepthTable(TranspositionTable[V]):
+    """Fixed-size table of values by state key, a slot is only replaced by an equal or deeper entry"""
+
+    def __init__(self, capacity: int = 1 << 20) -> None:
+        """Create a depth-preferred transposition table instance"""
+
+        self.capacity: int = capacity
+        self.slots: list[tuple[int, int, V] | None] = [None] * capacity
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def slot(self, key: int) -> int:
+        """Get the slot index for a key, mixing every bit of the key into the high bits used"""
+        return (hash(key) * MIX & MASK) * self.capacity >> 64
+
+    def get(self, key: int, default: Any = None) -> V | Any:
+        """Get the value for a key if it is held in its slot"""
+
+        entry: tuple[int, int, V] | None = self.slots[self.slot(key)]
+        if entry is None or entry[0] != key:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return entry[2]
+
+    def put(self, key: int, value: V, depth: int = 0) -> None:
+        """Store a value for a key, unless its slot holds a deeper entry for another key"""
+
+        index: int = self.slot(key)
+        entry: tuple[int, int, V] | None = self.slots[index]
+        if entry is None:
+            self.size += 1
+        elif entry[0] != key:
+            if entry[1] > depth:
+                return
+            self.evictions += 1
+        self.slots[index] = (key, depth, value)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters"""
+
+        self.slots = [None] * self.capacity
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """Get the counters of the table as a dictionary"""
+        return {
+            'size': self.size,
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate
+        }
+
+    def __len__(self) -> int:
+        """Get the number of entries in the table"""
+        return self.size
@@ -0,0 +1,88 @@
+"""
+Tests for the BatchGame class
+- Vectorized games should play out like Core games, compared by win rates and game lengths
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from typing import Callable
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import statistics
+
+import numpy as np
+import pytest
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead.batch import (
+    BatchGame,
+    simulate_batch
+)
+from shiphead.simulate import simulate_game
+
+# < ========================================================
+# < Batch Tests
+# < ========================================================
+
+@pytest.mark.parametrize('behaviour, games, average, tolerance', [
+    ('random', 2000, statistics.median, 0.1),
+    ('good', 500, statistics.mean, 0.05),
+    ('better', 500, statistics.mean, 0.05)
+])
+def test_batch_matches_core(
+    behaviour: str,
+    games: int,
+    average: Callable[[list[int]], float],
+    tolerance: float
+) -> None:
+    """Win rates and average game lengths of a batch match Core games, random games are long-tailed so use medians"""
+
+    batch = simulate_batch(2000, 0, [behaviour, behaviour])
+    outcomes = [simulate_game(seed, behaviours = [behaviour, behaviour]) for seed in range(games)]
+
+    batch_turns: float = average(batch.turns.tolist())
+    core_turns: float = average([outcome.turns for outcome in outcomes])
+    assert abs(batch_turns - core_turns) <= tolerance * core_turns
+
+    batch_rate: float = float((batch.winners == 1).mean())
+    core_rate: float = sum(outcome.winner == 1 for outcome in outcomes) / games
+    assert abs(batch_rate - core_rate) <= 0.08
+
+def test_batch_is_seeded() -> None:
+    """The same seed gives the same outcomes"""
+
+    first = simulate_batch(200, 7, ['good', 'better'])
+    second = simulate_batch(200, 7, ['good', 'better'])
+    assert np.array_equal(first.winners, second.winners)
+    assert np.array_equal(first.turns, second.turns)
+
+def test_batch_conserves_cards() -> None:
+    """Every dealt card stays in a pile, the deck, the center or the burned pile after every step"""
+
+    game = BatchGame(100, 3, ['random', 'random'])
+    dealt: np.ndarray | None = None
+    while True:
+        total = game.piles.sum(axis = (1, 2, 3)) + game.deck_size + game.center.sum(axis = 1) + game.burned
+        if dealt is None:
+            dealt = total
+        assert (total == dealt).all()
+        if not game.step():
+            break
+
+def test_batch_rejects_unvectorized_behaviour() -> None:
+    """Behaviours without a vectorized version are refused"""
+
+    with pytest.raises(ValueError):
+        BatchGame(10, 0, ['best', 'random'])
@@ -0,0 +1,124 @@
+"""
+Tests for canonical keys
+- States that only differ by suit should share a key, and states that differ by rank should not
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import pytest
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead import settings
+from shiphead.core import Core
+from shiphead.card import Card
+from shiphead.suit import SUIT_NAMES
+from shiphead.codec import (
+    encode_core,
+    decode_core
+)
+from shiphead.canonical import (
+    canonical_key,
+    pack_cards,
+    pack_center,
+    unpack_counts
+)
+from shiphead.encoding import (
+    RANK_BY_INDEX,
+    code_rank,
+    code_suit
+)
+from shiphead.simulate import (
+    create_game,
+    play_turn
+)
+
+# < ========================================================
+# < Helper Functions
+# < ========================================================
+
+def create_permuted_cards(shift: int) -> list[Card]:
+    """Create a table of Card instances indexed by card code, with every suit rotated by shift"""
+
+    return [
+        Card(code_rank(code), SUIT_NAMES[(SUIT_NAMES.index(code_suit(code)) + shift) % len(SUIT_NAMES)])
+        for code in range(len(RANK_BY_INDEX) * len(SUIT_NAMES))
+    ]
+
+# < ========================================================
+# < Canonical Tests
+# < ========================================================
+
+def test_key_is_suit_invariant() -> None:
+    """A game decoded with rotated suits has the same key every turn while playing out identically"""
+
+    for seed in range(10):
+        core: Core = create_game(seed)
+        for _ in range(4):
+            if core.winner is None:
+                play_turn(core)
+        data: bytes = encode_core(core)
+        original: Core = decode_core(data)
+        permuted: Core = decode_core(data, cards = create_permuted_cards(1))
+        assert [card.suit for card in permuted.players[0].hand] != [card.suit for card in original.players[0].hand]
+
+        while original.winner is None:
+            assert canonical_key(permuted) == canonical_key(original)
+            play_turn(original)
+            play_turn(permuted)
+        assert permuted.players.index(permuted.winner) == original.players.index(original.winner)
+
+def test_key_differs_by_rank() -> None:
+    """Swapping a card in a hand for one of another rank changes the key"""
+
+    core: Core = create_game(0)
+    key: int = canonical_key(core)
+    hand: list[Card] = core.players[0].hand
+    card: Card = hand[0]
+    rank: str = next(rank for rank in RANK_BY_INDEX if rank != card.rank)
+    hand[0] = Card(rank, card.suit)
+    assert canonical_key(core) != key
+
+def test_key_differs_by_player() -> None:
+    """Moving a card from one hand to the other changes the key"""
+
+    core: Core = create_game(0)
+    key: int = canonical_key(core)
+    core.players[1].hand.append(core.players[0].hand.pop())
+    assert canonical_key(core) != key
+
+def test_key_differs_by_deck_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Games that only differ by the order of ranks in the deck have different keys, as they draw different cards"""
+
+    monkeypatch.setattr(settings, 'quick', False)
+    for seed in range(10):
+        core: Core = create_game(seed)
+        key: int = canonical_key(core)
+        index: int = next(index for index, card in enumerate(core.deck) if card.bit != core.deck[0].bit)
+        core.deck[0], core.deck[index] = core.deck[index], core.deck[0]
+        assert canonical_key(core) != key
+        core.deck[0], core.deck[index] = core.deck[index], core.deck[0]
+        assert canonical_key(core) == key
+
+def test_center_counts_match_cards() -> None:
+    """Rank counts packed from center runs match counts packed from its cards"""
+
+    for seed in range(20):
+        core: Core = create_game(seed)
+        while core.winner is None:
+            assert pack_center(core.center) == pack_cards(core.center)
+            play_turn(core)
+
+def test_counts_unpack() -> None:
+    """Packed rank counts unpack to the counts of the cards"""
+
+    cards: list[Card] = [Card('2'), Card('2', 'spades'), Card('ace'), Card('10', 'clubs')]
+    assert unpack_counts(pack_cards(cards)) == {'2': 2, '10': 1, 'ace': 1}
@@ -0,0 +1,130 @@
+"""
+Tests for the CenterPile and BurnedPile classes
+- Piles pushed, cloned, taken and burned at random should match the list semantics they replaced
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from typing import (
+    Iterable
+)
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import random
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead.core import Core
+from shiphead.card import Card
+from shiphead.codec import get_cards
+from shiphead.center import (
+    CenterPile,
+    BurnedPile
+)
+from shiphead.encoding import (
+    SEVEN,
+    TEN
+)
+
+# < ========================================================
+# < List Functions
+# < ========================================================
+
+def list_anchor(cards: list[Card]) -> Card | None:
+    """Get the top card in a list that is not a 7"""
+
+    for card in reversed(cards):
+        if card.bit != SEVEN:
+            return card
+    return None
+
+def list_consecutive(cards: list[Card], ignore_sevens: bool) -> int:
+    """Count the cards of a single rank on top of a list, with or without 7s"""
+
+    cards = [card for card in cards if card.bit != SEVEN] if ignore_sevens else cards
+    count: int = 0
+    for card in reversed(cards):
+        if card.bit != cards[-1].bit:
+            break
+        count += 1
+    return count
+
+def list_should_burn(cards: list[Card]) -> bool:
+    """Check if a list has a ten on top or four of a kind on top, with or without 7s"""
+
+    if cards and cards[-1].bit == TEN:
+        return True
+    return list_consecutive(cards, False) >= 4 or list_consecutive(cards, True) >= 4
+
+def codes(cards: Iterable[Card]) -> list[int]:
+    """Get the card codes of an iterable of cards, as cards only compare equal to themselves"""
+    return [card.code for card in cards]
+
+def code(card: Card | None) -> int | None:
+    """Get the card code of a card or None"""
+    return card.code if card is not None else None
+
+def assert_matches(pile: CenterPile, cards: list[Card]) -> None:
+    """Check a pile against the list it should behave as"""
+
+    assert codes(pile) == codes(cards)
+    assert codes(reversed(pile)) == codes(reversed(cards))
+    assert len(pile) == len(cards)
+    assert bool(pile) == bool(cards)
+    assert code(pile.top_card) == code(cards[-1] if cards else None)
+    assert code(pile.anchor_card) == code(list_anchor(cards))
+    assert pile.top_run == list_consecutive(cards, False)
+    assert pile.anchor_run == list_consecutive(cards, True)
+    assert Core().should_burn(pile) == list_should_burn(cards)
+    if cards:
+        assert pile[-1] is cards[-1]
+        assert pile[0] is cards[0]
+
+# < ========================================================
+# < Center Tests
+# < ========================================================
+
+def test_center_matches_list() -> None:
+    """Random pushes, clones, takes and burns leave every pile matching a plain list of its cards"""
+
+    rng: random.Random = random.Random(0)
+    table: list[Card] = get_cards()
+    for _ in range(300):
+        ranks: list[int] = rng.sample(range(13), 3) + [SEVEN.bit_length() - 1, TEN.bit_length() - 1]
+        pile: CenterPile = CenterPile()
+        cards: list[Card] = []
+        burned: BurnedPile = BurnedPile()
+        burned_cards: list[Card] = []
+        for _ in range(40):
+            roll: float = rng.random()
+            if roll < 0.75:
+                pushed: list[Card] = [table[rng.choice(ranks) * 4 + rng.randrange(4)] for _ in range(rng.randint(1, 3))]
+                pile.extend(pushed)
+                cards.extend(pushed)
+            elif roll < 0.85:
+                clone: CenterPile = pile.clone()
+                extra: Card = table[rng.choice(ranks) * 4]
+                clone.append(extra)
+                assert_matches(clone, cards + [extra])
+            elif roll < 0.92:
+                taken: list[Card] = [card for run in pile.detach() for card in run.cards]
+                assert codes(taken) == codes(cards)
+                cards = []
+            else:
+                burned.receive(pile.detach())
+                burned_cards.extend(cards)
+                cards = []
+                assert codes(burned) == codes(burned_cards)
+                assert len(burned) == len(burned_cards)
+            assert_matches(pile, cards)
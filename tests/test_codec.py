@@ -0,0 +1,160 @@
+"""
+Tests for the binary codec
+- Decoded games should hold the same cards, seed and random stream, and play on identically to the original
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import pytest
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead.core import Core
+from shiphead.behaviours import decide
+from shiphead.delta import (
+    Frame,
+    capture
+)
+from shiphead.snapshot import (
+    Snapshot,
+    Result
+)
+from shiphead.codec import (
+    encode_core,
+    decode_core,
+    dumps,
+    loads
+)
+from shiphead.simulate import (
+    create_game,
+    play_turn
+)
+from shiphead.benchmark import create_midgame
+
+# < ========================================================
+# < Helper Functions
+# < ========================================================
+
+def get_codes(result: Result) -> tuple[str, list[int]]:
+    """Get the option and card codes of a Result, as cards only compare equal to themselves"""
+    return result.option, [card.code for card in result.cards]
+
+# < ========================================================
+# < Core Tests
+# < ========================================================
+
+def test_decoded_game_continues_identically() -> None:
+    """A decoded game makes the same moves as the original until both finish"""
+
+    for seed in range(20):
+        core: Core = create_midgame(seed, seed % 10)
+        decoded: Core = decode_core(encode_core(core))
+        assert capture(decoded) == capture(core)
+        while core.winner is None:
+            assert get_codes(play_turn(decoded)) == get_codes(play_turn(core))
+            assert capture(decoded) == capture(core)
+        assert decoded.winner is not None
+        assert decoded.winner.uid == core.winner.uid
+
+def test_decoded_game_keeps_seed_and_players() -> None:
+    """The seed, players and their behaviours survive a round trip"""
+
+    core: Core = create_midgame(4, 5)
+    decoded: Core = decode_core(encode_core(core))
+    assert decoded.seed == core.seed
+    assert decoded.turn == core.turn
+    assert [(player.uid, player.name, player.human, player.behaviour) for player in decoded.players] == [
+        (player.uid, player.name, player.human, player.behaviour) for player in core.players
+    ]
+
+def test_decoded_game_keeps_burned_pile() -> None:
+    """Burned cards and their runs survive a round trip"""
+
+    for seed in range(50):
+        core: Core = create_midgame(seed, 40)
+        if len(core.burned):
+            break
+    assert len(core.burned)
+    decoded: Core = decode_core(encode_core(core))
+    assert [card.code for card in decoded.burned] == [card.code for card in core.burned]
+    assert [len(run.cards) for run in decoded.burned.runs] == [len(run.cards) for run in core.burned.runs]
+
+def test_game_without_rng() -> None:
+    """A game encoded without its random stream keeps its state but draws a fresh stream"""
+
+    core: Core = create_midgame(5, 5)
+    data: bytes = encode_core(core, rng = False)
+    assert len(data) < len(encode_core(core))
+    decoded: Core = decode_core(data)
+    assert capture(decoded) == capture(core)
+    assert decoded.seed == core.seed
+
+def test_decode_rejects_other_data() -> None:
+    """Data that does not start with a core marker is refused"""
+
+    data: bytes = encode_core(create_game(0))
+    with pytest.raises(ValueError):
+        decode_core(b'X' + data[1:])
+
+# < ========================================================
+# < Snapshot Tests
+# < ========================================================
+
+def test_snapshot_round_trip() -> None:
+    """A Snapshot and its result survive a round trip through dumps and loads"""
+
+    core: Core = create_midgame(6, 3)
+    snapshot: Snapshot = core.create_snapshot()
+    assert isinstance(loads(dumps(snapshot)), Snapshot)
+    snapshot.result = Result('play', list(snapshot.playable_cards[:1]))
+
+    decoded = loads(dumps(snapshot))
+    assert isinstance(decoded, Snapshot)
+    assert get_codes(decoded.result) == get_codes(snapshot.result)
+    assert decoded.pile_name == snapshot.pile_name
+    assert [card.code for card in decoded.pile] == [card.code for card in snapshot.pile]
+    assert decoded.options == snapshot.options
+    assert capture(decoded.core) == capture(core)
+    assert isinstance(loads(dumps(core)), Core)
+
+def test_frozen_snapshot_round_trip_after_apply() -> None:
+    """A frozen Snapshot encoded after its result is applied decodes to its own turn, up to and including the winning move"""
+
+    for seed in range(10):
+        core: Core = create_game(seed, ['random', 'random'])
+        while core.winner is None:
+            frame: Frame = capture(core)
+            state: tuple = core.rng.getstate()
+            snapshot: Snapshot = core.create_snapshot(frozen = True)
+            snapshot.result = decide(snapshot, snapshot.player.behaviour)
+            core.apply_result(snapshot, snapshot.result)
+
+            decoded = loads(dumps(snapshot))
+            assert isinstance(decoded, Snapshot)
+            assert capture(decoded.core) == frame
+            assert decoded.core.rng.getstate() == state
+            assert decoded.turn == snapshot.turn
+            assert [card.code for card in decoded.cards] == [card.code for card in snapshot.cards]
+            assert get_codes(decoded.result) == get_codes(snapshot.result)
+            decoded.core.apply_result(decoded, decoded.result)
+            assert capture(decoded.core) == capture(core)
+        assert decoded.core.winner is not None
+        assert decoded.core.winner.uid == core.winner.uid
+
+def test_stale_snapshot_is_refused() -> None:
+    """A Snapshot that is not frozen is refused once its result is applied, rather than encoding a later turn"""
+
+    core: Core = create_game(0)
+    snapshot: Snapshot = core.create_snapshot()
+    snapshot.result = decide(snapshot, snapshot.player.behaviour)
+    core.apply_result(snapshot, snapshot.result)
+    with pytest.raises(ValueError):
+        dumps(snapshot)
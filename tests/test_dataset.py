@@ -0,0 +1,131 @@
+"""
+Tests for the trajectory dataset
+- Actions should be legal under their masks, and rewards and flags should follow how each game ended
+- Transitions should read back from shards as they were written
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead import settings
+from shiphead.core import Core
+from shiphead.behaviours import decide
+from shiphead.snapshot import (
+    Snapshot,
+    Result
+)
+from shiphead.simulate import create_game
+from shiphead.dataset import (
+    ACTION_COUNT,
+    TrajectoryWriter,
+    TrajectoryDataset,
+    decode_action,
+    encode_action,
+    encode_mask,
+    observation_size,
+    play_trajectory,
+    generate
+)
+
+# < ========================================================
+# < Action Tests
+# < ========================================================
+
+@pytest.mark.parametrize('behaviour', ['random', 'better'])
+def test_actions_are_in_masks(behaviour: str) -> None:
+    """Every recorded action is allowed by the mask recorded with it"""
+
+    for seed in range(20):
+        transitions: dict[str, np.ndarray] = play_trajectory(create_game(seed, [behaviour, behaviour]))
+        assert transitions['mask'].shape == (len(transitions['action']), ACTION_COUNT)
+        assert transitions['observation'].shape[1] == observation_size()
+        rows: np.ndarray = np.arange(len(transitions['action']))
+        assert transitions['mask'][rows, transitions['action']].all()
+
+def test_actions_decode() -> None:
+    """Decoding the action of a Result gives the same option and count, the same rank unless played blind, and the top hidden card if blind"""
+
+    for seed in range(20):
+        core: Core = create_game(seed)
+        while core.winner is None:
+            snapshot: Snapshot = core.create_snapshot()
+            result: Result = decide(snapshot, snapshot.player.behaviour)
+            action: int = encode_action(snapshot, result)
+            assert encode_mask(snapshot)[action]
+            decoded: Result = decode_action(snapshot, action)
+            assert decoded.option == result.option
+            assert len(decoded.cards) == len(result.cards)
+            if not snapshot.hidden:
+                assert [card.code >> 2 for card in decoded.cards] == [card.code >> 2 for card in result.cards]
+            else:
+                assert decoded.cards == [snapshot.pile[-1]]
+            snapshot.result = result
+            core.apply_result(snapshot, result)
+
+# < ========================================================
+# < Reward Tests
+# < ========================================================
+
+def test_finished_game_is_done() -> None:
+    """A finished game ends each player with a done transition, rewarding the winner only"""
+
+    for seed in range(10):
+        transitions: dict[str, np.ndarray] = play_trajectory(create_game(seed))
+        assert not transitions['truncated'].any()
+        players: np.ndarray = transitions['player'][transitions['done']]
+        assert sorted(players) == list(range(settings.player_count))
+        assert sorted(transitions['reward'][transitions['done']]) == [-1.0, 1.0]
+        assert not transitions['reward'][~transitions['done']].any()
+
+def test_cut_off_game_is_truncated(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A game cut off by the turn limit ends each player with a truncated transition and no reward"""
+
+    monkeypatch.setattr(settings, 'max_turns', 6)
+    transitions: dict[str, np.ndarray] = play_trajectory(create_game(0))
+    assert len(transitions['action']) == 6
+    assert not transitions['done'].any()
+    assert not transitions['reward'].any()
+    assert list(np.flatnonzero(transitions['truncated'])) == [4, 5]
+
+# < ========================================================
+# < Shard Tests
+# < ========================================================
+
+def test_dataset_round_trip(tmp_path: Path) -> None:
+    """Transitions written across several shards, by more than one writer, read back unchanged"""
+
+    path: str = str(tmp_path / 'dataset')
+    written: list[dict[str, np.ndarray]] = [play_trajectory(create_game(seed)) for seed in range(6)]
+    for start in (0, 3):
+        with TrajectoryWriter(path, shard_size = 50) as writer:
+            for transitions in written[start:start + 3]:
+                writer.write(transitions)
+
+    dataset: TrajectoryDataset = TrajectoryDataset(path)
+    assert len(dataset) == sum(len(transitions['action']) for transitions in written)
+    assert len(dataset.shards) > 2
+    for field in dataset.fields:
+        expected: np.ndarray = np.concatenate([transitions[field] for transitions in written])
+        read: np.ndarray = np.concatenate([batch[field] for batch in dataset.iter_batches(16)])
+        assert np.array_equal(read, expected)
+
+def test_generate_counts_transitions(tmp_path: Path) -> None:
+    """The count returned by generate matches the transitions in the dataset"""
+
+    path: str = str(tmp_path / 'dataset')
+    count: int = generate(path, 5, seed = 3, shard_size = 64)
+    assert count == len(TrajectoryDataset(path))
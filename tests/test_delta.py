@@ -0,0 +1,97 @@
+"""
+Tests for the DeltaStream and DeltaMirror classes
+- A mirror fed encoded updates should hold the same frame as a capture of the game after every turn
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import pytest
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead.core import Core
+from shiphead.delta import (
+    Frame,
+    Delta,
+    DeltaStream,
+    DeltaMirror,
+    capture,
+    diff,
+    encode,
+    decode
+)
+from shiphead.simulate import (
+    create_game,
+    play_turn
+)
+
+# < ========================================================
+# < Delta Tests
+# < ========================================================
+
+@pytest.mark.parametrize('interval', [1, 5, 1000])
+def test_mirror_matches_game(interval: int) -> None:
+    """A mirror receiving encoded updates matches a capture of the game after every turn"""
+
+    for seed in range(10):
+        core: Core = create_game(seed)
+        stream: DeltaStream = DeltaStream(interval)
+        mirror: DeltaMirror = DeltaMirror()
+        assert mirror.receive(encode(stream.update(core))) == capture(core)
+        while core.winner is None:
+            play_turn(core)
+            assert mirror.receive(encode(stream.update(core))) == capture(core)
+
+def test_late_mirror_after_keyframe() -> None:
+    """A mirror joining mid-game matches the game once a keyframe is requested"""
+
+    core: Core = create_game(1)
+    stream: DeltaStream = DeltaStream(1000)
+    for _ in range(5):
+        stream.update(core)
+        play_turn(core)
+
+    mirror: DeltaMirror = DeltaMirror()
+    update: Frame | Delta = stream.update(core)
+    assert isinstance(update, Delta)
+    with pytest.raises(ValueError):
+        mirror.receive(encode(update))
+
+    stream.keyframe()
+    play_turn(core)
+    update = stream.update(core)
+    assert isinstance(update, Frame)
+    assert mirror.receive(encode(update)) == capture(core)
+
+def test_updates_round_trip() -> None:
+    """Frames and deltas decode to the updates they were encoded from"""
+
+    core: Core = create_game(2)
+    before: Frame = capture(core)
+    play_turn(core)
+    after: Frame = capture(core)
+    delta: Delta = diff(before, after)
+    assert decode(encode(before)) == before
+    assert decode(encode(delta)) == delta
+
+def test_deltas_are_smaller() -> None:
+    """Encoded deltas are smaller on average than encoded keyframes of the same turns"""
+
+    core: Core = create_game(3)
+    stream: DeltaStream = DeltaStream(1000)
+    stream.update(core)
+    deltas: int = 0
+    keyframes: int = 0
+    while core.winner is None:
+        play_turn(core)
+        deltas += len(encode(stream.update(core)))
+        keyframes += len(encode(capture(core)))
+    assert deltas < keyframes / 2
@@ -0,0 +1,80 @@
+"""
+Tests for the endgame search states
+- Advancing a search state should give the state of the game after Core.apply_result, every turn of whole endgames
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import pytest
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead import settings
+from shiphead.core import Core
+from shiphead.behaviours import decide
+from shiphead.snapshot import (
+    Snapshot,
+    Result
+)
+from shiphead.simulate import create_game
+from shiphead.endgame import (
+    PLAY,
+    HIDDEN,
+    WAIT,
+    TAKE,
+    State,
+    Move,
+    create_state,
+    pack_state,
+    get_moves,
+    advance
+)
+
+# < ========================================================
+# < Helper Functions
+# < ========================================================
+
+def to_move(snapshot: Snapshot, result: Result) -> Move:
+    """Convert a result for a snapshot to a search move"""
+
+    if result.option == 'take':
+        return (TAKE, 0, 0)
+    if result.option == 'wait':
+        return (WAIT, 0, 0)
+    rank: int = result.cards[0].code >> 2
+    return (HIDDEN if snapshot.hidden else PLAY, rank, len(result.cards))
+
+# < ========================================================
+# < Endgame Tests
+# < ========================================================
+
+@pytest.mark.parametrize('behaviour', ['random', 'better'])
+def test_advance_matches_core(monkeypatch: pytest.MonkeyPatch, behaviour: str) -> None:
+    """Advancing the search state by each move matches packing the game state after the move is applied"""
+
+    monkeypatch.setattr(settings, 'quick', True)
+    for seed in range(30):
+        core: Core = create_game(seed, [behaviour, behaviour])
+        while core.winner is None:
+            state: State = create_state(core)
+            snapshot: Snapshot = core.create_snapshot()
+            result: Result = decide(snapshot, behaviour)
+            move: Move = to_move(snapshot, result)
+            if not snapshot.hidden:
+                assert move in get_moves(state)
+
+            expected: State | None = advance(state, move)
+            core.apply_result(snapshot, result)
+            if core.winner is not None:
+                assert expected is None
+            else:
+                assert expected is not None
+                assert pack_state(expected) == pack_state(create_state(core))
@@ -0,0 +1,92 @@
+"""
+Tests for record files
+- Games written by a RecordWriter should read back with the same seeds, players, actions and winners
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+from pathlib import Path
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead import settings
+from shiphead.core import Core
+from shiphead.snapshot import Result
+from shiphead.record import (
+    Action,
+    GameRecord,
+    RecordWriter,
+    read_records
+)
+from shiphead.simulate import (
+    Outcome,
+    create_game,
+    play_turn,
+    simulate_game
+)
+
+# < ========================================================
+# < Helper Functions
+# < ========================================================
+
+def get_actions(seed: int) -> list[Action]:
+    """Play a game from its seed and get its results as Action instances"""
+
+    actions: list[Action] = []
+    core: Core = create_game(seed)
+    while core.winner is None and core.turn <= settings.max_turns:
+        result: Result = play_turn(core)
+        rank: int | None = result.cards[0].code >> 2 if result.cards else None
+        actions.append(Action(result.option, rank, tuple(card.code for card in result.cards)))
+    return actions
+
+# < ========================================================
+# < Record Tests
+# < ========================================================
+
+def test_records_round_trip(tmp_path: Path) -> None:
+    """Games read back with the seed, players, actions, winner and turn count they were played with"""
+
+    path: str = str(tmp_path / 'games.bin')
+    outcomes: list[Outcome] = []
+    with RecordWriter(path, block_size = 256) as writer:
+        for seed in range(20):
+            outcomes.append(simulate_game(seed, writer = writer))
+
+    records: list[GameRecord] = list(read_records(path))
+    assert len(records) == len(outcomes)
+    for record, outcome in zip(records, outcomes):
+        core: Core = create_game(outcome.seed)
+        assert record.seed == outcome.seed
+        assert record.turns == outcome.turns
+        assert [player.uid for player in record.players] == [player.uid for player in core.players]
+        assert [player.behaviour for player in record.players] == [player.behaviour for player in core.players]
+        assert record.actions == get_actions(outcome.seed)
+        assert record.winner == outcome.winner
+
+def test_records_append(tmp_path: Path) -> None:
+    """A second writer appends games to an existing file"""
+
+    path: str = str(tmp_path / 'games.bin')
+    for seed in range(2):
+        with RecordWriter(path) as writer:
+            simulate_game(seed, writer = writer)
+    assert [record.seed for record in read_records(path)] == [0, 1]
+
+def test_unfinished_record(tmp_path: Path) -> None:
+    """A game cut off before it finishes reads back without a winner"""
+
+    path: str = str(tmp_path / 'games.bin')
+    with RecordWriter(path) as writer:
+        simulate_game(0, max_turns = 3, writer = writer)
+    record: GameRecord = next(read_records(path))
+    assert record.winner is None
+    assert len(record.actions) == 3
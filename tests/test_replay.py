@@ -0,0 +1,106 @@
+"""
+Tests for the Replay class
+- Replays of recorded games should pass through the same states and reach the recorded winner
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import random
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead.core import Core
+from shiphead.delta import (
+    Frame,
+    capture
+)
+from shiphead.replay import Replay
+from shiphead.record import (
+    Action,
+    GameRecord,
+    RecordWriter,
+    read_records
+)
+from shiphead.simulate import (
+    create_game,
+    play_turn,
+    simulate_game
+)
+
+# < ========================================================
+# < Helper Functions
+# < ========================================================
+
+def record_games(path: Path, seeds: range) -> list[GameRecord]:
+    """Simulate and record a game for each seed, returning the records read back"""
+
+    with RecordWriter(str(path)) as writer:
+        for seed in seeds:
+            simulate_game(seed, writer = writer)
+    return list(read_records(str(path)))
+
+def capture_game(seed: int) -> list[Frame]:
+    """Play a game from its seed and capture a Frame at the start of every turn, then at the end"""
+
+    core: Core = create_game(seed)
+    frames: list[Frame] = [capture(core)]
+    while core.winner is None:
+        play_turn(core)
+        frames.append(capture(core))
+    return frames
+
+# < ========================================================
+# < Replay Tests
+# < ========================================================
+
+def test_replay_reaches_recorded_winner(tmp_path: Path) -> None:
+    """Replaying every recorded turn ends with the recorded winner"""
+
+    for record in record_games(tmp_path / 'games.bin', range(20)):
+        core: Core = Replay(record).finish()
+        assert core.winner is not None
+        assert core.winner.uid == record.winner
+
+def test_seek_matches_game(tmp_path: Path) -> None:
+    """Seeking to any turn, in any order, gives the state the game had at the start of that turn"""
+
+    rng: random.Random = random.Random(0)
+    for record in record_games(tmp_path / 'games.bin', range(5)):
+        frames: list[Frame] = capture_game(record.seed)
+        replay: Replay = Replay(record, interval = 4)
+        turns: list[int] = list(range(1, len(frames) + 1))
+        rng.shuffle(turns)
+        for turn in turns:
+            assert capture(replay.seek(turn)) == frames[turn - 1]
+
+def test_seek_returns_copies(tmp_path: Path) -> None:
+    """Playing on a game returned by seek leaves the replay unchanged"""
+
+    record: GameRecord = record_games(tmp_path / 'games.bin', range(1))[0]
+    replay: Replay = Replay(record, interval = 2)
+    frame: Frame = capture(replay.seek(5))
+    core: Core = replay.seek(5)
+    play_turn(core)
+    assert capture(replay.seek(5)) == frame
+
+def test_replay_rejects_missing_cards(tmp_path: Path) -> None:
+    """An action naming a card that is not in the pile being played from is refused"""
+
+    record: GameRecord = record_games(tmp_path / 'games.bin', range(1))[0]
+    index: int = next(index for index, action in enumerate(record.actions) if action.codes)
+    action: Action = record.actions[index]
+    record.actions[index] = replace(action, codes = action.codes + action.codes[:1])
+    with pytest.raises(ValueError):
+        Replay(record).finish()
@@ -0,0 +1,89 @@
+"""
+Tests for the GameServer class
+- Connections that close while waiting for a table should leave the queue, and tables should only seat live connections
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from typing import (
+    Callable
+)
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import asyncio
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead.server import (
+    GameServer,
+    Table
+)
+
+# < ========================================================
+# < Helper Functions
+# < ========================================================
+
+async def connect(port: int) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect a client and read its WELCOME line"""
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    assert (await reader.readline()).startswith(b'WELCOME')
+    return reader, writer
+
+async def settle(condition: Callable[[], object], timeout: float = 2.0) -> None:
+    """Yield to the server until a condition holds"""
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    deadline: float = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline
+        await asyncio.sleep(0.01)
+
+async def run_waiting_clients() -> None:
+    """Close one waiting client, then seat two more, one of which sends lines while waiting"""
+
+    server: GameServer = GameServer(humans = 2, seed = 0, timeout = 0.2)
+    listener: asyncio.Server = await asyncio.start_server(server.handle, '127.0.0.1', 0)
+    port: int = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await connect(port)
+        assert (await reader.readline()).startswith(b'WAITING')
+        await settle(lambda: len(server.waiting) == 1)
+        writer.close()
+        await settle(lambda: not server.waiting)
+
+        first_reader, first_writer = await connect(port)
+        assert (await first_reader.readline()).startswith(b'WAITING')
+        first_writer.write(b'0\n')
+        await first_writer.drain()
+        second_reader, second_writer = await connect(port)
+        await settle(lambda: server.count)
+        assert not server.waiting
+        assert server.count == 1
+        table: Table = next(iter(server.tables.values()))
+        assert [seat.name for seat in table.seats] == ['Guest2', 'Guest3']
+
+        assert (await first_reader.readline()).startswith(b'TABLE')
+        assert (await second_reader.readline()).startswith(b'TABLE')
+        first_writer.close()
+        second_writer.close()
+        await settle(lambda: not server.tasks, timeout = 10.0)
+
+# < ========================================================
+# < Server Tests
+# < ========================================================
+
+def test_closed_waiting_client_leaves_queue() -> None:
+    """A client that closes while waiting is removed from the queue and is not seated at the next table"""
+    asyncio.run(asyncio.wait_for(run_waiting_clients(), 20))
@@ -0,0 +1,87 @@
+"""
+Tests for the Snapshot class
+- Lazily evaluated attributes should equal eagerly evaluated ones, whether read on their turn or after it was applied
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < Typing Imports
+# < ========================================================
+
+from typing import (
+    Any
+)
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import pytest
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead import settings
+from shiphead.core import Core
+from shiphead.card import Card
+from shiphead.behaviours import decide
+from shiphead.snapshot import (
+    Snapshot,
+    Result
+)
+from shiphead.simulate import create_game
+
+# < ========================================================
+# < Helper Functions
+# < ========================================================
+
+def get_codes(value: Any) -> Any:
+    """Replace cards by their codes in nested lists, as cards only compare equal to themselves"""
+
+    if isinstance(value, Card):
+        return value.code
+    if isinstance(value, list):
+        return [get_codes(item) for item in value]
+    return value
+
+def read(snapshot: Snapshot) -> dict[str, Any]:
+    """Read every derived attribute of a snapshot"""
+
+    return {
+        'valid_ranks': snapshot.valid_ranks,
+        'valid_mask': snapshot.valid_mask,
+        'playable_mask': snapshot.playable_mask,
+        'options': snapshot.options,
+        'playable_groups': get_codes(snapshot.playable_groups),
+        'lowest_groups': get_codes(snapshot.lowest_groups),
+        'playable_cards': get_codes(snapshot.playable_cards),
+        'playable_combinations': get_codes(snapshot.playable_combinations)
+    }
+
+# < ========================================================
+# < Snapshot Tests
+# < ========================================================
+
+@pytest.mark.parametrize('quick', [True, False])
+def test_lazy_matches_eager(monkeypatch: pytest.MonkeyPatch, quick: bool) -> None:
+    """Lazy snapshots equal eager snapshots each turn of whole games, even when first read after the turn is applied"""
+
+    monkeypatch.setattr(settings, 'quick', quick)
+    for seed in range(20):
+        core: Core = create_game(seed, ['random', 'better'])
+        while core.winner is None:
+            late: Snapshot = core.create_snapshot(lazy = True)
+            lazy: Snapshot = core.create_snapshot(lazy = True)
+            eager: Snapshot = core.create_snapshot(lazy = False)
+            expected: dict[str, Any] = read(eager)
+            assert read(lazy) == expected
+
+            result: Result = decide(eager, eager.player.behaviour)
+            eager.result = result
+            core.apply_result(eager, result)
+            assert read(late) == expected
+            assert read(eager) == expected
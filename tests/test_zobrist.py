@@ -0,0 +1,173 @@
+"""
+Tests for Zobrist keys and the TranspositionTable classes
+- Keys kept up to date as cards move should match keys recomputed from scratch, on games and their clones
+
+Author: Ben Scarletti
+Source: https://github.com/scarletti-ben/shiphead-py
+Licence: MIT
+"""
+
+# < ========================================================
+# < External Imports
+# < ========================================================
+
+import random
+
+# < ========================================================
+# < Package Imports
+# < ========================================================
+
+from shiphead import zobrist
+from shiphead.core import Core
+from shiphead.search import determinize
+from shiphead.center import CenterPile
+from shiphead.canonical import canonical_key
+from shiphead.simulate import (
+    create_game,
+    play_turn
+)
+from shiphead.zobrist import (
+    TranspositionTable,
+    DepthTable
+)
+
+# < ========================================================
+# < Helper Functions
+# < ========================================================
+
+def recompute_center_key(core: Core) -> int:
+    """Get the key of the center by pushing its cards onto a new pile"""
+    return CenterPile(list(core.center)).key
+
+def recompute_key(core: Core) -> int:
+    """Get the key of the game by rehashing the center and every player pile"""
+
+    key: int = (
+        recompute_center_key(core)
+        ^ zobrist.DECK_KEYS[len(core.deck)]
+        ^ zobrist.PLAYER_KEYS[core.player_index]
+    )
+    if not core.standard:
+        key ^= zobrist.ALTERNATE_KEY
+    for player in core.players:
+        for name, pile in player.piles.items():
+            keys: tuple[int, ...] = zobrist.get_pile_keys(f'{player.uid}:{name}')
+            for card in pile:
+                key ^= keys[card.code]
+    return key
+
+# < ========================================================
+# < Key Tests
+# < ========================================================
+
+def test_center_key_matches_recomputed() -> None:
+    """The center key kept up to date each turn matches a key recomputed from its cards"""
+
+    for seed in range(20):
+        core: Core = create_game(seed)
+        while core.winner is None:
+            assert core.center.key == recompute_center_key(core)
+            play_turn(core)
+
+def test_key_matches_recomputed() -> None:
+    """The game key, kept up to date by the pile indices, matches a key recomputed from scratch every turn of random games"""
+
+    for seed in range(30):
+        core: Core = create_game(seed, ['random', 'random'])
+        while core.winner is None:
+            assert core.key == recompute_key(core)
+            play_turn(core)
+        assert core.key == recompute_key(core)
+
+def test_key_matches_after_determinize() -> None:
+    """Clones and games with reshuffled hidden cards keep keys that match keys recomputed from scratch"""
+
+    rng: random.Random = random.Random(0)
+    for seed in range(10):
+        core: Core = create_game(seed, ['random', 'random'])
+        while core.winner is None:
+            clone: Core = core.clone()
+            assert clone.key == core.key
+            state: Core = determinize(core, core.player, rng)
+            assert state.key == recompute_key(state)
+            play_turn(state)
+            assert state.key == recompute_key(state)
+            play_turn(core)
+
+def test_clone_keys_match_after_play() -> None:
+    """A clone starts with the key of the original, and keeps matching recomputed keys as it is played"""
+
+    for seed in range(20):
+        core: Core = create_game(seed)
+        for _ in range(6):
+            if core.winner is None:
+                play_turn(core)
+        clone: Core = core.clone()
+        assert clone.key == core.key
+        assert clone.center.key == core.center.key
+
+        while clone.winner is None:
+            play_turn(clone)
+            assert clone.center.key == recompute_center_key(clone)
+        assert core.center.key == recompute_center_key(core)
+
+def test_key_differs_when_the_turn_passes() -> None:
+    """Games that only differ by the current player have different keys"""
+
+    core: Core = create_game(0)
+    clone: Core = core.clone()
+    clone.player_index = 1
+    assert clone.key != core.key
+
+# < ========================================================
+# < TranspositionTable Tests
+# < ========================================================
+
+def test_table_stores_none() -> None:
+    """A stored None is a hit and is returned instead of the default"""
+
+    table: TranspositionTable[None] = TranspositionTable(4)
+    table.put(1, None)
+    assert table.get(1, 'missing') is None
+    assert table.get(2, 'missing') == 'missing'
+    assert (table.hits, table.misses) == (1, 1)
+
+def test_table_evicts_least_recently_used() -> None:
+    """A full table evicts the entry that was used least recently"""
+
+    table: TranspositionTable[int] = TranspositionTable(2)
+    table.put(1, 10)
+    table.put(2, 20)
+    table.get(1)
+    table.put(3, 30)
+    assert table.get(2) is None
+    assert table.get(1) == 10
+    assert table.evictions == 1
+
+def test_depth_table_prefers_deeper_entries() -> None:
+    """A slot is only replaced by an entry at least as deep"""
+
+    table: DepthTable[str] = DepthTable(1)
+    table.put(1, 'deep', 5)
+    table.put(2, 'shallow', 1)
+    assert table.get(1) == 'deep'
+    assert table.get(2) is None
+    table.put(2, 'deeper', 6)
+    assert table.get(2) == 'deeper'
+    assert table.evictions == 1
+    assert len(table) == 1
+
+def test_depth_table_spreads_canonical_keys() -> None:
+    """Structured canonical keys fill slots about as well as random placement"""
+
+    keys: set[int] = set()
+    for seed in range(50):
+        core: Core = create_game(seed)
+        while core.winner is None:
+            keys.add(canonical_key(core))
+            play_turn(core)
+
+    table: DepthTable[int] = DepthTable(1 << 12)
+    slots: set[int] = {table.slot(key) for key in keys}
+    expected: float = table.capacity * (1 - (1 - 1 / table.capacity) ** len(keys))
+    assert len(slots) >= 0.9 * expected